@@ -5,23 +5,29 @@ Date:
     20-08-2023
 
 Description:
-    Run application with `python app.py`
+    Run application with `python app.py [database|api]`
+    Plans are read from the database (default) or from the local API of a running headless service
     Access app in browser on localhost at 127.0.0.1:8050
 
 """
 # pylint: skip-file
 
+import sys
+
 from dash import Dash
 from dash_bootstrap_components.themes import BOOTSTRAP
 
 from components import Layout
 
-from controller import Planner
+from service.plan_store import PlanStore
+
 
+# Every browser reads from one store, so a plan is only loaded and rendered once for all of them
+store = PlanStore(sys.argv[1] if len(sys.argv) > 1 else 'database')
 
 app = Dash(external_stylesheets=[BOOTSTRAP])
 app.title = "HomeBatteryController"
-app.layout = Layout(app, Planner()).create()
+app.layout = Layout(app, store).create()
 
 
 if __name__ == "__main__":
@@ -12,19 +12,20 @@ import plotly.graph_objs as go
 
 from dash import Dash, dcc, html
 
-from controller import Planner
+from service.plan_store import PlanSnapshot
+from controller.accounting import accumulated_costs
 
 
 class AccumulatedSavingsChart:
     """ Chart of the accumulated NormalBuy and SmartBuy electricity costs """
-    def __init__(self, app: Dash, planner: Planner):
+    def __init__(self, app: Dash, snapshot: PlanSnapshot):
         self._id = "accumulated-savings"
         self._app = app
         self._normal_buy = 0
         self._better_buy = 0
         self._smart_buy = 0        
-        self._df = self._get_dataframe(planner.data, planner.plan)
-        self._actions = planner.plan.loc[:, ["Time", "Action"]]
+        self._df = self._get_dataframe(snapshot.data, snapshot.plan)
+        self._actions = snapshot.plan.loc[:, ["Time", "Action"]]
 
     @property
     def id(self) -> str:
@@ -119,49 +120,10 @@ class AccumulatedSavingsChart:
             DataFrame with time and accumulated NormalBuy, BetterBuy and SmartBuy costs
 
         """
-        columns = ["Time", "NormalBuy", "BetterBuy", "SmartBuy"]
-        df = pd.DataFrame(columns=columns)
-        normal_buy = 0
-        better_buy = 0
-        smart_buy = 0
-        plan_length = plan.index.values.size
-        
-        for row in range(0, plan_length):
-            action = plan.at[row, "Action"]
-            normal_buy += data.at[row, "ExpectedConsumption"] * data.at[row, "Price"]
-
-            if plan.at[row, "SolarSurplus"] > 0:
-                if not data.at[row, "SpotPrice"] <= 0:
-                    better_buy -= data.at[row, "SpotPrice"] * plan.at[row, "SolarSurplus"] 
-            else:
-                better_buy += data.at[row, "Price"] * abs(plan.at[row, "SolarSurplus"]) 
-
-            if action == "idle":
-                
-                if plan.at[row, "SolarSurplus"] > 0:
-                    if not data.at[row, "SpotPrice"] <= 0:
-                        smart_buy -= data.at[row, "SpotPrice"] * plan.at[row, "SolarSurplus"]   
-                elif plan.at[row, "SolarSurplus"] < 0:
-                    smart_buy += data.at[row, "Price"] * abs(plan.at[row, "SolarSurplus"])
-
-            elif action == "charge":
-                
-                if plan.at[row, "SolarSurplus"] < 0:
-                    smart_buy += data.at[row, "Price"] * abs(plan.at[row, "SolarSurplus"])
-                    smart_buy += data.at[row, "Price"] * plan.at[row, "ElNetCharge"]
-                elif plan.at[row, "SolarSurplus"] >= 0 and plan.at[row, "SolarSurplus"] < 3:
-                    smart_buy += data.at[row, "Price"] * plan.at[row, "ElNetCharge"]
-                elif plan.at[row, "SolarSurplus"] > 3:
-                    if not data.at[row, "SpotPrice"] <= 0:
-                        smart_buy -= data.at[row, "SpotPrice"] * (plan.at[row, "SolarSurplus"] - 3)
-
-            else:
-                pass
-
-            new_row = pd.Series([plan.at[row, "Time"], normal_buy, better_buy, smart_buy], index=columns)
-            df = pd.concat([df, new_row.to_frame().T], ignore_index=True)
-
-        self._normal_buy = round(normal_buy, 2)
-        self._better_buy = round(better_buy, 2)
-        self._smart_buy = round(smart_buy, 2)
-        return df
+        df = accumulated_costs(data, plan)
+        totals = df.iloc[-1] if not df.empty else {'NormalBuy': 0, 'BetterBuy': 0, 'SmartBuy': 0}
+
+        self._normal_buy = round(float(totals['NormalBuy']), 2)
+        self._better_buy = round(float(totals['BetterBuy']), 2)
+        self._smart_buy = round(float(totals['SmartBuy']), 2)
+        return df
\ No newline at end of file
@@ -13,17 +13,17 @@ import plotly.graph_objs as go
 
 from dash import Dash, dcc, html
 
-from controller import Planner
+from service.plan_store import PlanSnapshot
 
 
 class ActionsChart:
     """ Chart of MiniCon actions to take every hour relative to Planner input parameters """
-    def __init__(self, app: Dash, planner: Planner, 
+    def __init__(self, app: Dash, snapshot: PlanSnapshot, 
                  normal_buy: float, better_buy: float, smart_buy: float):
         self._id = "action-chart"
         self._app = app
-        self._actions = planner.plan.loc[:, ["Time", "Action"]]
-        self._df = self._get_dataframe(planner.data, planner.plan)
+        self._actions = snapshot.plan.loc[:, ["Time", "Action"]]
+        self._df = self._get_dataframe(snapshot.data, snapshot.plan)
         self._normal_buy = normal_buy
         self._better_buy = better_buy
         self._smart_buy = smart_buy
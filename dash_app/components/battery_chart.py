@@ -12,18 +12,19 @@ import plotly.graph_objs as go
 
 from dash import Dash, dcc, html
 
-from controller import Planner
+from service.plan_store import PlanSnapshot
+from controller.accounting import battery_loss
 
 
 class BatteryChart:
     """ Chart for showing when battery is charging/discharging versus total capacity """
-    def __init__(self, app: Dash, planner: Planner):
+    def __init__(self, app: Dash, snapshot: PlanSnapshot):
         self._id = "battery-chart"
         self._app = app
         self._total_battery_loss = 0
         self._hourly_avg_battery_loss = 0
-        self._calculate_battery_loss(planner.plan)
-        self._df = planner.plan.loc[:, ["Time", "Action", "BatteryDelta", "BatteryExpected"]]
+        self._calculate_battery_loss(snapshot.plan)
+        self._df = snapshot.plan.loc[:, ["Time", "Action", "BatteryDelta", "BatteryExpected"]]
 
     @property
     def id(self) -> str:
@@ -99,18 +100,7 @@ class BatteryChart:
             plan: Output DataFrame from Planner
             
         """
-        columns = ["Time", "BatteryLoss"]
-        df = pd.DataFrame(columns=columns)
-        battery_loss = 0
-        plan_length = plan.index.values.size
-
-        for row in range(0, plan_length):
-            battery_delta = abs(plan.at[row, "BatteryDelta"])
-            battery_loss = battery_delta * 0.1
-
-            new_row = pd.Series([plan.at[row, "Time"], battery_loss], index=columns)
-            df = pd.concat([df, new_row.to_frame().T], ignore_index=True)
-
-        self._hourly_avg_battery_loss = round(df['BatteryLoss'].mean(), 2)
-        self._total_battery_loss = round(df['BatteryLoss'].sum(), 2)
+        loss = battery_loss(plan)
 
+        self._hourly_avg_battery_loss = round(float(loss.mean()), 2) if loss.size else 0
+        self._total_battery_loss = round(float(loss.sum()), 2)
\ No newline at end of file
@@ -12,17 +12,17 @@ import plotly.graph_objs as go
 from dash import Dash, dcc, html
 from plotly.subplots import make_subplots
 
-from controller import Planner
+from service.plan_store import PlanSnapshot
 
 
 class DataPlots:
     """ Subplots of electricity and expected consumption """
-    def __init__(self, app: Dash, planner: Planner):
+    def __init__(self, app: Dash, snapshot: PlanSnapshot):
         self._app = app
-        self._df_electricity = planner.data.loc[:, ['Time', 'Price']]
-        self._df_consumption = planner.data.loc[:, ['Time', 'ExpectedConsumption']]
-        self._df_solar = planner.data.loc[:, ['Time', 'Power']]
-        self._df_battery = planner.plan.loc[:, ['Time', 'BatteryExpected']]
+        self._df_electricity = snapshot.data.loc[:, ['Time', 'Price']]
+        self._df_consumption = snapshot.data.loc[:, ['Time', 'ExpectedConsumption']]
+        self._df_solar = snapshot.data.loc[:, ['Time', 'Power']]
+        self._df_battery = snapshot.plan.loc[:, ['Time', 'BatteryExpected']]
 
     def render_first_row(self) -> html.Div:
         """ Renders the subplots for electricity and expected consumption """
@@ -0,0 +1,78 @@
+"""
+Subplots of the history of prices, SoC, consumption, solar power and savings
+
+Date:
+    19-10-2026
+
+"""
+# pylint: skip-file
+
+import pandas as pd
+import plotly.graph_objs as go
+
+from dash import Dash, dcc, html
+from datetime import timedelta
+from plotly.subplots import make_subplots
+
+
+RANGES = {
+    "Week": timedelta(days=7),
+    "Month": timedelta(days=30),
+    "Year": timedelta(days=365)
+}
+
+class HistoryChart:
+    """ Subplots of the downsampled history rollups of a time range """
+    def __init__(self, app: Dash, period: str, history: pd.DataFrame):
+        self._id = "history-chart"
+        self._app = app
+        self._period = period
+        self._df = history
+
+    @property
+    def id(self) -> str:
+        """ Get component ID """
+        return self._id
+
+    def render(self) -> html.Div:
+        """ Renders the subplots of the history """
+        if self._df.empty:
+            return html.Div(html.H4("No history yet", style={'textAlign': 'center'}), id=self.id)
+
+        # Consumption, solar power and savings are summed over every hour of a rollup
+        unit = "kWh" if self._period == 'hour' else f"kWh per {self._period}"
+        fig = make_subplots(rows=5, cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                            subplot_titles=("Electricity Prices (kr/kWh)", "State of Charge (%)",
+                                            f"Household Electricity Consumption ({unit})",
+                                            f"PV Power from Solar Power Plant ({unit})",
+                                            f"Savings ({unit.replace('kWh', 'kr')})"))
+
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['Price'], name='Price', mode='lines'),
+                      row=1, col=1)
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['SpotPrice'], name='SpotPrice', mode='lines'),
+                      row=1, col=1)
+
+        # Band between the lowest and highest SoC of every rollup around the average
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['MaxSoc'], mode='lines',
+                                 line={'width': 0}, showlegend=False, hoverinfo='skip'),
+                      row=2, col=1)
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['MinSoc'], mode='lines', fill='tonexty',
+                                 line={'width': 0}, fillcolor='rgba(171, 99, 250, 0.2)', showlegend=False,
+                                 hoverinfo='skip'),
+                      row=2, col=1)
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['Soc'], name='Soc', mode='lines',
+                                 line={'color': "#AB63FA"}),
+                      row=2, col=1)
+
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['Consumption'], name='Consumption', mode='lines'),
+                      row=3, col=1)
+        fig.add_trace(go.Scatter(x=self._df['Time'], y=self._df['Solar'], name='Solar', mode='lines',
+                                 line={'color': "#FECB52"}),
+                      row=4, col=1)
+        fig.add_trace(go.Bar(x=self._df['Time'], y=self._df['Savings'], name='Savings',
+                             marker={'color': "#00CC96"}),
+                      row=5, col=1)
+
+        fig.update_layout(height=1200, showlegend=False, hovermode='x unified')
+
+        return html.Div(dcc.Graph(figure=fig), id=self.id)
@@ -7,8 +7,8 @@ Date:
 """
 # pylint: skip-file
 
+from dash import Dash, html, dcc, Input, Output, State, no_update
 from datetime import datetime
-from dash import Dash, html
 
 from .chart_dropdown import ChartDropDown
 from .actions_chart import ActionsChart
@@ -16,32 +16,22 @@ from .data_plots import DataPlots
 from .savings_chart import SavingsChart
 from .accumulated_savings import AccumulatedSavingsChart
 from .battery_chart import BatteryChart
+from .history_chart import HistoryChart, RANGES
 
-from controller import Planner
+from service.plan_store import PlanStore, PlanSnapshot
+
+
+POLL_INTERVAL = 15_000      # Milliseconds between every browser checking the store for a new plan
 
 class Layout:
     """ Layout of Dash app """
-    def __init__(self, app: Dash, planner: Planner):
+    def __init__(self, app: Dash, store: PlanStore):
         self.app = app
-        self.planner = planner
+        self.store = store
         self.title = app.title
         self.view = html.Div(id="view-container")
-        self.accumulated_savings = AccumulatedSavingsChart(app, planner)
-        self.actions_chart = ActionsChart(app, planner, 
-                                          self.accumulated_savings.normal_buy, 
-                                          self.accumulated_savings.better_buy,
-                                          self.accumulated_savings.smart_buy)
-        self.savings_chart = SavingsChart(app, planner, 
-                                          self.accumulated_savings.normal_buy,
-                                          self.accumulated_savings.better_buy, 
-                                          self.accumulated_savings.smart_buy)
-        self.battery_chart = BatteryChart(app, planner)
-        self.data_plots = DataPlots(app, planner)
-        self.chart_dropdown = ChartDropDown(app, 
-                                            self.actions_chart, 
-                                            self.savings_chart,
-                                            self.accumulated_savings,
-                                            self.battery_chart)
+        self.chart_dropdown = ChartDropDown(app)
+        self._register_callbacks()
 
     def create(self) -> html.Div:
         """ Create the HTML Layout """
@@ -50,35 +40,156 @@ class Layout:
             children=[
                 html.H1(self.title, style={'textAlign': 'center'}),
                 html.Hr(),
+                # Version of the shown plan, every view is rendered again when it changes
+                dcc.Store(id="plan-version"),
+                dcc.Interval(id="plan-poll", interval=POLL_INTERVAL),
                 html.Div(
                     className="dropdown-container",
                     children=[
                         self.chart_dropdown.render()
                     ]
                 ),
-                self.current_day_title(self.planner),
+                html.Div(id="day-title"),
                 self.view,
-                self.data_plots.render_first_row(),
-                self.data_plots.render_second_row()
+                html.Div(id="data-plots"),
+                html.Hr(),
+                html.Div(
+                    className="dropdown-container",
+                    children=[
+                        html.H6("History", style={'padding-left': '1.1%'}),
+                        dcc.Dropdown(
+                            id="history-range",
+                            options=list(RANGES),
+                            value=list(RANGES)[0],
+                            clearable=False,
+                            searchable=False,
+                            style={'width': 200, 'padding-left': '1%'}
+                        )
+                    ]
+                ),
+                html.Div(id="history-container")
             ]
         )
-    
-    def current_day_title(self, planner: Planner) -> html.H2:
+
+    def current_day_title(self, snapshot: PlanSnapshot) -> html.H2:
         """ Title for showing days and dates
 
         Args:
-            Planner object
+            snapshot: Current plan
 
         Returns:
             HTML Header2
-            
+
         """
-        first_date = planner.time_window[0].date().strftime("%d-%m-%Y")
-        second_date = planner.time_window[1].date().strftime("%d-%m-%Y")
+        first_date = snapshot.time_window[0].date().strftime("%d-%m-%Y")
+        second_date = snapshot.time_window[1].date().strftime("%d-%m-%Y")
 
         if first_date == second_date:
-            title = f"{planner.time_window[0].strftime('%A')} ({first_date})"
+            title = f"{snapshot.time_window[0].strftime('%A')} ({first_date})"
+        else:
+            title = f"{snapshot.time_window[0].strftime('%A')} ({first_date}) / {snapshot.time_window[1].strftime('%A')} ({second_date})"
+
+        return html.H2(title, style={'textAlign': 'center'})
+
+    def render_chart(self, chart: str, snapshot: PlanSnapshot) -> html.Div:
+        """ Render a chart of a plan
+
+        Args:
+            chart: Name of chart from the dropdown menu
+            snapshot: Current plan
+
+        Returns:
+            The rendered chart
+
+        """
+        if snapshot.plan.empty:
+            return html.Div(html.H4("No plan yet", style={'textAlign': 'center'}))
+
+        accumulated_savings = AccumulatedSavingsChart(self.app, snapshot)
+        costs = (accumulated_savings.normal_buy, accumulated_savings.better_buy, accumulated_savings.smart_buy)
+
+        if chart == "Savings":
+            return SavingsChart(self.app, snapshot, *costs).render()
+        elif chart == "AccumulatedSavings":
+            return accumulated_savings.render()
+        elif chart == "Battery":
+            return BatteryChart(self.app, snapshot).render()
         else:
-            title = f"{planner.time_window[0].strftime('%A')} ({first_date}) / {planner.time_window[1].strftime('%A')} ({second_date})"
+            # Default view
+            return ActionsChart(self.app, snapshot, *costs).render()
+
+    def render_plan_views(self, snapshot: PlanSnapshot) -> tuple[html.H2 | None, list[html.Div]]:
+        """ Render the day title and data plots of a plan
 
-        return html.H2(title, style={'textAlign': 'center'})
\ No newline at end of file
+        Args:
+            snapshot: Current plan
+
+        Returns:
+            The day title and the rows of data plots
+
+        """
+        if snapshot.plan.empty:
+            return None, []
+
+        data_plots = DataPlots(self.app, snapshot)
+        return self.current_day_title(snapshot), [data_plots.render_first_row(), data_plots.render_second_row()]
+
+    def render_history(self, history_range: str) -> html.Div:
+        """ Render the history of a range up to the current hour
+
+        Args:
+            history_range: Name of range from the history dropdown menu
+
+        Returns:
+            The rendered history
+
+        """
+        # Every browser asks for the same range within an hour, so the store loads it once
+        end_time = datetime.now().replace(minute=0, second=0, microsecond=0)
+        period, history = self.store.history(end_time - RANGES[history_range], end_time)
+        return HistoryChart(self.app, period, history).render()
+
+    def _register_callbacks(self) -> None:
+        """ Register the callbacks refreshing the views of every browser from the shared store """
+
+        @self.app.callback(
+            Output('plan-version', 'data'),
+            Input('plan-poll', 'n_intervals'),
+            State('plan-version', 'data')
+        )
+        def poll_plan(n_intervals, version):
+            """ Callback for checking the store for a new plan (also runs when the page is loaded) """
+            current_version = self.store.snapshot().version
+            return current_version if current_version != version else no_update
+
+        @self.app.callback(
+            Output('view-container', 'children'),
+            Input(self.chart_dropdown.id, 'value'),
+            Input('plan-version', 'data'),
+            prevent_initial_call=True
+        )
+        def change_view(value, version):
+            """ Callback for changing which chart to render based on dropdown value """
+            chart = value if value in self.chart_dropdown.charts else self.chart_dropdown.charts[0]
+            # Rendered once for every plan version, however many browsers are showing it
+            return self.store.derived(('chart', chart), lambda snapshot: self.render_chart(chart, snapshot))
+
+        @self.app.callback(
+            Output('day-title', 'children'),
+            Output('data-plots', 'children'),
+            Input('plan-version', 'data'),
+            prevent_initial_call=True
+        )
+        def update_plan_views(version):
+            """ Callback for rendering the day title and data plots of a new plan """
+            return self.store.derived('plan-views', self.render_plan_views)
+
+        @self.app.callback(
+            Output('history-container', 'children'),
+            Input('history-range', 'value'),
+            Input('plan-version', 'data'),
+            prevent_initial_call=True
+        )
+        def update_history(value, version):
+            """ Callback for rendering the history of a range (again when a new plan is saved) """
+            return self.render_history(value if value in RANGES else list(RANGES)[0])
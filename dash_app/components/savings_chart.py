@@ -12,19 +12,20 @@ import plotly.graph_objs as go
 
 from dash import Dash, dcc, html
 
-from controller import Planner
+from service.plan_store import PlanSnapshot
+from controller.accounting import hourly_buy_prices
 
 
 class SavingsChart:
     """ Show electricity price saving for NormalBuy versus SmartBuy """
-    def __init__(self, app: Dash, planner: Planner, 
+    def __init__(self, app: Dash, snapshot: PlanSnapshot, 
                  normal_buy: float, better_buy: float, smart_buy: float):
         self._id = "savings-chart"
         self._app = app
         self._normal_buy_price = 0
         self._better_buy_price = 0
         self._smart_buy_price = 0
-        self._df = self._calculate_buy_prices(planner.data, planner.plan)
+        self._df = self._calculate_buy_prices(snapshot.data, snapshot.plan)
         
         self._normal_buy = normal_buy
         self._better_buy = better_buy
@@ -108,48 +109,9 @@ class SavingsChart:
             DataFrame with time and NormalBuyPrice, BetterBuyPrice and SmartBuyPrice
             
         """
-        columns = ["Time", "NormalBuyPrice", "BetterBuyPrice", "SmartBuyPrice"]
-        df = pd.DataFrame(columns=columns)
-        plan_length = plan.index.values.size
-
-        for row in range(0, plan_length):
-            action = plan.at[row, "Action"]
-            normal_buy_price = data.at[row, "Price"]
-
-            if plan.at[row, "SolarSurplus"] > 0:
-                if data.at[row, "SpotPrice"] < 0:
-                    better_buy_price = 0
-                else:
-                    better_buy_price = -abs(data.at[row, "SpotPrice"]) 
-            else:
-                better_buy_price = data.at[row, "Price"]
-
-            if action == "idle":
-
-                if plan.at[row, "SolarSurplus"] > 0:
-                    smart_buy_price = -abs(data.at[row, "SpotPrice"])
-                elif plan.at[row, "SolarSurplus"] < 0:
-                    smart_buy_price = data.at[row, "Price"]
-                else:
-                    smart_buy_price = 0
-
-            elif action == "charge":
-
-                if plan.at[row, "SolarSurplus"] > 0:
-                    smart_buy_price = data.at[row, "Price"]
-                elif plan.at[row, "SolarSurplus"] >= 0 and plan.at[row, "SolarSurplus"] < 3:
-                    smart_buy_price = data.at[row, "Price"]
-                elif plan.at[row, "SolarSurplus"] > 3:
-                    smart_buy_price = -abs(data.at[row, "SpotPrice"])
-
-            else:
-                smart_buy_price = 0
-
-            new_row = pd.Series([plan.at[row, "Time"], normal_buy_price, better_buy_price, smart_buy_price], index=columns)
-            df = pd.concat([df, new_row.to_frame().T], ignore_index=True)
+        df = hourly_buy_prices(data, plan)
 
         self._normal_buy_price = round(df['NormalBuyPrice'].mean(), 2)
         self._better_buy_price = round(df['BetterBuyPrice'].mean(), 2)
         self._smart_buy_price = round(df['SmartBuyPrice'].mean(), 2)
-        return df
- 
\ No newline at end of file
+        return df
\ No newline at end of file
@@ -1,3 +1,18 @@
 # pylint: skip-file
-from .planner import Planner
-from .enums import ActionReason, SolarStrategy
\ No newline at end of file
+from typing import TYPE_CHECKING
+from data.helperfunctions.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from .planner import Planner
+    from .sweep import Sweep, load_archive
+    from .enums import ActionReason, SolarStrategy
+
+_EXPORTS = {
+    'Planner': '.planner',
+    'Sweep': '.sweep',
+    'load_archive': '.sweep',
+    'ActionReason': '.enums',
+    'SolarStrategy': '.enums',
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_import(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Vectorized cost accounting of a plan against the NormalBuy, BetterBuy and SmartBuy baselines
+
+Date:
+    19-10-2026
+
+Baselines:
+    NormalBuy: Every hour of expected consumption is bought at the price of the hour
+    BetterBuy: Solar surplus is sold at the spot price and solar deficit is bought
+    SmartBuy: The planned battery actions are applied on top of BetterBuy
+
+Example:
+    >>> costs = accumulated_costs(planner.data, planner.plan)
+    >>> costs.iloc[-1]
+    Time         2023-10-03 23:00:00
+    NormalBuy                  54.12
+    BetterBuy                  31.77
+    SmartBuy                   22.40
+
+"""
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+
+COST_COLUMNS = ['NormalBuy', 'BetterBuy', 'SmartBuy']
+PRICE_COLUMNS = ['NormalBuyPrice', 'BetterBuyPrice', 'SmartBuyPrice']
+MAX_RATE = 3.0          # Max charge rate of battery (kW), solar surplus above it is sold while charging
+BATTERY_LOSS = 0.1      # Share of the energy moved in or out of the battery that is lost
+
+
+class _Hours: # pylint: disable=too-few-public-methods
+    """ Class for the NumPy arrays and action masks of every planned hour """
+    def __init__(self, data: pd.DataFrame, plan: pd.DataFrame):
+        hours = len(plan)
+        self.time = plan['Time'].to_numpy()
+        self.price = data['Price'].to_numpy(dtype=float)[:hours]
+        self.spot_price = data['SpotPrice'].to_numpy(dtype=float)[:hours]
+        self.consumption = data['ExpectedConsumption'].to_numpy(dtype=float)[:hours]
+        self.surplus = plan['SolarSurplus'].to_numpy(dtype=float)
+        self.el_net_charge = plan['ElNetCharge'].to_numpy(dtype=float)
+        self.idle = (plan['Action'] == 'idle').to_numpy()
+        self.charge = (plan['Action'] == 'charge').to_numpy()
+        self.sellable = self.spot_price > 0
+
+
+def hourly_costs(data: pd.DataFrame, plan: pd.DataFrame, max_rate: float = MAX_RATE) -> pd.DataFrame:
+    """ Calculate the electricity cost of every planned hour for every baseline (negative if sold)
+
+    Args:
+        data: Input DataFrame to Planner
+        plan: Output DataFrame from Planner
+        max_rate: Max charge rate of battery
+
+    Returns:
+        DataFrame with Time and NormalBuy, BetterBuy and SmartBuy costs
+
+    """
+    hours = _Hours(data, plan)
+    price, spot_price, surplus = hours.price, hours.spot_price, hours.surplus
+    sold = (surplus > 0) & hours.sellable
+    idle, charge = hours.idle, hours.charge
+
+    better_buy = np.where(sold, -spot_price * surplus, 0.0) + np.where(surplus <= 0, price * -surplus, 0.0)
+
+    smart_buy = np.where(idle & sold, -spot_price * surplus, 0.0)
+    smart_buy += np.where(idle & (surplus < 0), price * -surplus, 0.0)
+    smart_buy += np.where(charge & (surplus < 0), price * (hours.el_net_charge - surplus), 0.0)
+    smart_buy += np.where(charge & (surplus >= 0) & (surplus < max_rate), price * hours.el_net_charge, 0.0)
+    smart_buy += np.where(charge & (surplus > max_rate) & hours.sellable, -spot_price * (surplus - max_rate), 0.0)
+
+    return pd.DataFrame({'Time': hours.time,
+                         'NormalBuy': hours.consumption * price,
+                         'BetterBuy': better_buy,
+                         'SmartBuy': smart_buy})
+
+
+def accumulated_costs(data: pd.DataFrame, plan: pd.DataFrame, max_rate: float = MAX_RATE) -> pd.DataFrame:
+    """ Calculate the accumulated electricity cost after every planned hour for every baseline
+
+    Args:
+        data: Input DataFrame to Planner
+        plan: Output DataFrame from Planner
+        max_rate: Max charge rate of battery
+
+    Returns:
+        DataFrame with Time and accumulated NormalBuy, BetterBuy and SmartBuy costs
+
+    """
+    costs = hourly_costs(data, plan, max_rate)
+    costs[COST_COLUMNS] = costs[COST_COLUMNS].cumsum()
+    return costs
+
+
+def hourly_buy_prices(data: pd.DataFrame, plan: pd.DataFrame, max_rate: float = MAX_RATE) -> pd.DataFrame:
+    """ Calculate the price paid (negative if sold) for electricity in every planned hour for every baseline
+
+    Args:
+        data: Input DataFrame to Planner
+        plan: Output DataFrame from Planner
+        max_rate: Max charge rate of battery
+
+    Returns:
+        DataFrame with Time and NormalBuyPrice, BetterBuyPrice and SmartBuyPrice
+
+    """
+    hours = _Hours(data, plan)
+    price, surplus = hours.price, hours.surplus
+    sell_price = -np.maximum(hours.spot_price, 0.0)     # Nothing is earned at negative spot prices
+
+    better_buy_price = np.where(surplus > 0, sell_price, price)
+    smart_buy_price = np.select([hours.idle & (surplus > 0), hours.idle & (surplus < 0),
+                                 hours.charge & (surplus < max_rate), hours.charge & (surplus > max_rate)],
+                                [sell_price, price, price, sell_price], default=0.0)
+
+    return pd.DataFrame({'Time': hours.time,
+                         'NormalBuyPrice': price,
+                         'BetterBuyPrice': better_buy_price,
+                         'SmartBuyPrice': smart_buy_price})
+
+
+def battery_loss(plan: pd.DataFrame) -> npt.NDArray[np.float64]:
+    """ Calculate the energy lost in the battery in every planned hour
+
+    Args:
+        plan: Output DataFrame from Planner
+
+    Returns:
+        Energy lost in every hour (kWh)
+
+    """
+    return np.abs(plan['BatteryDelta'].to_numpy(dtype=float)) * BATTERY_LOSS
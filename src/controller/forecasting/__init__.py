@@ -0,0 +1,4 @@
+# pylint: skip-file
+from .consumption import ConsumptionForecaster, load_consumption_forecaster, train_consumption_forecaster
+from .solar_bias import SolarCorrector, load_solar_corrector, train_solar_corrector
+from .spot_forecast import SpotPriceForecaster, extend_with_forecast
\ No newline at end of file
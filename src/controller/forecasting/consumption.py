@@ -0,0 +1,261 @@
+"""
+Forecasting of household electricity consumption from measured consumption
+
+Date:
+    19-10-2026
+
+Example:
+    >>> forecaster = load_consumption_forecaster()
+    >>> expected_consumption = forecaster.expected_consumption(time_window)
+    >>> forecaster.metrics
+    {'mae': 0.12, 'rmse': 0.18, 'bias': -0.01, 'samples': 312}
+
+"""
+
+import json
+import sqlite3
+import threading
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from os import path
+from copy import deepcopy
+from typing import Any
+from datetime import datetime, timedelta
+
+from data.helperfunctions import WeekDays
+from database import Database
+from database.database import TIME_FORMAT
+
+
+CONSUMPTION_PATH = path.join(path.dirname(path.dirname(path.dirname(__file__))), 'database', 'test_data')
+
+MODEL_NAME = 'consumption'
+ALPHA = 0.1             # Weight of a new measurement in the profile of its weekday and hour
+MIN_SAMPLES = 45        # Hourly measurements from fewer monitor readings (e.g. at startup) are not learned from
+DAYS = 7
+HOURS = 24
+
+# Cached forecaster shared by every Collector and the profiles it was seeded from (None if it has learned)
+_forecaster: dict[str, Any] = {'forecaster': None, 'profiles': None}
+_profiles: dict[str, tuple[tuple[float, ...], npt.NDArray[np.float64]]] = {}
+_lock = threading.Lock()
+
+
+class ConsumptionForecaster:
+    """ Class for forecasting consumption with exponentially weighted weekday and hour profiles """
+    def __init__(self, profile: npt.NDArray[np.float64], last_update: datetime = datetime.min,
+                 errors: tuple[float, float, float, int] = (0.0, 0.0, 0.0, 0)):
+        if profile.shape != (DAYS, HOURS):
+            raise ValueError(f"Profile must have shape {(DAYS, HOURS)}, not {profile.shape}")
+
+        self._profile = profile.astype(float)
+        # Two weeks of hours in a row, so any window of up to a week is a single slice
+        self._weeks = np.tile(self._profile.ravel(), 2)
+        self._last_update = last_update
+        self._errors = errors   # Sums of absolute, squared and signed errors and number of samples
+
+    def __repr__(self):
+        return f"ConsumptionForecaster(last_update={self._last_update}, samples={self._errors[3]})"
+
+    @property
+    def profile(self) -> npt.NDArray[np.float64]:
+        """ Get expected consumption for every weekday (rows) and hour (columns) """
+        return self._profile.copy()
+
+    @property
+    def last_update(self) -> datetime:
+        """ Get time of the newest measurement learned from """
+        return self._last_update
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        """ Get mean absolute error, root mean squared error and bias of the forecasts made before learning """
+        absolute, squared, signed, samples = self._errors
+
+        if samples == 0:
+            return {'mae': float('nan'), 'rmse': float('nan'), 'bias': float('nan'), 'samples': 0}
+        return {'mae': absolute / samples, 'rmse': float(np.sqrt(squared / samples)),
+                'bias': signed / samples, 'samples': samples}
+
+    @classmethod
+    def from_state(cls, state: str) -> 'ConsumptionForecaster':
+        """ Create a forecaster from a state saved by `to_state`
+
+        Args:
+            state: JSON encoded state of forecaster
+
+        Returns:
+            The restored forecaster
+
+        """
+        content = json.loads(state)
+        return cls(np.array(content['profile']), datetime.strptime(content['last_update'], TIME_FORMAT),
+                   tuple(content['errors'])) # type: ignore
+
+    def to_state(self) -> str:
+        """ Get the state of the forecaster for saving
+
+        Returns:
+            JSON encoded state of forecaster
+
+        """
+        last_update = max(self._last_update, datetime(1970, 1, 1))
+        return json.dumps({'profile': self._profile.round(4).tolist(),
+                           'last_update': datetime.strftime(last_update, TIME_FORMAT),
+                           'errors': list(self._errors)})
+
+    def update(self, times: list[datetime], consumption: list[float]) -> int:
+        """ Learn from hourly measured consumption newer than the last update
+
+        Args:
+            times: Start of every measured hour
+            consumption: Measured consumption of every hour (kWh)
+
+        Returns:
+            Number of measurements learned from
+
+        """
+        absolute, squared, signed, samples = self._errors
+        learned = 0
+
+        for time, actual in sorted(zip(times, consumption)):
+            if time <= self._last_update or np.isnan(actual):
+                continue
+
+            day, hour = time.weekday(), time.hour
+            error = self._profile[day, hour] - actual
+            absolute, squared, signed, samples = absolute + abs(error), squared + error**2, signed + error, samples + 1
+            self._profile[day, hour] += ALPHA * (actual - self._profile[day, hour])
+            self._weeks[[day * HOURS + hour, (DAYS + day) * HOURS + hour]] = self._profile[day, hour]
+            self._last_update = time
+            learned += 1
+
+        self._errors = (float(absolute), float(squared), float(signed), samples)
+        return learned
+
+    def forecast(self, times: pd.DatetimeIndex) -> npt.NDArray[np.float64]:
+        """ Forecast consumption for every hour
+
+        Args:
+            times: Hours to forecast
+
+        Returns:
+            Expected consumption of every hour (kWh)
+
+        """
+        return self._profile[times.weekday, times.hour]
+
+    def expected_consumption(self, time_window: tuple[datetime, datetime]) -> pd.DataFrame:
+        """ Get expected consumption for every hour in a time window
+
+        Args:
+            time_window: Start-time and end-time of the known electricity spot prices
+
+        Returns:
+            DataFrame with Time and ExpectedConsumption columns
+
+        """
+        times = pd.date_range(time_window[0], time_window[1], freq='h')
+        start = time_window[0].weekday() * HOURS + time_window[0].hour
+
+        if times.size <= DAYS * HOURS:
+            expected = self._weeks[start:start + times.size]
+        else:
+            expected = self.forecast(times)
+
+        return pd.DataFrame({'Time': times, 'ExpectedConsumption': expected})
+
+
+def read_profiles(folder: str) -> npt.NDArray[np.float64]:
+    """ Read the static consumption profile CSV file of every weekday
+
+    Args:
+        folder: Folder with a CSV file with an ExpectedConsumption column for every weekday (e.g. mon.csv)
+
+    Returns:
+        Expected consumption for every weekday (rows) and hour (columns)
+
+    """
+    return np.array([pd.read_csv(path.join(folder, f"{day.name}.csv"))['ExpectedConsumption'].to_numpy(dtype=float)
+                     for day in WeekDays])
+
+
+def load_profiles(folder: str) -> npt.NDArray[np.float64]:
+    """ Get the static consumption profiles of every weekday.
+    Files are only parsed again if they have changed on disk.
+
+    Args:
+        folder: Folder with a CSV file with an ExpectedConsumption column for every weekday (e.g. mon.csv)
+
+    Returns:
+        Expected consumption for every weekday (rows) and hour (columns), shared between callers
+
+    """
+    modified = tuple(path.getmtime(path.join(folder, f"{day.name}.csv")) for day in WeekDays)
+    cached = _profiles.get(folder)
+
+    if cached is None or cached[0] != modified:
+        cached = (modified, read_profiles(folder))
+        _profiles[folder] = cached
+
+    return cached[1]
+
+
+def load_consumption_forecaster() -> ConsumptionForecaster: # pragma: no cover
+    """ Get the cached forecaster, loaded from database or seeded from the static weekday profiles.
+    A seeded forecaster is seeded again if the profiles change on disk before it has learned anything.
+
+    Returns:
+        The shared consumption forecaster (must not be modified)
+
+    """
+    with _lock:
+        if _forecaster['forecaster'] is None:
+            try:
+                saved = Database().load_model_state(MODEL_NAME)
+            except sqlite3.OperationalError:    # Database tables are not created yet
+                saved = None
+
+            if saved is not None:
+                _forecaster['forecaster'] = ConsumptionForecaster.from_state(saved['State'])
+
+        if _forecaster['forecaster'] is None or _forecaster['profiles'] is not None:
+            profiles = load_profiles(CONSUMPTION_PATH)
+
+            if profiles is not _forecaster['profiles']:
+                _forecaster['forecaster'] = ConsumptionForecaster(profiles)
+                _forecaster['profiles'] = profiles
+
+        return _forecaster['forecaster'] # type: ignore
+
+
+def train_consumption_forecaster(db: Database, current_time: datetime) -> int: # pragma: no cover
+    """ Learn from hourly measurements stored since the last update and save the forecaster
+
+    Args:
+        db: Database with hourly measurements
+        current_time: Current day and time
+
+    Returns:
+        Number of measurements learned from
+
+    """
+    forecaster = deepcopy(load_consumption_forecaster())
+    start_time = max(forecaster.last_update + timedelta(hours=1), current_time - timedelta(days=DAYS))
+    rows = [row for row in db.load_measurements(datetime.strftime(start_time, TIME_FORMAT),
+                                                datetime.strftime(current_time, TIME_FORMAT), hourly=True)
+            if row['Samples'] >= MIN_SAMPLES]
+
+    learned = forecaster.update([datetime.strptime(row['Time'], TIME_FORMAT) for row in rows],
+                                [row['NetRate'] for row in rows])
+
+    if learned:
+        db.save_model_state(MODEL_NAME, datetime.strftime(forecaster.last_update, TIME_FORMAT), forecaster.to_state())
+        # Swap in the updated copy, so Collectors reading the old forecaster are not affected
+        with _lock:
+            _forecaster['forecaster'] = forecaster
+            _forecaster['profiles'] = None
+
+    return learned
@@ -0,0 +1,265 @@
+"""
+Bias correction of Solcast solar power forecasts from realized production (estimated actuals)
+
+Date:
+    19-10-2026
+
+Example:
+    >>> corrector = load_solar_corrector()
+    >>> solars = get_solars(api_key, resource_ids, time_window, correct=corrector.correct)
+    >>> corrector.metrics
+    {'b68d-c05a-c2b3-2cf9': {'mae': 0.21, 'corrected_mae': 0.14, 'samples': 620}}
+
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import numpy as np
+import numpy.typing as npt
+
+from os import path
+from copy import deepcopy
+from typing import Any
+
+from data import Solar
+from data.helperfunctions import Parser
+from database import Database
+
+
+ROOFTOP_PATH = path.join(path.dirname(path.dirname(path.dirname(__file__))), 'database', 'solcast_rooftops')
+
+MODEL_NAME = 'solar'
+HOURS = 24
+ALPHA = 0.05            # Weight of a new half-hour in the production averages of its hour
+MIN_FORECAST = 0.05     # Hours with lower average forecasts (kW) are not corrected
+MIN_FACTOR = 0.5        # Corrections are limited, so a bad week of data can not zero a forecast ...
+MAX_FACTOR = 1.5        # ... or inflate it
+
+_corrector: dict[str, Any] = {'corrector': None}    # Cached corrector shared by every Collector
+_lock = threading.Lock()
+
+
+class SolarCorrector:
+    """ Class for correcting the bias of solar forecasts for every rooftop and hour of the day """
+    def __init__(self, rooftops: dict[str, dict[str, Any]] | None = None):
+        self._rooftops = rooftops if rooftops is not None else {}
+
+    def __repr__(self):
+        return f"SolarCorrector(rooftops={list(self._rooftops)})"
+
+    @property
+    def metrics(self) -> dict[str, dict[str, float]]:
+        """ Get mean absolute error of the raw and the corrected forecasts for every rooftop """
+        metrics = {}
+
+        for resource_id, rooftop in self._rooftops.items():
+            absolute, corrected, samples = rooftop['errors']
+            metrics[resource_id] = {'mae': absolute / samples if samples else float('nan'),
+                                    'corrected_mae': corrected / samples if samples else float('nan'),
+                                    'samples': samples}
+        return metrics
+
+    @classmethod
+    def from_state(cls, state: str) -> 'SolarCorrector':
+        """ Create a corrector from a state saved by `to_state`
+
+        Args:
+            state: JSON encoded state of corrector
+
+        Returns:
+            The restored corrector
+
+        """
+        return cls(json.loads(state))
+
+    def to_state(self) -> str:
+        """ Get the state of the corrector for saving
+
+        Returns:
+            JSON encoded state of corrector
+
+        """
+        return json.dumps(self._rooftops)
+
+    def factors(self, resource_id: str) -> npt.NDArray[np.float64]:
+        """ Get the correction factor for every hour of the day for a rooftop
+
+        Args:
+            resource_id: ID of Solcast rooftop
+
+        Returns:
+            Factors to multiply forecasts with (1.0 for hours without enough data)
+
+        """
+        if resource_id not in self._rooftops:
+            return np.ones(HOURS)
+
+        actual = np.array(self._rooftops[resource_id]['actual'])
+        forecast = np.array(self._rooftops[resource_id]['forecast'])
+        ratio = np.divide(actual, forecast, out=np.ones(HOURS), where=forecast >= MIN_FORECAST)
+
+        return np.clip(ratio, MIN_FACTOR, MAX_FACTOR)
+
+    def correct(self, resource_id: str, solars: list[Solar]) -> list[Solar]:
+        """ Correct the forecasts of a rooftop
+
+        Args:
+            resource_id: ID of Solcast rooftop
+            solars: Hourly solar power forecasts of rooftop
+
+        Returns:
+            Corrected hourly solar power forecasts
+
+        """
+        factors = self.factors(resource_id)
+        return [Solar(solar.time, round(solar.power * float(factors[solar.time.hour]), 4)) for solar in solars]
+
+    def observe_forecasts(self, resource_id: str, forecasts: list[dict[str, Any]]) -> None:
+        """ Remember forecasts for periods that are not realized yet.
+        A newer forecast of a period replaces an older one.
+
+        Args:
+            resource_id: ID of Solcast rooftop
+            forecasts: Solcast forecasts with period_end and pv_estimate
+
+        """
+        rooftop = self._rooftop(resource_id)
+
+        for forecast in forecasts:
+            if forecast['period_end'] > rooftop['last_actual']:
+                rooftop['pending'][forecast['period_end']] = forecast['pv_estimate']
+
+    def observe_actuals(self, resource_id: str, actuals: list[dict[str, Any]]) -> int:
+        """ Learn from realized production newer than the last learned period
+
+        Args:
+            resource_id: ID of Solcast rooftop
+            actuals: Solcast estimated actuals with period_end and pv_estimate
+
+        Returns:
+            Number of forecasted periods learned from
+
+        """
+        rooftop = self._rooftop(resource_id)
+        factors = self.factors(resource_id)
+        absolute, corrected, samples = rooftop['errors']
+        learned = 0
+
+        for actual in sorted(actuals, key=lambda actual: actual['period_end']):
+            period_end = actual['period_end']
+
+            if period_end <= rooftop['last_actual']:
+                continue
+            rooftop['last_actual'] = period_end
+
+            forecast = rooftop['pending'].pop(period_end, None)
+            if forecast is None:
+                continue
+
+            hour = Parser.parse_iso_time(period_end).hour
+            absolute += abs(forecast - actual['pv_estimate'])
+            corrected += abs(forecast * factors[hour] - actual['pv_estimate'])
+            samples += 1
+            rooftop['actual'][hour] += ALPHA * (actual['pv_estimate'] - rooftop['actual'][hour])
+            rooftop['forecast'][hour] += ALPHA * (forecast - rooftop['forecast'][hour])
+            learned += 1
+
+        # Forecasts of periods that were never realized will not be learned from
+        rooftop['pending'] = {period_end: forecast for period_end, forecast in rooftop['pending'].items()
+                              if period_end > rooftop['last_actual']}
+        rooftop['errors'] = [float(absolute), float(corrected), samples]
+        return learned
+
+    def _rooftop(self, resource_id: str) -> dict[str, Any]:
+        """ Get the state of a rooftop (created if it is new) """
+        return self._rooftops.setdefault(resource_id, {
+            'actual': [0.0] * HOURS,    # Exponentially weighted production for every hour of the day
+            'forecast': [0.0] * HOURS,  # Exponentially weighted forecasts for every hour of the day
+            'pending': {},              # Forecasts by period end that are not realized yet
+            'last_actual': '',          # Period end of the newest learned production
+            'files': {},                # Modification time of every read file
+            'errors': [0.0, 0.0, 0],
+        })
+
+    def update_from_archive(self, resource_id: str, rooftop_path: str = ROOFTOP_PATH) -> int:
+        """ Learn from the archived Solcast files of a rooftop.
+        Only files that are new or have changed since the last update are read.
+
+        Args:
+            resource_id: ID of Solcast rooftop
+            rooftop_path: Folder with a folder of forecasts and estimated actuals for every rooftop
+
+        Returns:
+            Number of forecasted periods learned from
+
+        """
+        rooftop = self._rooftop(resource_id)
+        learned = 0
+
+        # Forecasts must be known before the production they forecast is learned from
+        for folder in ['forecasts', 'estimated_actuals']:
+            folder_path = path.join(rooftop_path, resource_id, folder)
+            files = sorted(file for file in os.listdir(folder_path) if file != "dummy.json") \
+                    if path.isdir(folder_path) else []
+
+            for file in files:
+                key = f"{folder}/{file}"
+                modified = path.getmtime(path.join(folder_path, file))
+
+                if rooftop['files'].get(key) == modified:
+                    continue
+                rooftop['files'][key] = modified
+
+                with open(path.join(folder_path, file), 'r', encoding='utf-8') as f:
+                    content = json.loads(f.read())
+
+                if folder == 'forecasts':
+                    self.observe_forecasts(resource_id, content['forecasts'])
+                else:
+                    learned += self.observe_actuals(resource_id, content['estimated_actuals'])
+
+        return learned
+
+
+def load_solar_corrector() -> SolarCorrector: # pragma: no cover
+    """ Get the cached corrector, loaded from database
+
+    Returns:
+        The shared solar corrector (must not be modified)
+
+    """
+    with _lock:
+        if _corrector['corrector'] is None:
+            try:
+                saved = Database().load_model_state(MODEL_NAME)
+            except sqlite3.OperationalError:    # Database tables are not created yet
+                saved = None
+
+            _corrector['corrector'] = SolarCorrector.from_state(saved['State']) if saved else SolarCorrector()
+
+        return _corrector['corrector'] # type: ignore
+
+
+def train_solar_corrector(db: Database, resource_ids: list[str], updated: str) -> int: # pragma: no cover
+    """ Learn from new archived Solcast files and save the corrector
+
+    Args:
+        db: Database to save the corrector in
+        resource_ids: ID's for Solcast rooftops
+        updated: Current time (formatted with TIME_FORMAT)
+
+    Returns:
+        Number of forecasted periods learned from
+
+    """
+    corrector = deepcopy(load_solar_corrector())
+    learned = sum(corrector.update_from_archive(resource_id) for resource_id in resource_ids if resource_id)
+
+    db.save_model_state(MODEL_NAME, updated, corrector.to_state())
+    # Swap in the updated copy, so Collectors reading the old corrector are not affected
+    with _lock:
+        _corrector['corrector'] = corrector
+
+    return learned
@@ -0,0 +1,205 @@
+"""
+Forecasting of electricity spot prices beyond the published day-ahead prices
+
+Date:
+    19-10-2026
+
+Example:
+    >>> spot_prices = get_spot_prices('DK1')                # Published until 23:00 today (before 13:00)
+    >>> spot_prices = extend_with_forecast(spot_prices)     # Forecasted until 23:00 tomorrow
+    >>> [spot_price.forecast for spot_price in spot_prices[-2:]]
+    [True, True]
+
+"""
+
+import sqlite3
+import threading
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from data.electricity.spot_price import SpotPrice, get_spot_price_history
+from data.helperfunctions import FetchError
+from database import Database
+from database.database import TIME_FORMAT
+
+
+HISTORY_DAYS = 28       # Days of archived spot prices the forecaster is fitted to
+MIN_HISTORY = 7 * 24    # Hours of archived spot prices needed before the history is not fetched again
+BACKFILL_COOLDOWN = timedelta(hours=6)     # Time before a history fetch is tried again for a price area
+HALF_LIFE = 14.0        # Days until a price has half the weight of the newest price
+LEVEL_HOURS = 24        # Newest hours that decide how far prices currently are from the profile
+DAYS = 7
+HOURS = 24
+
+_backfills: dict[str, datetime] = {}     # Time history was last fetched for every price area
+_lock = threading.Lock()
+
+
+class SpotPriceForecaster:
+    """ Class for forecasting spot prices with an exponentially weighted weekday and hour profile """
+    def __init__(self, profile: npt.NDArray[np.float64], level: float = 0.0):
+        if profile.shape != (DAYS, HOURS):
+            raise ValueError(f"Profile must have shape {(DAYS, HOURS)}, not {profile.shape}")
+
+        self._profile = profile.astype(float)
+        self._level = level
+
+    def __repr__(self):
+        return f"SpotPriceForecaster(level={self._level})"
+
+    @property
+    def profile(self) -> npt.NDArray[np.float64]:
+        """ Get typical spot price for every weekday (rows) and hour (columns) """
+        return self._profile.copy()
+
+    @property
+    def level(self) -> float:
+        """ Get difference between the newest spot prices and the profile (DKK/kWh) """
+        return self._level
+
+    @classmethod
+    def fit(cls, times: list[datetime], prices: list[float]) -> 'SpotPriceForecaster':
+        """ Fit a forecaster to historical spot prices.
+        Weekday and hour slots without prices fall back to the average of the hour, then of every price.
+
+        Args:
+            times: Time of every spot price
+            prices: Spot price of every hour (DKK/kWh)
+
+        Returns:
+            The fitted forecaster
+
+        """
+        if not times:
+            raise ValueError("Spot prices are needed to fit a forecaster")
+
+        stamps = np.asarray(times, dtype='datetime64[h]').astype(np.int64)  # Hours since 1970-01-01, a Thursday
+        values = np.asarray(prices, dtype=float)
+        weights = 0.5 ** ((stamps.max() - stamps) / (HALF_LIFE * HOURS))
+        hours = stamps % HOURS
+        slots = (stamps // HOURS + 3) % DAYS * HOURS + hours
+
+        hourly = _weighted_means(hours, values, weights, np.full(HOURS, np.average(values, weights=weights)))
+        profile = _weighted_means(slots, values, weights, np.tile(hourly, DAYS))
+
+        # Prices move with fuel prices and weather, so shift the profile to the level of the newest prices
+        newest = np.argsort(stamps)[-LEVEL_HOURS:]
+        level = float(np.mean(values[newest] - profile[slots[newest]]))
+
+        return cls(profile.reshape(DAYS, HOURS), level)
+
+    def forecast(self, times: pd.DatetimeIndex) -> npt.NDArray[np.float64]:
+        """ Forecast spot prices for every hour
+
+        Args:
+            times: Hours to forecast
+
+        Returns:
+            Expected spot price of every hour (DKK/kWh)
+
+        """
+        return self._profile[times.weekday, times.hour] + self._level
+
+
+def _weighted_means(groups: npt.NDArray[np.int64], values: npt.NDArray[np.float64],
+                    weights: npt.NDArray[np.float64], fallback: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """ Get the weighted mean of the values in every group, or the fallback of groups without values """
+    group_weights = np.bincount(groups, weights, minlength=fallback.size)
+    group_sums = np.bincount(groups, weights * values, minlength=fallback.size)
+    return np.divide(group_sums, group_weights, out=fallback.astype(float), where=group_weights > 0)
+
+
+def horizon_end(current_time: datetime) -> datetime:
+    """ Get the last hour the Planner plans for.
+    Ends at 23:00 tomorrow, so the planning window only moves once a day like the published prices.
+
+    Args:
+        current_time: Current day and time
+
+    Returns:
+        Time of the last hour to forecast
+
+    """
+    midnight = datetime.combine(current_time.date(), datetime.min.time())
+    return midnight + timedelta(days=2) - timedelta(hours=1)
+
+
+def extend_spot_prices(spot_prices: list[SpotPrice],
+                       forecaster: SpotPriceForecaster,
+                       end: datetime) -> list[SpotPrice]:
+    """ Extend published spot prices with forecasted spot prices
+
+    Args:
+        spot_prices: Published spot prices ordered by time
+        forecaster: Forecaster fitted to historical spot prices
+        end: Time of the last hour to forecast
+
+    Returns:
+        The published spot prices followed by a forecasted spot price for every hour until end
+
+    """
+    if not spot_prices or spot_prices[-1].time >= end:
+        return spot_prices
+
+    last = spot_prices[-1]
+    times = pd.date_range(last.time + timedelta(hours=1), end, freq='h')
+    prices = forecaster.forecast(times).round(5)
+
+    return spot_prices + [SpotPrice(time.to_pydatetime(), last.price_area, float(price), True)
+                          for time, price in zip(times, prices)]
+
+
+def _claim_backfill(price_area: str, current_time: datetime) -> bool:
+    """ Get whether history should be fetched for a price area, recording the attempt if so """
+    with _lock:
+        last = _backfills.get(price_area)
+        if last is not None and current_time - last < BACKFILL_COOLDOWN:
+            return False
+
+        _backfills[price_area] = current_time
+        return True
+
+
+def extend_with_forecast(spot_prices: list[SpotPrice]) -> list[SpotPrice]:
+    """ Archive published spot prices and extend them with forecasted spot prices until 23:00 tomorrow.
+    History is fetched if too few spot prices are archived (e.g. at first startup),
+    at most once every BACKFILL_COOLDOWN for a price area, so a short history is not fetched every cycle.
+
+    Args:
+        spot_prices: Published spot prices ordered by time
+
+    Returns:
+        The extended spot prices, or the published spot prices if no history is available
+
+    """
+    if not spot_prices:
+        return spot_prices
+
+    price_area = spot_prices[0].price_area
+    current_time = datetime.now()
+    start_time = datetime.strftime(current_time - timedelta(days=HISTORY_DAYS), TIME_FORMAT)
+
+    try:
+        db = Database()
+        db.save_spot_prices([(datetime.strftime(spot_price.time, TIME_FORMAT), spot_price.price_area,
+                              spot_price.price) for spot_price in spot_prices])
+        rows = db.load_spot_prices(price_area, start_time)
+
+        if len(rows) < MIN_HISTORY and _claim_backfill(price_area, current_time):
+            history = get_spot_price_history(price_area, (current_time - timedelta(days=HISTORY_DAYS)).date())
+            db.save_spot_prices([(datetime.strftime(spot_price.time, TIME_FORMAT), spot_price.price_area,
+                                  spot_price.price) for spot_price in history])
+            rows = db.load_spot_prices(price_area, start_time)
+    # Database tables are not created yet or the history could not be fetched
+    except (sqlite3.Error, OSError, ValueError, FetchError):
+        return spot_prices
+
+    if not rows:
+        return spot_prices
+
+    forecaster = SpotPriceForecaster.fit([datetime.strptime(row['Time'], TIME_FORMAT) for row in rows],
+                                         [row['SpotPrice'] for row in rows])
+    return extend_spot_prices(spot_prices, forecaster, horizon_end(current_time))
@@ -0,0 +1,158 @@
+"""
+History of prices, SoC, consumption, solar power and savings, rolled up by hour, day and month
+and downsampled with Largest-Triangle-Three-Buckets (LTTB), so plots stay light at any range
+
+Date:
+    19-10-2026
+
+Example:
+    >>> rollup_history(Database(), datetime(2023, 10, 3, 14, 5))
+    3
+    >>> period, history = load_history(Database(), datetime(2023, 9, 3), datetime(2023, 10, 3))
+    >>> period, len(history)
+    ('hour', 483)
+
+"""
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from datetime import datetime, timedelta
+
+from database import Database
+from database.database import TIME_FORMAT
+from .realized_profit import period_starts
+
+
+PERIODS = ('hour', 'day', 'month')
+SERIES = ['Price', 'SpotPrice', 'Soc', 'Consumption', 'Solar', 'Savings']
+MAX_POINTS = 500        # Rows of a loaded history ...
+OVERSAMPLING = 4        # ... downsampled from the finest rollup with at most this many times more rows
+MAX_BACKLOG = timedelta(days=7)     # Hours measured longer ago are not rolled up
+
+
+def rollup_history(db: Database, current_time: datetime) -> int:
+    """ Add the complete hours measured since the last rolled up hour to the hour, day and month rollups
+
+    Args:
+        db: Database with hourly measurements, plan history and realized profit
+        current_time: Current day and time
+
+    Returns:
+        Number of hours rolled up
+
+    """
+    current_hour = current_time.replace(minute=0, second=0, microsecond=0)
+    start_time = current_hour - MAX_BACKLOG
+    last_hour = db.load_last_history_hour()
+
+    if last_hour is not None:
+        start_time = max(start_time, datetime.strptime(last_hour, TIME_FORMAT) + timedelta(hours=1))
+
+    hours = db.load_history_hours(datetime.strftime(start_time, TIME_FORMAT),
+                                  datetime.strftime(current_hour, TIME_FORMAT))
+    rows = [(period, start, hour['Price'], hour['SpotPrice'], hour['Soc'], hour['MinSoc'], hour['MaxSoc'],
+             hour['Consumption'], hour['Solar'], hour['Savings'], 1)
+            for hour in hours
+            for period, start in zip(PERIODS, period_starts(hour['Time']))]
+
+    db.add_history(rows)
+    return len(hours)
+
+
+def history_period(start_time: datetime, end_time: datetime, max_points: int = MAX_POINTS) -> str:
+    """ Get the finest rollup period that does not need too much downsampling for a time range
+
+    Args:
+        start_time: Start of range
+        end_time: End of range
+        max_points: Rows after downsampling
+
+    Returns:
+        'hour', 'day' or 'month'
+
+    """
+    hours = (end_time - start_time) / timedelta(hours=1)
+
+    if hours <= max_points * OVERSAMPLING:
+        return 'hour'
+    if hours / 24 <= max_points * OVERSAMPLING:
+        return 'day'
+    return 'month'
+
+
+def load_history(db: Database, start_time: datetime, end_time: datetime,
+                 max_points: int = MAX_POINTS) -> tuple[str, pd.DataFrame]:
+    """ Load the history of a time range from the finest fitting rollup, downsampled to at most max_points
+
+    Args:
+        db: Database with history rollups
+        start_time: Start of range
+        end_time: End of range
+        max_points: Rows after downsampling
+
+    Returns:
+        The rollup period and a DataFrame with Time and every series.
+        Every series gets an equal share of the rows, and rows are kept if any series keeps them,
+        so the shape of every series is kept.
+
+    """
+    period = history_period(start_time, end_time, max_points)
+    history = pd.DataFrame(db.load_history(period, datetime.strftime(start_time, TIME_FORMAT),
+                                           datetime.strftime(end_time, TIME_FORMAT)),
+                           columns=['Time', *SERIES, 'MinSoc', 'MaxSoc', 'Hours'])
+    history['Time'] = pd.to_datetime(history['Time'], format=TIME_FORMAT)
+
+    if len(history) > max_points:
+        x = history['Time'].to_numpy(dtype='datetime64[s]').astype(float)
+        share = max(3, max_points // len(SERIES))
+        keep = np.unique(np.concatenate([lttb(x, history[column].to_numpy(dtype=float), share)
+                                         for column in SERIES]))
+        if len(keep) > max_points:
+            # Too few rows for a share of every series (LTTB needs at least 3), so keep evenly spaced rows
+            keep = np.unique(np.linspace(0, len(history) - 1, max_points).round().astype(np.int64))
+        history = history.iloc[keep].reset_index(drop=True)
+
+    return period, history
+
+
+def lttb(x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], threshold: int) -> npt.NDArray[np.int64]:
+    """ Downsample a series with Largest-Triangle-Three-Buckets.
+    The first and last points are kept, and from every bucket in between the point making the largest
+    triangle with the last kept point and the average of the next bucket is kept.
+
+    Args:
+        x: Ordered x-values of series
+        y: y-values of series (missing values are never kept, unless a bucket has nothing else)
+        threshold: Number of points to keep
+
+    Returns:
+        Indexes of the kept points, in order
+
+    """
+    points = len(x)
+    if threshold >= points or threshold < 3:
+        return np.arange(points, dtype=np.int64)
+
+    every = (points - 2) / (threshold - 2)
+    kept: npt.NDArray[np.int64] = np.zeros(threshold, dtype=np.int64)
+    kept[-1] = points - 1
+    last = 0
+
+    for bucket in range(threshold - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, points)
+        next_x, next_y = x[end:next_end].mean(), _mean(y[end:next_end])
+
+        area = np.abs((x[last] - next_x) * (y[start:end] - y[last]) - (x[last] - x[start:end]) * (next_y - y[last]))
+        last = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        kept[bucket + 1] = last
+
+    return kept
+
+
+def _mean(values: npt.NDArray[np.float64]) -> float:
+    """ Get the mean of the values that are not missing (0 if every value is missing) """
+    finite = values[~np.isnan(values)]
+    return float(finite.mean()) if finite.size else 0.0
@@ -0,0 +1,193 @@
+"""
+Cache of generated plans keyed by a fingerprint of the Planner input, so planning again on unchanged
+prices, solar power, consumption, SoC and settings (e.g. a restart within the same hour) returns at once.
+Recently used plans are kept in memory, and every plan is written to disk for other processes and restarts.
+
+Date:
+    19-10-2026
+
+Example:
+    >>> key = fingerprint(settings, encode_frame(collector.data), collector.battery)
+    >>> payload = PLAN_CACHE.get(key)
+    >>> if payload is None:
+    ...     payload = encode_frame(Planner(settings, data=collector.data).plan)
+    ...     PLAN_CACHE.put(key, payload)
+
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+
+from os import path
+from typing import Any
+from collections import OrderedDict
+
+from data import Battery
+from data.helperfunctions import write_atomic
+from profiling import count
+
+
+PLAN_CACHE_FOLDER = path.join(path.dirname(path.dirname(__file__)), 'database', 'plan_cache')
+MEMORY_SIZE = 16            # Plans kept in memory (least recently used are evicted first)
+DISK_SIZE = 256             # Plans kept on disk (oldest are removed first)
+SOC_BUCKET = 1.0            # SoC is rounded to buckets of 1 %, so measurement noise does not miss the cache
+SETTINGS_KEYS = ('capacity', 'effectivity', 'threshold', 'max_rate', 'solar_strategy')
+
+
+def fingerprint(settings: dict[str, Any], data: dict[str, Any], battery: Battery) -> str:
+    """ Get the fingerprint of a Planner input
+
+    Args:
+        settings: User settings from Application (only the settings used by Planner are hashed)
+        data: Collected input data to Planner encoded by `encode_frame`
+        battery: Battery information at collection time
+
+    Returns:
+        Hex digest of the settings, SoC bucket and every input column
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps({key: settings.get(key) for key in SETTINGS_KEYS}, default=str).encode())
+    digest.update(str(round(battery.soc / SOC_BUCKET)).encode())
+
+    for column, (kind, values) in sorted(data['columns'].items()):
+        digest.update(f"{column}:{kind}".encode())
+        if kind == 'text':
+            categories, codes = values
+            digest.update("\x00".join(map(str, categories)).encode())
+            digest.update(np.ascontiguousarray(codes).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(values).tobytes())
+
+    return digest.hexdigest()
+
+
+class PlanCache:
+    """ Class for caching encoded plans in memory with LRU eviction, backed by a folder on disk """
+    def __init__(self, folder: str | None = PLAN_CACHE_FOLDER,
+                 memory_size: int = MEMORY_SIZE, disk_size: int = DISK_SIZE):
+        self._folder = folder
+        self._memory_size = memory_size
+        self._disk_size = disk_size
+        self._plans: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def __repr__(self):
+        return f"PlanCache(folder={self._folder}, plans={len(self._plans)})"
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """ Get a cached plan from memory, or from disk if it was planned by another process or before a restart
+
+        Args:
+            key: Fingerprint of the Planner input
+
+        Returns:
+            The plan encoded by `encode_frame` (None if not cached)
+
+        """
+        if key in self._plans:
+            self._plans.move_to_end(key)
+            count('plan_cache.memory_hits')
+            return self._plans[key]
+
+        payload = self._load(key)
+        if payload is None:
+            count('plan_cache.misses')
+            return None
+
+        count('plan_cache.disk_hits')
+        self._remember(key, payload)
+        return payload
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        """ Cache a plan in memory and on disk (a failed write only loses the disk copy)
+
+        Args:
+            key: Fingerprint of the Planner input
+            payload: The plan encoded by `encode_frame`
+
+        """
+        self._remember(key, payload)
+        if self._folder is None:
+            return
+
+        arrays = _to_arrays(payload)
+        if write_atomic(self._path(key), lambda file: np.savez(file, **arrays), binary=True):
+            self._prune()
+
+    def clear(self) -> None:
+        """ Remove every cached plan from memory and disk """
+        self._plans.clear()
+        if self._folder is None or not path.isdir(self._folder):
+            return
+
+        for name in os.listdir(self._folder):
+            if name.endswith('.npz'):
+                os.remove(path.join(self._folder, name))
+
+    def _remember(self, key: str, payload: dict[str, Any]) -> None:
+        """ Keep a plan in memory, evicting the least recently used plans """
+        self._plans[key] = payload
+        self._plans.move_to_end(key)
+        while len(self._plans) > self._memory_size:
+            self._plans.popitem(last=False)
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        """ Load a plan from disk (None if not cached or unreadable) """
+        if self._folder is None:
+            return None
+
+        try:
+            with np.load(self._path(key), allow_pickle=False) as arrays:
+                return _from_arrays(dict(arrays))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _prune(self) -> None:
+        """ Remove the oldest plans on disk beyond the disk size """
+        files = [path.join(str(self._folder), name) for name in os.listdir(str(self._folder))
+                 if name.endswith('.npz')]
+        files.sort(key=path.getmtime)
+
+        for file in files[:max(0, len(files) - self._disk_size)]:
+            os.remove(file)
+
+    def _path(self, key: str) -> str:
+        """ Get path of the file of a cached plan """
+        return path.join(str(self._folder), f"{key}.npz")
+
+
+def _to_arrays(payload: dict[str, Any]) -> dict[str, Any]:
+    """ Flatten an encoded plan into named arrays without Python objects, so it is loaded without pickle """
+    arrays: dict[str, Any] = {'columns': np.array(list(payload['columns'])),
+                              'kinds': np.array([kind for kind, _ in payload['columns'].values()])}
+
+    for index, (kind, values) in enumerate(payload['columns'].values()):
+        if kind == 'text':
+            categories, codes = values
+            arrays[f"categories_{index}"] = np.asarray(categories, dtype=str)
+            arrays[f"values_{index}"] = codes
+        else:
+            arrays[f"values_{index}"] = values
+
+    return arrays
+
+
+def _from_arrays(arrays: dict[str, Any]) -> dict[str, Any]:
+    """ Rebuild an encoded plan flattened by `_to_arrays` """
+    columns: dict[str, tuple[str, Any]] = {}
+
+    for index, (column, kind) in enumerate(zip(arrays['columns'].tolist(), arrays['kinds'].tolist())):
+        values = arrays[f"values_{index}"]
+        if kind == 'text':
+            values = (arrays[f"categories_{index}"].astype(object), values)
+        columns[column] = (kind, values)
+
+    return {'columns': columns}
+
+
+PLAN_CACHE = PlanCache()    # Plan cache of this process (the disk tier is shared between processes)
@@ -0,0 +1,137 @@
+"""
+Planning in a separate worker process, so the Planner does not hold the GIL of the UI process
+
+Date:
+    19-10-2026
+
+Example:
+    >>> executor = ProcessPoolExecutor(max_workers=1, initializer=warm_up)
+    >>> payload = executor.submit(plan, settings, encode_frame(collector.data), collector.battery).result()
+    >>> plan_df = decode_frame(payload)
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from typing import Any
+from datetime import datetime, timedelta
+
+from data import Battery
+from controller.planner import Planner
+from controller.plan_cache import PlanCache, PLAN_CACHE, fingerprint
+from profiling import METRICS, timer
+
+
+WARM_UP_HOURS = 4
+
+
+def encode_frame(df: pd.DataFrame) -> dict[str, Any]:
+    """ Encode a DataFrame into a compact form for sending between processes.
+    Time columns are sent as int64 nanoseconds, flag columns as bool arrays and text columns as categorical codes.
+
+    Args:
+        df: DataFrame to encode
+
+    Returns:
+        Dict with column names, column kinds and NumPy arrays
+
+    """
+    columns: dict[str, tuple[str, Any]] = {}
+
+    for column in df.columns:
+        series = df[column]
+
+        if pd.api.types.is_datetime64_any_dtype(series):
+            columns[column] = ('time', series.to_numpy(dtype='datetime64[ns]').view(np.int64))
+        elif pd.api.types.infer_dtype(series, skipna=True) == 'boolean':
+            columns[column] = ('flag', series.to_numpy(dtype=bool))
+        elif pd.api.types.infer_dtype(series, skipna=True) in ('floating', 'integer', 'mixed-integer-float'):
+            # Planner builds its plan with object columns, so send numbers as a float array instead of objects
+            columns[column] = ('number', series.to_numpy(dtype=float))
+        else:
+            categorical = pd.Categorical(series.astype(str))
+            # pandas picks the smallest code dtype that fits every category
+            columns[column] = ('text', (np.asarray(categorical.categories, dtype=object), categorical.codes))
+
+    return {'columns': columns}
+
+
+def decode_frame(payload: dict[str, Any]) -> pd.DataFrame:
+    """ Decode a DataFrame encoded by `encode_frame`
+
+    Args:
+        payload: Encoded DataFrame
+
+    Returns:
+        The decoded DataFrame
+
+    """
+    columns = {}
+
+    for column, (kind, values) in payload['columns'].items():
+        if kind == 'time':
+            columns[column] = pd.to_datetime(values.view('datetime64[ns]'))
+        elif kind in ('number', 'flag'):
+            columns[column] = values
+        else:
+            categories, codes = values
+            columns[column] = categories[codes]
+
+    return pd.DataFrame(columns)
+
+
+def plan(settings: dict[str, Any], data: dict[str, Any], battery: Battery,
+         cache: PlanCache | None = PLAN_CACHE) -> dict[str, Any]:
+    """ Generate a plan from collected data (runs in the worker process).
+    A plan of the same input is returned from the cache instead of planning again.
+
+    Args:
+        settings: User settings from Application
+        data: Collected input data to Planner encoded by `encode_frame`
+        battery: Battery information at collection time
+        cache: Cache of plans (None to always plan)
+
+    Returns:
+        The generated plan encoded by `encode_frame`, with the timers and counters of the worker process
+        since the last plan under 'metrics' (to be merged into the metrics of the UI process)
+
+    """
+    key = fingerprint(settings, data, battery) if cache is not None else ''
+    payload = cache.get(key) if cache is not None else None
+
+    if payload is None:
+        with timer('planner.total'):
+            planner = Planner(settings, data=decode_frame(data), battery=battery)
+        payload = encode_frame(planner.plan)
+        if cache is not None:
+            cache.put(key, payload)
+
+    return {**payload, 'metrics': METRICS.drain()}
+
+
+def warm_up() -> None:
+    """ Warm up the worker process by running the Planner once on dummy data.
+    Pandas and NumPy import parts of themselves on first use, so the first real plan would pay for that.
+
+    """
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    data = pd.DataFrame({
+        'Time': [start + timedelta(hours=hour) for hour in range(WARM_UP_HOURS)],
+        'Price': [1.0, 2.0, 1.0, 2.0],
+        'SpotPrice': [0.5, 1.0, 0.5, 1.0],
+        'Power': [0.0, 1.0, 0.0, 0.0],
+        'ExpectedConsumption': [0.5, 0.5, 0.5, 0.5],
+    })
+    settings = {'capacity': 10, 'effectivity': 0.9, 'threshold': 0.0, 'max_rate': 3, 'solar_strategy': 'Sell All'}
+    decode_frame(plan(settings, encode_frame(data), Battery(start, 0.0, 0.0), cache=None))
+
+
+def ready() -> bool:
+    """ Check that the worker process is running and warmed up
+
+    Returns:
+        Always True once the worker process has started
+
+    """
+    return True
@@ -13,7 +13,9 @@ import math
 from typing import Any
 
 from controller.collector import Collector
+from data import Battery
 from controller.enums import ActionReason, SolarStrategy
+from profiling import timer, count, TRACER
 
 COLUMNS = ['Time', 'Action', 'SolarSurplus', 
            'ElNetCharge', 'BatteryDelta', 'BatteryExpected',
@@ -33,8 +35,9 @@ price_index = lambda up, bp, ef : math.floor((up * ef - bp) * 100)
 class Planner(Collector):
     """ Class for calculating the charge plan """
 
-    def __init__(self, settings: dict[str, Any]):
-        super().__init__(settings)
+    def __init__(self, settings: dict[str, Any], 
+                 data: pd.DataFrame | None = None, battery: Battery | None = None):
+        super().__init__(settings, data=data, battery=battery)
         self._max_charge_rate = settings["max_rate"]
         self._max_capacity = settings["capacity"]
         self._min_capacity = settings["threshold"]
@@ -56,49 +59,68 @@ class Planner(Collector):
         temp_output = temp_output.fillna(0.0)
         temp_output['Action'] = ''
         temp_output['ActionReason'] = ''
+        if TRACER.enabled:
+            TRACER.start(hours=int(self.data.index.values.size), first=str(self.data.at[0, 'Time']),
+                         capacity=self._max_capacity, threshold=self._min_capacity, max_rate=self._max_charge_rate)
 
         # Start index
         calc_start_index = 0
 
         # fill in the empty part of temp_output
-        self._battery_first_calculation( temp_output, calc_start_index )
+        with timer('planner.first_calculation'), TRACER.phase('first_calculation'):
+            self._battery_first_calculation( temp_output, calc_start_index )
         # guess we could check for low limit violation before or after first calculation. 
         # Choose to do it after.
-        violation = self._battery_check_if_below_minimum_charge( temp_output, 0 )
-        if violation[0] is not None:
-            # This violation should only be possible if battery starts with below minimum value:
-            # Minimum bar was raised or power went out and battery supplied energy for the house.
-            self._battery_refill_buffer_immidiately( temp_output, violation )
+        with timer('planner.refill_buffer'), TRACER.phase('refill_buffer'):
+            violation = self._battery_check_if_below_minimum_charge( temp_output, 0 )
+            if violation[0] is not None:
+                # This violation should only be possible if battery starts with below minimum value:
+                # Minimum bar was raised or power went out and battery supplied energy for the house.
+                self._battery_refill_buffer_immidiately( temp_output, violation )
                 
 
         # check if we charged above maximum with solar generated power and fix it.
-        violation = self._battery_check_if_above_maximum_charge( temp_output, calc_start_index )
-        while violation[0] is not None: # TODO: Avoid endless loop?
-            # Until we are below maximum everywhere, find out to spend energy or sell it
-            self._battery_fix_excess( temp_output, violation )
+        with timer('planner.fix_excess'), TRACER.phase('fix_excess'):
             violation = self._battery_check_if_above_maximum_charge( temp_output, calc_start_index )
-            # is it possible to make sure that we cannot get trapped in loop - if some error occurs?
+            while violation[0] is not None: # TODO: Avoid endless loop?
+                # Until we are below maximum everywhere, find out to spend energy or sell it
+                self._battery_fix_excess( temp_output, violation )
+                violation = self._battery_check_if_above_maximum_charge( temp_output, calc_start_index )
+                # is it possible to make sure that we cannot get trapped in loop - if some error occurs?
 
         # Use total area and find actions:
         calc_area = self.data.loc[ calc_start_index : self.data.index.values.size ]
         # print( f"Calc area:\n {calc_area}")
-        temp_output = self._set_peak_actions_automatic_v2( calc_area, temp_output )
+        with timer('planner.peak_actions'), TRACER.phase('peak_actions'):
+            temp_output = self._set_peak_actions_automatic_v2( calc_area, temp_output )
 
         # Should we sell combined solar surplus over the day?
-        self._solar_sell_timeframe_surplus( temp_output )
+        with timer('planner.sell_timeframe_surplus'), TRACER.phase('sell_timeframe_surplus'):
+            self._solar_sell_timeframe_surplus( temp_output )
 
         # See if high spotprice allows to sell solar and buy cheaper electricity from net
-        temp_output = self._solar_decide_sell_or_use( temp_output )
+        with timer('planner.sell_or_use_solar'), TRACER.phase('sell_or_use_solar'):
+            temp_output = self._solar_decide_sell_or_use( temp_output )
 
         # run test to make sure there are no violations:
-        violation = self._battery_check_if_above_maximum_charge( temp_output, 0 )
-        if violation[0] is not None:
-            print( f"Violation of battery bounds found at index {violation[0]} and \
-                  value {violation[1]}" )
-        violation = self._battery_check_if_below_minimum_charge( temp_output, 0 )
-        if violation[0] is not None:
-            print( f"Violation of battery bounds found at index {violation[0]} and \
-                  value {violation[1]}" )
+        with timer('planner.check_violations'), TRACER.phase('check_violations'):
+            violation = self._battery_check_if_above_maximum_charge( temp_output, 0 )
+            if violation[0] is not None:
+                count('planner.violations')
+                print( f"Violation of battery bounds found at index {violation[0]} and \
+                      value {violation[1]}" )
+            violation = self._battery_check_if_below_minimum_charge( temp_output, 0 )
+            if violation[0] is not None:
+                count('planner.violations')
+                print( f"Violation of battery bounds found at index {violation[0]} and \
+                      value {violation[1]}" )
+
+        if TRACER.enabled:
+            for index in temp_output.index.values:
+                TRACER.event('hour', hour=int(index), action=temp_output.at[index, 'Action'],
+                             reason=temp_output.at[index, 'ActionReason'],
+                             battery=float(temp_output.at[index, 'BatteryExpected']))
+            TRACER.finish()
 
         # save to output
         self._output_frame = temp_output
@@ -146,6 +168,9 @@ class Planner(Collector):
         # go through calculating worth for each hour
         peak_indices = peak_sorted.index.values
         for x in peak_indices:
+            if TRACER.enabled:
+                TRACER.event('candidate', phase='peak_actions', hour=int(x), price=float(peak_area.at[x, 'Price']),
+                             action=result.at[x, 'Action'], surplus=float(result.at[x, 'SolarSurplus']))
             # if idle use power -> equalize ? possible to use battery?
             # changed = False
             if result.at[ x, "Action" ] == 'idle':
@@ -161,6 +186,8 @@ class Planner(Collector):
                     else: 
                         # need to test if we can charge enough to equalize!
                         charge_test = self._try_to_get_charge( result, x)
+                        if TRACER.enabled:
+                            TRACER.event('trial', phase='peak_actions', hour=int(x), accepted=charge_test[0])
                         if charge_test[0]:
                             result = pd.DataFrame(charge_test[1], copy=True)               
         return result
@@ -336,6 +363,9 @@ class Planner(Collector):
             # Adjust excess and repeat pattern
             # use solarsurplus to get actual expected switch value!
             expected_consumption = abs( output_frame.at[ point_a, "SolarSurplus" ])
+            if TRACER.enabled:
+                TRACER.event('candidate', phase='fix_excess', hour=int(point_a), use=float(expected_consumption),
+                             headroom=float(min_value), accepted=bool(min_value > expected_consumption))
             if min_value > expected_consumption: 
                 self._set_loadplan_action( output_frame, point_a, 'equalize' )
                 self._set_action_reason( output_frame, point_a, 
@@ -362,6 +392,9 @@ class Planner(Collector):
                                                                   point_a, index_of_violation )
                 min_value = min_value - self._min_capacity
                 solar_surplus = output_frame.at[ point_a, "SolarSurplus" ]
+                if TRACER.enabled:
+                    TRACER.event('candidate', phase='fix_excess', hour=int(point_a), sell=float(solar_surplus),
+                                 headroom=float(min_value), accepted=bool(min_value > solar_surplus))
                 if min_value > solar_surplus: # we can ditch solar without going negative
                     self._set_loadplan_action( output_frame, point_a, 'idle' )
                     self._set_action_reason( output_frame, point_a, 
@@ -401,6 +434,11 @@ class Planner(Collector):
 
         for x in range( price_sorted.index.values.size ):
             point_a = price_sorted.index.values[x]
+            if TRACER.enabled:
+                TRACER.event('candidate', phase='fix_lacking', hour=int(point_a), for_hour=int(price_index_creating_violation),
+                             price_index=price_index(price_to_calculate_against, self.data.at[point_a, "Price"],
+                                                     self._battery_effectivity),
+                             lacking=float(remaining_lacking))
             # only proceed if it makes sense price wise!:
             if price_index(price_to_calculate_against, 
                            self.data.at[ point_a, "Price"], 
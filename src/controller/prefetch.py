@@ -0,0 +1,382 @@
+"""
+Pre-fetching of Planner input data ahead of the Planner runs
+
+Date:
+    19-10-2026
+
+Example:
+    >>> prefetcher = Prefetcher(settings)
+    >>> prefetcher.refresh()            # Runs in the background before prices and plans are needed
+    >>> data = prefetcher.collect()     # In-memory snapshot for the Planner at XX:58
+
+"""
+
+import threading
+import pandas as pd
+
+from typing import Any, Callable
+from datetime import datetime, timedelta
+from dataclasses import dataclass, field, replace
+
+from data import Electricity, Solar, get_solars, get_empty_solars
+from data.electricity.spot_price import SpotPrice, get_spot_prices
+from data.electricity.tariff import Tariff, get_tariffs
+from data.electricity.provider import Provider, get_providers
+from controller.collector import convert_data_to_dataframe, get_expected_consumption
+from controller.forecasting import load_solar_corrector, extend_with_forecast
+
+
+SOURCES = ['spot_prices', 'tariffs', 'solar', 'consumption']
+PROVIDER_COMPANY = "Vindstød"
+PRICE_PUBLISH_HOUR = 13                         # Day-ahead spot prices publish around 13:00
+PREFETCH_LEAD_TIME = timedelta(minutes=10)      # Prefetch runs at XX:50, ahead of the Planner at XX:58
+PREFETCH_RETRY_INTERVAL = timedelta(minutes=5)  # Retry interval while a source is not ready
+MAX_AGE = {
+    'spot_prices': timedelta(hours=24),
+    'tariffs': timedelta(hours=24),
+    'solar': timedelta(hours=1),
+    'consumption': timedelta(hours=24),
+}
+
+
+@dataclass(frozen=True)
+class SourceStatus:
+    """ Class for storing the fetch status of a single data source """
+    _name: str
+    _fetched_at: datetime | None = field(default=None)
+    _time_window: tuple[datetime, datetime] | None = field(default=None)
+    _error: str = field(default='')
+
+    def __repr__(self):
+        return f"SourceStatus(name={self._name}, fetched_at={self._fetched_at}, error={self._error})"
+
+    @property
+    def name(self) -> str:
+        """ Get name of source """
+        return self._name
+
+    @property
+    def fetched_at(self) -> datetime | None:
+        """ Get time of the last successful fetch of source """
+        return self._fetched_at
+
+    @property
+    def time_window(self) -> tuple[datetime, datetime] | None:
+        """ Get start-time and end-time of the fetched data """
+        return self._time_window
+
+    @property
+    def error(self) -> str:
+        """ Get error of the last failed fetch of source (empty if it succeeded) """
+        return self._error
+
+    def is_stale(self, current_time: datetime, time_window: tuple[datetime, datetime] | None) -> bool:
+        """ Check if source must be fetched again
+
+        Args:
+            current_time: Current day and time
+            time_window: Start-time and end-time of the known electricity spot prices
+
+        Returns:
+            True/False if source is stale or not
+
+        """
+        if self._fetched_at is None or self._time_window is None or self._error:
+            return True
+
+        if current_time - self._fetched_at > MAX_AGE[self._name]:
+            return True
+
+        if self._name == 'spot_prices':
+            published = current_time.replace(hour=PRICE_PUBLISH_HOUR, minute=0, second=0, microsecond=0)
+            # Tomorrow's prices are due, but the fetched prices end today
+            missing_tomorrow = current_time >= published and self._time_window[1].date() <= current_time.date()
+            return missing_tomorrow or self._time_window[1] <= current_time
+
+        # Every other source must cover the same hours as the spot prices
+        return self._time_window != time_window
+
+    def is_ready(self, current_time: datetime, time_window: tuple[datetime, datetime] | None) -> bool:
+        """ Check if source is fetched and can be used by the Planner
+
+        Args:
+            current_time: Current day and time
+            time_window: Start-time and end-time of the known electricity spot prices
+
+        Returns:
+            True/False if source is ready or not
+
+        """
+        return not self.is_stale(current_time, time_window)
+
+
+class Prefetcher:
+    """ Class for fetching and validating Planner input data ahead of time """
+    def __init__(self, settings: dict[str, Any], getters: dict[str, Callable[..., Any]] | None = None):
+        self._settings = settings
+        self._getters = getters if getters is not None else GETTERS    # Fetch every source from the Internet
+        self._lock = threading.Lock()           # Guards the fetched data and statuses
+        self._refresh_lock = threading.Lock()   # Only a single refresh fetches at a time
+        self._status = {source: SourceStatus(source) for source in SOURCES}
+        self._planning_window: tuple[datetime, datetime] | None = None
+        self._spot_prices: list[SpotPrice] = []
+        self._tariffs: list[Tariff] = []
+        self._providers: list[Provider] = []
+        self._solar: list[Solar] = []
+        self._expected_consumption = pd.DataFrame()
+
+    def __repr__(self):
+        return f"Prefetcher(sources={list(self._status.values())})"
+
+    @property
+    def status(self) -> dict[str, SourceStatus]:
+        """ Get the fetch status of every source """
+        with self._lock:
+            return dict(self._status)
+
+    @property
+    def time_window(self) -> tuple[datetime, datetime] | None:
+        """ Get start-time and end-time of the fetched spot prices, including forecasted spot prices """
+        with self._lock:
+            return self._current_window()
+
+    def is_ready(self, current_time: datetime | None = None) -> bool:
+        """ Check if every source is fetched and can be used by the Planner
+
+        Args:
+            current_time: Current day and time (now if None)
+
+        Returns:
+            True/False if all sources are ready or not
+
+        """
+        current_time = current_time if current_time is not None else datetime.now()
+
+        with self._lock:
+            return self._sources_ready(current_time)
+
+    def update_settings(self, settings: dict[str, Any]) -> None:
+        """ Update settings and mark every source stale, since they depend on the settings
+
+        Args:
+            settings: User settings from Application
+
+        """
+        with self._lock:
+            self._settings = settings
+            self._status = {source: SourceStatus(source) for source in SOURCES}
+            self._planning_window = None
+
+    def refresh(self, current_time: datetime | None = None) -> dict[str, SourceStatus]:
+        """ Fetch every stale source again.
+        Sources that depend on the spot prices are skipped while the spot prices are unavailable.
+
+        Args:
+            current_time: Current day and time (now if None)
+
+        Returns:
+            The fetch status of every source
+
+        """
+        with self._refresh_lock:
+            current_time = current_time if current_time is not None else datetime.now()
+
+            for source in SOURCES:
+                status = self.status[source]
+                time_window = self.time_window
+
+                if not status.is_stale(current_time, time_window):
+                    continue
+
+                if source != 'spot_prices' and time_window is None:
+                    self._set_status(replace(status, _error="Waiting for spot prices"))
+                    continue
+
+                try:
+                    fetched_window = self._fetch(source, time_window)
+                except Exception as exc:    # pylint: disable=broad-exception-caught
+                    self._set_status(replace(status, _error=f"{type(exc).__name__}: {exc}"))
+                    continue
+
+                self._set_status(SourceStatus(source, current_time, fetched_window))
+
+        return self.status
+
+    def collect(self, current_time: datetime | None = None) -> pd.DataFrame | None:
+        """ Get a snapshot of the prefetched data for the Planner
+
+        Args:
+            current_time: Current day and time (now if None)
+
+        Returns:
+            Planner input data for the hours after current_time, or None if a source is not ready
+
+        """
+        current_time = current_time if current_time is not None else datetime.now()
+
+        # Checked and copied under a single lock, so a concurrent refresh cannot replace a source in between
+        with self._lock:
+            if not self._sources_ready(current_time):
+                return None
+            electricity = [Electricity(spot_price, tariff, provider)
+                           for spot_price, tariff, provider in zip(self._spot_prices, self._tariffs, self._providers)]
+            solar = self._solar
+            expected_consumption = self._expected_consumption
+
+        return build_data(electricity, solar, expected_consumption, current_time)
+
+    def _current_window(self) -> tuple[datetime, datetime] | None:
+        """ Get the time window of the fetched spot prices (the lock must be held) """
+        if self._planning_window is not None:
+            return self._planning_window
+        return self._status['spot_prices'].time_window
+
+    def _sources_ready(self, current_time: datetime) -> bool:
+        """ Check if every source is ready (the lock must be held) """
+        time_window = self._current_window()
+        return all(source.is_ready(current_time, time_window) for source in self._status.values())
+
+    def _fetch(self, source: str, time_window: tuple[datetime, datetime] | None) -> tuple[datetime, datetime]:
+        """ Fetch and validate a single source
+
+        Args:
+            source: Name of source
+            time_window: Start-time and end-time of the known electricity spot prices
+
+        Returns:
+            Start-time and end-time of the fetched data
+
+        """
+        fetched = self._getters[source](self._settings, time_window)
+
+        if source == 'spot_prices':
+            published, spot_prices = fetched
+            if not published:
+                raise ValueError("No spot prices found")
+            with self._lock:
+                self._spot_prices = spot_prices
+                self._planning_window = (spot_prices[0].time, spot_prices[-1].time)
+            # Staleness is decided by the published spot prices, so tomorrow's prices still replace forecasts
+            return (published[0].time, published[-1].time)
+
+        assert time_window is not None
+
+        if source == 'tariffs':
+            tariffs, providers = fetched
+            with self._lock:
+                self._tariffs, self._providers = tariffs, providers
+            return _validate(source, [tariff.time for tariff in tariffs], time_window)
+
+        if source == 'solar':
+            with self._lock:
+                self._solar = fetched
+            return _validate(source, [sol.time for sol in fetched], time_window)
+
+        with self._lock:
+            self._expected_consumption = fetched
+        return _validate(source, list(fetched['Time']), time_window)
+
+    def _set_status(self, status: SourceStatus) -> None:
+        """ Store the fetch status of a source """
+        with self._lock:
+            self._status[status.name] = status
+
+
+def build_data(electricity: list[Electricity],
+               solar: list[Solar],
+               expected_consumption: pd.DataFrame,
+               current_time: datetime) -> pd.DataFrame:
+    """ Build Planner input data from prefetched sources for the hours after current_time
+
+    Args:
+        electricity: Electricity prices
+        solar: Solar power estimates
+        expected_consumption: Expected electricity consumption
+        current_time: Current day and time
+
+    Returns:
+        Data with Time, Price, SpotPrice, Power and ExpectedConsumption columns
+
+    """
+    data = convert_data_to_dataframe(electricity, solar, expected_consumption)
+    return data[data['Time'] > current_time].reset_index(drop=True)
+
+
+def next_prefetch_time(current_time: datetime, ready: bool) -> datetime:
+    """ Get the time of the next prefetch run
+
+    Args:
+        current_time: Current day and time
+        ready: True/False if every source was ready after the last run
+
+    Returns:
+        The earliest of the next XX:50, the spot price publication and the retry interval (if not ready)
+
+    """
+    next_hour = current_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    candidates = [next_hour - PREFETCH_LEAD_TIME if next_hour - PREFETCH_LEAD_TIME > current_time
+                  else next_hour + timedelta(hours=1) - PREFETCH_LEAD_TIME]
+
+    published = current_time.replace(hour=PRICE_PUBLISH_HOUR, minute=0, second=0, microsecond=0)
+    if published > current_time:
+        candidates.append(published)
+
+    if not ready:
+        candidates.append(current_time + PREFETCH_RETRY_INTERVAL)
+
+    return min(candidates)
+
+
+def _validate(source: str, times: list[datetime],
+              time_window: tuple[datetime, datetime]) -> tuple[datetime, datetime]:
+    """ Validate that fetched data covers every hour of the time window
+
+    Args:
+        source: Name of source
+        times: Times of the fetched data
+        time_window: Start-time and end-time of the known electricity spot prices
+
+    Returns:
+        Start-time and end-time of the fetched data
+
+    """
+    if not times or times[0] > time_window[0] or times[-1] < time_window[1]:
+        raise ValueError(f"{source} does not cover {time_window[0]} to {time_window[1]}")
+
+    return time_window
+
+
+def _get_spot_prices(settings: dict[str, Any],
+                     time_window: tuple[datetime, datetime] | None, # pylint: disable=unused-argument
+                     ) -> tuple[list[SpotPrice], list[SpotPrice]]: # pragma: no cover
+    """ Get the published spot prices, and the spot prices extended with forecasted spot prices """
+    published = get_spot_prices(settings['price_area'])
+    return published, extend_with_forecast(published) if published else published
+
+
+def _get_tariffs(settings: dict[str, Any],
+                 time_window: tuple[datetime, datetime]) -> tuple[list[Tariff], list[Provider]]: # pragma: no cover
+    """ Get the tariffs and provider charges of the time window """
+    return get_tariffs(settings['tariff_company'], time_window), get_providers(PROVIDER_COMPANY, time_window)
+
+
+def _get_solar(settings: dict[str, Any], time_window: tuple[datetime, datetime]) -> list[Solar]: # pragma: no cover
+    """ Get the corrected solar power forecasts of the time window (no solar power without a Solcast rooftop) """
+    if settings['solcast_key'] and settings['solcast_ids']:
+        return get_solars(settings['solcast_key'], settings['solcast_ids'], time_window,
+                          correct=load_solar_corrector().correct)
+    return get_empty_solars(time_window)
+
+
+def _get_consumption(settings: dict[str, Any], # pylint: disable=unused-argument
+                     time_window: tuple[datetime, datetime]) -> pd.DataFrame: # pragma: no cover
+    """ Get the expected electricity consumption of the time window """
+    return get_expected_consumption(time_window)
+
+
+GETTERS: dict[str, Callable[..., Any]] = {
+    'spot_prices': _get_spot_prices,
+    'tariffs': _get_tariffs,
+    'solar': _get_solar,
+    'consumption': _get_consumption,
+}
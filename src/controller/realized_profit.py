@@ -0,0 +1,133 @@
+"""
+Realized profit of the battery system, accounted from measurements into running totals in database
+
+Date:
+    19-10-2026
+
+Accounting:
+    Every complete hour the energy bought is the measured net rate, and the energy moved into the battery
+    is found from the change in SoC. Without the battery, the energy moved into it would not have been
+    bought (and the energy taken from it would have been bought), so the profit of the hour is the
+    value of the energy taken from the battery at the price of the applied action.
+
+Example:
+    >>> track_profit(Database(), datetime(2023, 10, 3, 14), capacity=20)
+    3
+    >>> load_profit_totals(Database(), datetime(2023, 10, 3, 14, 5))
+    {'today': 4.12, 'month': 11.87, 'total': 311.54}
+
+"""
+
+import pandas as pd
+
+from typing import Any
+from datetime import datetime, timedelta
+
+from database import Database
+from database.database import TIME_FORMAT
+
+
+PERIODS = ('hour', 'day', 'month', 'total')
+MAX_BACKLOG = timedelta(days=7)     # Raw measurements are only kept for a week, so older hours are not accounted
+
+
+def hourly_profit(measurements: list[dict[str, Any]], capacity: float) -> pd.DataFrame:
+    """ Calculate the realized profit of every hour of measurements
+
+    Args:
+        measurements: Measurements with Time, Soc, NetRate, Action and Price, ordered by time
+        capacity: Max capacity of battery (kWh)
+
+    Returns:
+        DataFrame with Time and Consumption, BatteryDelta, Cost, BaselineCost and Profit of every hour.
+        Hours without a price (no action applied yet) are left out.
+
+    """
+    columns = ['Time', 'Consumption', 'BatteryDelta', 'Cost', 'BaselineCost', 'Profit']
+    if not measurements:
+        return pd.DataFrame(columns=columns)
+
+    frame = pd.DataFrame(measurements)
+    # Bucketed by hour like the hourly rollup, by cutting "YYYY-MM-DD, HH:MM:SS" down to "YYYY-MM-DD, HH:"
+    hours = frame.groupby(frame['Time'].str.slice(0, 15) + '00:00', sort=True)
+    soc = hours['Soc'].agg(['first', 'last'])
+    consumption = hours['NetRate'].mean()
+    price = hours['Price'].mean()
+
+    battery_delta = (soc['last'] - soc['first']) * capacity / 100
+    cost = consumption * price
+    baseline_cost = (consumption - battery_delta) * price
+
+    profit = pd.DataFrame({'Time': consumption.index,
+                           'Consumption': consumption.to_numpy(),
+                           'BatteryDelta': battery_delta.to_numpy(),
+                           'Cost': cost.to_numpy(),
+                           'BaselineCost': baseline_cost.to_numpy(),
+                           'Profit': (baseline_cost - cost).to_numpy()})
+
+    return profit[price.notna().to_numpy()].reset_index(drop=True)[columns]
+
+
+def period_starts(time: str) -> list[str]:
+    """ Get the start of every period an hour is part of
+
+    Args:
+        time: Start of the hour (formatted with TIME_FORMAT)
+
+    Returns:
+        Start of the hour, its day, its month and of all time ('')
+
+    """
+    return [time, time[:12] + '00:00:00', time[:8] + '01, 00:00:00', '']
+
+
+def track_profit(db: Database, current_time: datetime, capacity: float) -> int:
+    """ Add the complete hours measured since the last accounted hour to the running profit totals.
+    Every hour is only accounted once, so the totals are never recomputed from history.
+
+    Args:
+        db: Database with measurements and running profit totals
+        current_time: Current day and time
+        capacity: Max capacity of battery (kWh)
+
+    Returns:
+        Number of hours accounted
+
+    """
+    current_hour = current_time.replace(minute=0, second=0, microsecond=0)
+    start_time = current_hour - MAX_BACKLOG
+    last_hour = db.load_last_profit_hour()
+
+    if last_hour is not None:
+        start_time = max(start_time, datetime.strptime(last_hour, TIME_FORMAT) + timedelta(hours=1))
+
+    # Only complete hours are accounted, the current hour is accounted once it has passed
+    profit = hourly_profit(db.load_measurements(datetime.strftime(start_time, TIME_FORMAT),
+                                                datetime.strftime(current_hour, TIME_FORMAT)), capacity)
+    rows = [(period, start, hour.Consumption, hour.BatteryDelta, hour.Cost, hour.BaselineCost, hour.Profit, 1)
+            for hour in profit.itertuples(index=False)
+            for period, start in zip(PERIODS, period_starts(hour.Time))]
+
+    db.add_profit(rows)
+    return len(profit)
+
+
+def load_profit_totals(db: Database, current_time: datetime) -> dict[str, float]:
+    """ Load the realized profit of today, this month and of all time
+
+    Args:
+        db: Database with running profit totals
+        current_time: Current day and time
+
+    Returns:
+        Dict with the today, month and total profit (kr)
+
+    """
+    _, day, month, total = period_starts(datetime.strftime(current_time, TIME_FORMAT))
+    totals = {}
+
+    for name, period, start in (('today', 'day', day), ('month', 'month', month), ('total', 'total', total)):
+        rows = db.load_profit(period, start, start + '~')   # '~' sorts after every time, so only start matches
+        totals[name] = round(float(rows[0]['Profit']), 2) if rows else 0.0
+
+    return totals
@@ -0,0 +1,160 @@
+"""
+Parameter sweep of battery settings and solar strategy against archived data
+
+Date:
+    19-10-2026
+
+Example:
+    >>> data = load_archive(["2023-10-01.csv", "2023-10-02.csv"])
+    >>> sweep = Sweep(data, {'capacity': [10, 15, 20], 'max_rate': [2, 3]})
+    >>> results = sweep.run()
+
+"""
+
+import os
+import itertools
+import numpy as np
+import pandas as pd
+
+from os import path
+from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+
+from controller.planner import Planner
+from controller.accounting import hourly_costs
+
+
+SWEEP_SETTINGS = ['capacity', 'effectivity', 'threshold', 'max_rate', 'solar_strategy']
+RESULT_COLUMNS = [*SWEEP_SETTINGS, 'NormalBuy', 'SmartBuy', 'Savings']
+DEFAULT_SETTINGS = {
+    'capacity': 20,
+    'effectivity': 0.9,
+    'threshold': 0.0,
+    'max_rate': 3,
+    'solar_strategy': 'Sell All',
+}
+
+# Archived data shared by every configuration in a worker process.
+# Set once per worker by `_init_worker`, so the DataFrames are not pickled for every task.
+_shared_data: list[pd.DataFrame] = []
+_archive_cache: dict[str, tuple[float, pd.DataFrame]] = {}
+
+
+class Sweep:
+    """ Class for running the Planner over a grid of settings """
+    def __init__(self, data: list[pd.DataFrame], grid: dict[str, list[Any]]):
+        unknown_settings = [setting for setting in grid if setting not in SWEEP_SETTINGS]
+
+        if unknown_settings:
+            raise ValueError(f"Cannot sweep over settings: {unknown_settings}")
+
+        self._data = data
+        self._grid = {setting: grid.get(setting, [DEFAULT_SETTINGS[setting]]) for setting in SWEEP_SETTINGS}
+        self._configurations = [dict(zip(SWEEP_SETTINGS, values))
+                                for values in itertools.product(*self._grid.values())]
+
+    def __repr__(self):
+        return f"Sweep(days={len(self._data)}, configurations={len(self._configurations)})"
+
+    @property
+    def configurations(self) -> list[dict[str, Any]]:
+        """ Get every combination of settings in the grid """
+        return self._configurations
+
+    def run(self, max_workers: int | None = None, chunksize: int | None = None) -> pd.DataFrame:
+        """ Run the Planner for every configuration in a process pool
+
+        Args:
+            max_workers: Number of worker processes (all cores if None)
+            chunksize: Configurations sent to a worker at a time (computed if None)
+
+        Returns:
+            Results table with NormalBuy, SmartBuy and Savings for every configuration,
+            sorted by highest savings (failed configurations last)
+
+        """
+        if chunksize is None:
+            # A few chunks per worker keeps all cores busy without paying IPC for every task
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(self._configurations) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self._data,)) as executor:
+            rows = list(executor.map(_run_configuration, self._configurations, chunksize=chunksize))
+
+        results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+        return results.sort_values('Savings', ascending=False, ignore_index=True)
+
+
+def load_archive(csv_files: list[str]) -> list[pd.DataFrame]:
+    """ Load archived Collector data from CSV files.
+    Files are only parsed again if they have changed on disk.
+
+    Args:
+        csv_files: File paths for CSV files with Time, Price, SpotPrice, Power and ExpectedConsumption
+
+    Returns:
+        A list of DataFrames, one for every CSV file
+
+    """
+    archive = []
+
+    for csv_file in csv_files:
+        modified = path.getmtime(csv_file)
+        cached = _archive_cache.get(csv_file)
+
+        if cached is None or cached[0] != modified:
+            cached = (modified, pd.read_csv(csv_file, parse_dates=['Time']))
+            _archive_cache[csv_file] = cached
+        archive.append(cached[1])
+
+    return archive
+
+
+def calculate_savings(data: pd.DataFrame, plan: pd.DataFrame, max_rate: float) -> tuple[float, float]:
+    """ Calculate NormalBuy and SmartBuy electricity costs for a plan
+
+    Args:
+        data: Input DataFrame to Planner
+        plan: Output DataFrame from Planner
+        max_rate: Max charge rate of battery
+
+    Returns:
+        NormalBuy and SmartBuy costs
+
+    """
+    costs = hourly_costs(data, plan, max_rate)
+
+    return float(costs['NormalBuy'].sum()), float(costs['SmartBuy'].sum())
+
+
+def _init_worker(data: list[pd.DataFrame]) -> None:
+    """ Store the archived data in the worker process """
+    _shared_data[:] = data
+
+
+def _run_configuration(configuration: dict[str, Any]) -> list[Any]:
+    """ Run the Planner with a single configuration over all archived data
+
+    Args:
+        configuration: Settings for the Planner
+
+    Returns:
+        Row for the results table (costs are NaN if the Planner failed on the configuration)
+
+    """
+    normal_buy = 0.0
+    smart_buy = 0.0
+
+    for data in _shared_data:
+        try:
+            planner = Planner(configuration, data=data)
+        except Exception:   # pylint: disable=broad-exception-caught
+            # A single failing configuration should not stop a sweep of thousands
+            return [*configuration.values(), np.nan, np.nan, np.nan]
+
+        costs = calculate_savings(planner.data, planner.plan, configuration['max_rate'])
+        normal_buy += costs[0]
+        smart_buy += costs[1]
+
+    return [*configuration.values(), round(normal_buy, 2), round(smart_buy, 2), round(normal_buy - smart_buy, 2)]
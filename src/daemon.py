@@ -0,0 +1,17 @@
+"""
+Run HomeBatteryController headless (without Tk), e.g. on installations without a screen
+
+Date:
+    19-10-2026
+
+Example:
+    >>> python daemon.py
+    >>> curl http://127.0.0.1:8765/status
+
+"""
+
+import asyncio
+from service import run_daemon
+
+if __name__ == "__main__":
+    asyncio.run(run_daemon())
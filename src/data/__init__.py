@@ -1,4 +1,20 @@
 # pylint: skip-file
-from .electricity import Electricity, get_electricity
-from .solar import Solar, get_solars, get_empty_solars
-from .battery import Battery, get_battery
\ No newline at end of file
+from typing import TYPE_CHECKING
+from data.helperfunctions.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from .electricity import Electricity, get_electricity
+    from .solar import Solar, get_solars, get_empty_solars
+    from .battery import Battery, get_battery
+
+_EXPORTS = {
+    'Electricity': '.electricity',
+    'get_electricity': '.electricity',
+    'Solar': '.solar',
+    'get_solars': '.solar',
+    'get_empty_solars': '.solar',
+    'Battery': '.battery',
+    'get_battery': '.battery',
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_import(__name__, _EXPORTS)
\ No newline at end of file
@@ -1,3 +1,15 @@
 # pylint: skip-file
-from .electricity import Electricity, get_electricity
-from .tariff_company import TARIFF_COMPANY
\ No newline at end of file
+from typing import TYPE_CHECKING
+from data.helperfunctions.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from .electricity import Electricity, get_electricity
+    from .tariff_company import TARIFF_COMPANY
+
+_EXPORTS = {
+    'Electricity': '.electricity',
+    'get_electricity': '.electricity',
+    'TARIFF_COMPANY': '.tariff_company',
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_import(__name__, _EXPORTS)
\ No newline at end of file
@@ -6,11 +6,11 @@ Date:
 
 """
 
-import sys
 from datetime import datetime
+from typing import Callable
 from dataclasses import dataclass, field
-from traceback import print_exc
 
+from data.helperfunctions import FetchError
 from data.electricity.spot_price import SpotPrice, get_spot_prices
 from data.electricity.tariff import Tariff, get_tariffs
 from data.electricity.provider import Provider, get_providers
@@ -73,27 +73,32 @@ class Electricity:
 def get_electricity(price_area: str = "DK1", 
                     tariff_company: str = "Ikast El Net A/S",
                     provider_company: str = "Vindstød",
-                    full_scope: bool = False) -> list[Electricity]: # pragma: no cover
+                    full_scope: bool = False,
+                    extend: Callable[[list[SpotPrice]], list[SpotPrice]] | None = None
+                    ) -> list[Electricity]: # pragma: no cover
     """ Get a list of abstract Electricity objects combined of SpotPrices and Tariffs
 
     Args:
         price_area: DK1 (West of Great Belt) and DK2 (East of Great Belt)
         company: The local electricity tariff company
+        extend: Function extending the published spot prices (e.g. with forecasted spot prices)
 
     Returns:
         List of Electricity objects for tomorrow's electricity prices
 
+    Raises:
+        FetchError: If the spot prices or tariffs could not be fetched and none were fetched before
+
     """
-    try:
-        spot_prices = get_spot_prices(price_area, full_scope)
-        time_window = (spot_prices[0].time, spot_prices[-1].time)
-        tariffs = get_tariffs(tariff_company, time_window)
-        providers = get_providers(provider_company, time_window)
-
-    except Exception:   # pylint: disable=broad-exception-caught
-        # TODO: Better error handling.
-        print_exc()
-        sys.exit(1)
+    spot_prices = get_spot_prices(price_area, full_scope)
+    if extend is not None:
+        spot_prices = extend(spot_prices)
+    if not spot_prices:
+        raise FetchError("No spot prices after the current hour")
+
+    time_window = (spot_prices[0].time, spot_prices[-1].time)
+    tariffs = get_tariffs(tariff_company, time_window)
+    providers = get_providers(provider_company, time_window)
 
     electricity = [Electricity(spot_price, tariff, provider) 
                    for spot_price, tariff, provider in zip(spot_prices, tariffs, providers)]
@@ -9,11 +9,11 @@ Dataset:
 
 """
 
-import sys
 from datetime import datetime, date
 from dataclasses import dataclass, field
 
-from data.helperfunctions import get_data, Parser, URLBuilder
+from data.helperfunctions import fetch_data, Parser, URLBuilder
+from profiling import timed
 
 
 URL = {
@@ -34,6 +34,7 @@ class SpotPrice:
     _time: datetime = field(compare=False)
     _price_area: str = field(compare=False)
     _price: float
+    _forecast: bool = field(default=False, compare=False)
 
     def __repr__(self):
         return f"SpotPrice(time={self._time}, price_area={self._price_area}, price={self._price})"
@@ -53,7 +54,13 @@ class SpotPrice:
         """ Get price for SpotPrice (DKK/kWh) """
         return self._price
 
+    @property
+    def forecast(self) -> bool:
+        """ Get whether SpotPrice is forecasted instead of published """
+        return self._forecast
+
 
+@timed('energidataservice.spot_prices')
 def get_spot_prices(price_area: str, full_scope: bool = False) -> list[SpotPrice]: # pragma: no cover
     """ Get electricity spot prices from EnergiDataService Elspotprices dataset  
     
@@ -62,18 +69,16 @@ def get_spot_prices(price_area: str, full_scope: bool = False) -> list[SpotPrice
 
     Returns:
         List of SpotPrices for the specified price_area
+        (from the last fetched prices while EnergiDataService is down)
+
+    Raises:
+        FetchError: If the spot prices could not be fetched and none were fetched before
     
     """
     filter1 = f'"PriceArea":["{price_area}"]'
     filtering = '{' + filter1 + '}'
     url = URLBuilder.set_values(URL, values=[f"{date.today()}", filtering])
-    spot_price_data = get_data(URLBuilder(url).url)
-
-    if spot_price_data.status_code != 200:
-        # TODO: Better error handling.
-        print(f"Error! Status Code: {spot_price_data.status_code}")
-        sys.exit(1)
-
+    spot_price_data = fetch_data(f"spot_prices_{price_area}", URLBuilder(url).url)
     dataset_records = spot_price_data.json['records']
 
     if full_scope:
@@ -89,4 +94,31 @@ def get_spot_prices(price_area: str, full_scope: bool = False) -> list[SpotPrice
                                 for data in dataset_records if Parser.parse_time(data['HourDK']) > current_time]
 
     return spot_prices
-    
\ No newline at end of file
+
+
+@timed('energidataservice.spot_price_history')
+def get_spot_price_history(price_area: str, start: date) -> list[SpotPrice]: # pragma: no cover
+    """ Get published electricity spot prices from a day in the past until now
+
+    Args:
+        price_area: DK1 (West of Great Belt) or DK2 (East of Great Belt)
+        start: First day of spot prices
+
+    Returns:
+        List of SpotPrices for the specified price_area
+        (from the last fetched prices while EnergiDataService is down)
+
+    Raises:
+        FetchError: If the spot prices could not be fetched and none were fetched before
+
+    """
+    filtering = '{' + f'"PriceArea":["{price_area}"]' + '}'
+    # Replace offset=0 with limit=0, since the dataset only returns 100 records by default
+    url = URLBuilder.set_params(URL, params=[('offset', 'limit')])
+    url = URLBuilder.set_values(url, values=[f"{start}", filtering])
+    spot_price_data = fetch_data(f"spot_price_history_{price_area}", URLBuilder(url).url)
+
+    return [SpotPrice(Parser.parse_time(data['HourDK']),
+                      data['PriceArea'],
+                      Parser.parse_spot_price(data['SpotPriceDKK']))
+                      for data in spot_price_data.json['records']]
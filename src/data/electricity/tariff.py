@@ -9,13 +9,13 @@ Dataset:
 
 """
 
-import sys
 from datetime import datetime
 from dataclasses import dataclass, field
 from typing import Any
 
-from data.helperfunctions import get_data, Parser, URLBuilder
+from data.helperfunctions import fetch_data, Parser, URLBuilder
 from data.electricity.tariff_company import TARIFF_COMPANY
+from profiling import timed
 
 
 TARIFF_AMOUNT = 24
@@ -57,6 +57,7 @@ class Tariff:
         return self._price
     
 
+@timed('energidataservice.tariffs')
 def get_tariffs(company: str, time_window: tuple[datetime, datetime]) -> list[Tariff]: # pragma: no cover
     """ Get tariffs for the specified Tariff Company from EnergiDataService DataHub dataset
 
@@ -65,7 +66,10 @@ def get_tariffs(company: str, time_window: tuple[datetime, datetime]) -> list[Ta
         time_window: Start-time and end-time of the known electricity spot prices
 
     Returns:
-        A list of Tariff objects
+        A list of Tariff objects (from the last fetched tariffs while EnergiDataService is down)
+
+    Raises:
+        FetchError: If the tariffs could not be fetched and none were fetched before
         
     """
     gln = TARIFF_COMPANY[company]["gln"]
@@ -78,13 +82,7 @@ def get_tariffs(company: str, time_window: tuple[datetime, datetime]) -> list[Ta
     filtering = '{' + filter1 + ',' + filter2 + '}'
     url = URLBuilder.set_values(URL, values=[f"{time_window[1].date()}", filtering])
 
-    tariff_data = get_data(URLBuilder(url).url)
-
-    if tariff_data.status_code != 200:
-        # TODO: Better error handling.
-        print(f"Error! Status Code: {tariff_data.status_code}")
-        sys.exit(1)
-
+    tariff_data = fetch_data(f"tariffs_{gln}", URLBuilder(url).url)
     dataset_records = tariff_data.json['records']
     active_records = _get_active_records(dataset_records, time_window)
     hour_diff = int(divmod(abs((time_window[1] - time_window[0]).total_seconds()), 3600)[0]) + 1
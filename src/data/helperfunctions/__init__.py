@@ -1,5 +1,28 @@
 # pylint: skip-file
-from .data import Data, get_data
-from .parser import Parser
-from .url_builder import URLBuilder
-from .week_days import WeekDays
+from typing import TYPE_CHECKING
+from .lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from .atomic_write import write_atomic
+    from .data import Data, get_data
+    from .fetch import Fetched, FetchError, Fetcher, CircuitBreaker, FETCHER, fetch_data
+    from .parser import Parser
+    from .url_builder import URLBuilder
+    from .week_days import WeekDays
+
+_EXPORTS = {
+    'write_atomic': '.atomic_write',
+    'Data': '.data',
+    'get_data': '.data',
+    'Fetched': '.fetch',
+    'FetchError': '.fetch',
+    'Fetcher': '.fetch',
+    'CircuitBreaker': '.fetch',
+    'FETCHER': '.fetch',
+    'fetch_data': '.fetch',
+    'Parser': '.parser',
+    'URLBuilder': '.url_builder',
+    'WeekDays': '.week_days',
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_import(__name__, _EXPORTS)
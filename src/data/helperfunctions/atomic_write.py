@@ -0,0 +1,47 @@
+"""
+Module for replacing a file at once, so readers never see a half written file
+
+Date:
+    19-10-2026
+
+Example:
+    >>> write_atomic("metrics.json", lambda file: json.dump(snapshot, file))
+    True
+
+"""
+
+import os
+import tempfile
+
+from typing import IO, Any, Callable
+
+
+def write_atomic(path: str, write: Callable[[IO[Any]], Any], binary: bool = False) -> bool:
+    """ Write a file into a temporary file next to it and replace the file with it
+
+    Args:
+        path: Path of file (missing folders are created)
+        write: Function writing the content to an open file
+        binary: Open the temporary file in binary mode instead of text mode
+
+    Returns:
+        True if the file was replaced, False if it could not be written (the old file is kept)
+
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    temp_path = ''
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb' if binary else 'w', dir=folder, suffix='.tmp', delete=False,
+                                         encoding=None if binary else 'utf-8') as file:
+            temp_path = file.name
+            write(file)
+        os.replace(temp_path, path)
+    except OSError as exc:
+        print(f"Could not write {path}: {exc}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+    return True
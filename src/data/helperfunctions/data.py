@@ -12,6 +12,8 @@ from requests import Response
 from dataclasses import dataclass
 from typing import Any
 
+from profiling import timed, count
+
 
 @dataclass(frozen=True)
 class Data:
@@ -37,6 +39,7 @@ class Data:
         return self._response.json()
 
 
+@timed('http.get_data')
 def get_data(url: str) -> Data:
     """
     Request data at specified URL and return Data object
@@ -48,7 +51,9 @@ def get_data(url: str) -> Data:
         A Data object for storing the URL content
 
     """
-    return Data(requests.get(url, timeout=5))
+    response = requests.get(url, timeout=5)
+    count(f'http.status_{response.status_code}')
+    return Data(response)
 
 
 
@@ -0,0 +1,276 @@
+"""
+Module for fetching JSON data from the Internet with bounded retries, jittered backoff and a circuit breaker
+per source. The last fetched data of every source is cached, and served marked as stale when a source is down.
+
+Date:
+    19-10-2026
+
+Example:
+    >>> fetched = fetch_data('spot_prices', url)
+    >>> fetched.stale, fetched.fetched_at
+    (True, datetime.datetime(2023, 10, 2, 13, 5, 12))
+    >>> records = fetched.json['records']
+
+"""
+
+import json
+import time
+import random
+import threading
+
+from os import path
+from typing import Any, Callable
+from datetime import datetime
+from dataclasses import dataclass
+
+from profiling import count
+from .data import Data, get_data
+from .atomic_write import write_atomic
+
+
+CACHE_FOLDER = path.join(path.dirname(path.dirname(path.dirname(__file__))), 'database', 'fetch_cache')
+RETRIES = 3                 # Attempts of a single fetch ...
+BACKOFF = 0.5               # ... waiting a random time up to 0.5, 1, 2, ... seconds between attempts ...
+MAX_BACKOFF = 8.0           # ... but never more than 8 seconds
+RETRY_STATUS = (429, 500, 502, 503, 504)
+FAILURE_THRESHOLD = 3       # Failed fetches in a row opening the circuit of a source ...
+COOLDOWN = 300.0            # ... which is served from the cache for 5 minutes before it is tried again
+
+
+class FetchError(Exception):
+    """ Exception for a failed fetch of a source without cached data """
+
+
+@dataclass(frozen=True)
+class Fetched:
+    """ Class for storing fetched JSON data """
+    _json: Any
+    _fetched_at: datetime
+    _stale: bool = False
+
+    def __repr__(self):
+        return f"Fetched(fetched_at={self._fetched_at}, stale={self._stale})"
+
+    @property
+    def json(self) -> Any:
+        """ Get the JSON data """
+        return self._json
+
+    @property
+    def fetched_at(self) -> datetime:
+        """ Get time the data was fetched """
+        return self._fetched_at
+
+    @property
+    def stale(self) -> bool:
+        """ Get whether the data is served from the cache, since the source could not be fetched """
+        return self._stale
+
+
+class CircuitBreaker:
+    """ Class for stopping requests to a source that keeps failing, until a cooldown has passed """
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, cooldown: float = COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic):
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._in_trial = False
+
+    def __repr__(self):
+        return f"CircuitBreaker(state={self.state}, failures={self._failures})"
+
+    @property
+    def state(self) -> str:
+        """ Get state of circuit ('closed', 'open' or 'half-open' once the cooldown has passed) """
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """ Check if the source may be requested (a half-open circuit allows a single trial at a time) """
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'open' or self._in_trial:
+                return False
+
+            self._in_trial = True
+            return True
+
+    def record_success(self) -> None:
+        """ Close the circuit after a successful fetch """
+        with self._lock:
+            self._failures, self._opened_at, self._in_trial = 0, None, False
+
+    def record_failure(self) -> None:
+        """ Count a failed fetch, and open the circuit if too many failed in a row (or the trial failed) """
+        with self._lock:
+            self._failures += 1
+            self._in_trial = False
+
+            if self._failures >= self._threshold or self._opened_at is not None:
+                self._opened_at = self._clock()
+
+    def _state(self) -> str:
+        """ Get state of circuit (the lock must be held) """
+        if self._opened_at is None:
+            return 'closed'
+        return 'half-open' if self._clock() - self._opened_at >= self._cooldown else 'open'
+
+
+class Fetcher:
+    """ Class for fetching sources with retries and falling back to the cached data of a source """
+    def __init__(self, cache_folder: str = CACHE_FOLDER, get: Callable[[str], Data] = get_data,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self._cache_folder = cache_folder
+        self._get = get
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._cache: dict[str, Fetched] = {}
+        self._stale: dict[str, datetime] = {}
+
+    def __repr__(self):
+        return f"Fetcher(sources={list(self._breakers)}, stale={list(self._stale)})"
+
+    @property
+    def stale(self) -> dict[str, datetime]:
+        """ Get the sources last served from the cache, with the time their data was fetched """
+        with self._lock:
+            return dict(self._stale)
+
+    def breaker(self, source: str) -> CircuitBreaker:
+        """ Get the circuit breaker of a source
+
+        Args:
+            source: Name of source
+
+        Returns:
+            The circuit breaker of the source
+
+        """
+        with self._lock:
+            return self._breakers.setdefault(source, CircuitBreaker(clock=self._clock))
+
+    def fetch(self, source: str, url: str) -> Fetched:
+        """ Fetch JSON data of a source, retrying failed requests and falling back to the cached data
+
+        Args:
+            source: Name of source, used for its circuit breaker and cache (e.g. 'spot_prices')
+            url: URL of data
+
+        Returns:
+            The fetched data, or the cached data marked as stale if the source could not be fetched
+
+        Raises:
+            FetchError: If the source could not be fetched and there is no cached data
+
+        """
+        breaker = self.breaker(source)
+        error = "Circuit is open"
+
+        if breaker.allow():
+            try:
+                fetched = Fetched(self._request(url), datetime.now())
+            except FetchError as exc:
+                breaker.record_failure()
+                error = str(exc)
+            else:
+                breaker.record_success()
+                self._store(source, fetched)
+                return fetched
+
+        count(f'fetch.{source}.stale')
+        cached = self._load(source)
+        if cached is None:
+            raise FetchError(f"{source}: {error} and nothing is cached")
+
+        with self._lock:
+            self._stale[source] = cached.fetched_at
+        return Fetched(cached.json, cached.fetched_at, True)
+
+    def _request(self, url: str) -> Any:
+        """ Request a URL until it succeeds, a request fails for good or every attempt is used
+
+        Args:
+            url: URL of data
+
+        Returns:
+            The JSON data
+
+        Raises:
+            FetchError: If every attempt failed
+
+        """
+        error = ""
+
+        for attempt in range(RETRIES):
+            if attempt:
+                # Full jitter, so clients that failed together do not retry together
+                self._sleep(random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** (attempt - 1))))
+                count('fetch.retries')
+
+            try:
+                data = self._get(url)
+                if data.status_code == 200:
+                    return data.json
+            except (OSError, ValueError) as exc:    # Connection errors, timeouts and invalid JSON
+                error = f"{type(exc).__name__}: {exc}"
+                continue
+
+            error = f"Status code {data.status_code}"
+            if data.status_code not in RETRY_STATUS:
+                break
+
+        raise FetchError(error)
+
+    def _store(self, source: str, fetched: Fetched) -> None:
+        """ Cache fetched data in memory and on disk (a failed write only loses the disk copy) """
+        with self._lock:
+            self._cache[source] = fetched
+            self._stale.pop(source, None)
+
+        cached = {'fetched_at': fetched.fetched_at.isoformat(), 'json': fetched.json}
+        write_atomic(self._cache_path(source), lambda file: json.dump(cached, file))
+
+    def _load(self, source: str) -> Fetched | None:
+        """ Load cached data from memory, or from disk after a restart """
+        with self._lock:
+            if source in self._cache:
+                return self._cache[source]
+
+        try:
+            with open(self._cache_path(source), encoding='utf-8') as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        fetched = Fetched(cached['json'], datetime.fromisoformat(cached['fetched_at']))
+        with self._lock:
+            self._cache[source] = fetched
+        return fetched
+
+    def _cache_path(self, source: str) -> str:
+        """ Get path of the cache file of a source """
+        return path.join(self._cache_folder, f"{source}.json")
+
+
+FETCHER = Fetcher()     # Shared by every fetcher, so a source has a single circuit breaker and cache
+
+
+def fetch_data(source: str, url: str) -> Fetched: # pragma: no cover
+    """ Fetch JSON data of a source with retries, falling back to the cached data of the source
+
+    Args:
+        source: Name of source (e.g. 'spot_prices')
+        url: API link to data as str
+
+    Returns:
+        The fetched data, or the cached data marked as stale if the source could not be fetched
+
+    """
+    return FETCHER.fetch(source, url)
@@ -0,0 +1,42 @@
+"""
+Lazy loading of package exports (PEP 562), so importing a package does not import all of its modules
+
+Date:
+    19-10-2026
+
+Example:
+    >>> __getattr__, __dir__ = lazy_import(__name__, {'Parser': '.parser'})
+    >>> from data.helperfunctions import Parser     # Only imports parser.py
+
+"""
+
+import sys
+
+from importlib import import_module
+from typing import Any, Callable
+
+
+def lazy_import(package: str, exports: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """ Create the module `__getattr__` and `__dir__` of a package, which import exports on first access
+
+    Args:
+        package: Name of package (`__name__` of its __init__.py)
+        exports: Module (relative to package) of every exported name
+
+    Returns:
+        The `__getattr__` and `__dir__` functions of package
+
+    """
+    def _getattr(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(import_module(exports[name], package), name)
+        # Store the export in package, so the next access does not go through `__getattr__`
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def _dir() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return _getattr, _dir
@@ -13,6 +13,7 @@ Date:
 import serial
 from typing import Any
 
+from profiling import timed, count
 from .minicon_variable import MiniConVariable
 
 
@@ -72,6 +73,7 @@ class MiniCon():
         return True  # TODO: Don't have to `verify` response?
 
 
+    @timed('minicon.send_and_receive')
     def _send_and_receive(self, command: str) -> str:
         """ Send request and receive response from MiniCon
 
@@ -92,8 +94,11 @@ class MiniCon():
                 ser.read_until(b'#')
             
             if not response:
+                count('minicon.retries')
                 continue
             return response.decode(encoding='utf-8') # type: ignore
+
+        count('minicon.no_response')
         return ""   # TODO: If an empty string was returned after 3 retries,
                     #       we could "log" an error and handle it in upper layer.
 
@@ -9,16 +9,16 @@ Dataset:
 
 """
 
-import sys
 import os
 import json
 
 from os import path
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable
 
-from data.helperfunctions import Data, get_data, Parser, URLBuilder
+from data.helperfunctions import Fetched, fetch_data, Parser, URLBuilder
+from profiling import timed
 
 
 if os.name == 'posix':  # pragma: no cover
@@ -60,16 +60,19 @@ class Solar:
         return self._power
 
 
+@timed('solcast.solars')
 def get_solars(api_key: str, 
                resource_ids: list[str], 
                time_window: tuple[datetime, datetime],
-               full_scope: bool = False) -> list[Solar]: # pragma: no cover
+               full_scope: bool = False,
+               correct: Callable[[str, list[Solar]], list[Solar]] | None = None) -> list[Solar]: # pragma: no cover
     """ Loops over rooftop resource ID's to collect and compute multiple Solcast rooftop forecasts
 
     Args:
         api_key: Solcast API access key
         resource_ids: ID's for Solcast rooftops
         time_window: Start-time and end-time of the known electricity spot prices
+        correct: Function correcting the forecasts of a single rooftop (e.g. for local bias)
 
     Returns:
         A list of `Solar` objects
@@ -77,7 +80,8 @@ def get_solars(api_key: str,
     solars = []
     
     for resource_id in resource_ids:
-        solars.append(_get_solar(api_key, resource_id, time_window, full_scope))
+        solar = _get_solar(api_key, resource_id, time_window, full_scope)
+        solars.append(correct(resource_id, solar) if correct is not None else solar)
 
     if len(solars) > 1:
         # If there is more than 1 rooftop, we need to add all the Solar objects to a total Solar object
@@ -132,7 +136,10 @@ def _get_solar(api_key: str,
         time_window: Start-time and end-time of the known electricity spot prices
 
     Returns:
-        A list of `Solar` objects
+        A list of `Solar` objects (from the last fetched forecasts while Solcast is down)
+
+    Raises:
+        FetchError: If the forecasts could not be fetched and none were fetched before
 
     """
     solar_forecasts = _forecasts_exists_and_active(resource_id)
@@ -140,13 +147,7 @@ def _get_solar(api_key: str,
     if not solar_forecasts:
         # If the saved data is outdated, get new data from Solcast
         url = URLBuilder.set_values(URL, values=[resource_id, api_key])
-        solar_data = get_data(URLBuilder(url).url)
-
-        if solar_data.status_code != 200:
-            # TODO: Better error handling.
-            print(f"(Solar Forecasts) Error! Status Code: {solar_data.status_code}")
-            sys.exit(1)
-
+        solar_data = fetch_data(f"solcast_forecasts_{resource_id}", URLBuilder(url).url)
         _save_solcast_data(resource_id, solar_data, folder="forecasts")
         solar_forecasts = solar_data.json['forecasts']
 
@@ -157,13 +158,7 @@ def _get_solar(api_key: str,
             url = URLBuilder.set_params(URL, 
                                         params=[('forecasts', 'estimated_actuals')])
             url = URLBuilder.set_values(url, values=[resource_id, api_key])
-            solar_data = get_data(URLBuilder(url).url)
-
-            if solar_data.status_code != 200:
-                # TODO: Better error handling.
-                print(f"(Solar Live) Error! Status Code: {solar_data.status_code}")
-                sys.exit(1)
-
+            solar_data = fetch_data(f"solcast_estimated_actuals_{resource_id}", URLBuilder(url).url)
             _save_solcast_data(resource_id, solar_data, folder="estimated_actuals")
             solar_live = solar_data.json['estimated_actuals']
         
@@ -329,14 +324,18 @@ def _estimated_actuals_exists_and_active(resource_id: str) -> Any: # pragma: no
     return []
 
 
-def _save_solcast_data(resource_id: str, solar_data: Data, folder: str) -> None: # pragma: no cover
+def _save_solcast_data(resource_id: str, solar_data: Fetched, folder: str) -> None: # pragma: no cover
     """ Saves the collected Solcast forecasts into a new JSON file for reuse
+    (stale forecasts are not saved, so the next run fetches today's forecasts)
 
     Args:
         resource_id: ID of Solcast rooftop
         solar_data: Solcast response content
     
     """
+    if solar_data.stale:
+        return
+
     todays_date = date.today()
 
     if os.name == 'posix':
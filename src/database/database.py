@@ -10,6 +10,7 @@ import sqlite3
 from typing import Any
 
 NAME = "database.db"
+TIME_FORMAT = "%Y-%m-%d, %H:%M:%S"     # Sorts like the times it represents, so Time can be range queried
 EXPECTED_TABLE_CONTENT = {
     'settings': [('address', 'text'),
                  ('city', 'text'),
@@ -41,13 +42,150 @@ EXPECTED_TABLE_CONTENT = {
              ('SpotPrice', 'float'),
              ('Power', 'int'),
              ('ExpectedConsumption', 'float')],
+
+    'measurements': [('Time', 'text'),
+                     ('Soc', 'float'),
+                     ('NetRate', 'float'),
+                     ('Action', 'text'),
+                     ('Price', 'float')],
+
+    'measurements_hourly': [('Time', 'text'),
+                            ('Soc', 'float'),
+                            ('MinSoc', 'float'),
+                            ('MaxSoc', 'float'),
+                            ('NetRate', 'float'),
+                            ('Action', 'text'),
+                            ('Price', 'float'),
+                            ('Samples', 'int')],
+
+    'model_state': [('Name', 'text'),
+                    ('Updated', 'text'),
+                    ('State', 'text')],
+
+    'spot_prices': [('Time', 'text'),
+                    ('PriceArea', 'text'),
+                    ('SpotPrice', 'float')],
+
+    'profit': [('Period', 'text'),
+               ('Start', 'text'),
+               ('Consumption', 'float'),
+               ('BatteryDelta', 'float'),
+               ('Cost', 'float'),
+               ('BaselineCost', 'float'),
+               ('Profit', 'float'),
+               ('Hours', 'int')],
+
+    'plan_history': [('Time', 'text'),
+                     ('Action', 'text'),
+                     ('SolarSurplus', 'float'),
+                     ('ElNetCharge', 'float'),
+                     ('BatteryDelta', 'float'),
+                     ('BatteryExpected', 'float'),
+                     ('SolarExport', 'float'),
+                     ('ActionReason', 'text'),
+                     ('Price', 'float'),
+                     ('SpotPrice', 'float'),
+                     ('Power', 'int'),
+                     ('ExpectedConsumption', 'float')],
+
+    'history': [('Period', 'text'),
+                ('Start', 'text'),
+                ('Price', 'float'),
+                ('SpotPrice', 'float'),
+                ('Soc', 'float'),
+                ('MinSoc', 'float'),
+                ('MaxSoc', 'float'),
+                ('Consumption', 'float'),
+                ('Solar', 'float'),
+                ('Savings', 'float'),
+                ('Hours', 'int')],
 }
 EXPECTED_TABLES = list(EXPECTED_TABLE_CONTENT.keys())
-
-class Database:
+DATA_COLUMNS = ['Price', 'SpotPrice', 'Power', 'ExpectedConsumption']   # Columns of data saved with the plan
+DEFAULT_SETTINGS = {            # Settings used until the user saves settings
+    'address': '',
+    'city': '',
+    'postal': '',
+    'country': '',
+    'price_area': 'DK1',
+    'solar_strategy': 'Sell All',
+    'solcast_key': '',
+    'solcast_ids': '',
+    'tariff_company': 'Radius Elnet A/S',
+    'provider': '',
+    'basis': '',
+    'prices': '',
+    'capacity': '20',
+    'effectivity': '90',
+    'threshold': '0',
+    'max_rate': '3',
+    'model': 'SmartBuy'
+}
+EXPECTED_INDEXES = {
+    'plan_time': ('plan', 'Time'),
+    'measurements_time': ('measurements', 'Time'),
+}
+EXPECTED_UNIQUE_INDEXES = {
+    'measurements_hourly_time': ('measurements_hourly', 'Time'),  # A single row for every hour
+    'model_state_name': ('model_state', 'Name'),                    # A single state for every model
+    'spot_prices_area_time': ('spot_prices', 'PriceArea, Time'),    # A single price for every area and hour
+    'profit_period_start': ('profit', 'Period, Start'),             # A single running total for every period
+    'plan_history_time': ('plan_history', 'Time'),                  # The last planned values of every hour
+    'history_period_start': ('history', 'Period, Start'),           # A single rollup for every period
+}
+# Statements are built once, so SQLite can reuse the prepared statement from its cache
+INSERT_PLAN = f"INSERT INTO plan VALUES ({','.join('?' * len(EXPECTED_TABLE_CONTENT['plan']))})"
+SAVE_PLAN_HISTORY = f"""INSERT OR REPLACE INTO plan_history
+                        VALUES ({','.join('?' * len(EXPECTED_TABLE_CONTENT['plan_history']))})"""
+INSERT_MEASUREMENTS = f"INSERT INTO measurements VALUES ({','.join('?' * len(EXPECTED_TABLE_CONTENT['measurements']))})"
+# Measurements are bucketed by hour by cutting "YYYY-MM-DD, HH:MM:SS" down to "YYYY-MM-DD, HH:"
+ROLLUP_MEASUREMENTS = """INSERT OR REPLACE INTO measurements_hourly
+                         SELECT hourly.Hour, hourly.Soc, hourly.MinSoc, hourly.MaxSoc, hourly.NetRate,
+                                measurements.Action, hourly.Price, hourly.Samples
+                         FROM (SELECT substr(Time, 1, 15) || '00:00' AS Hour, avg(Soc) AS Soc,
+                                      min(Soc) AS MinSoc, max(Soc) AS MaxSoc, avg(NetRate) AS NetRate,
+                                      avg(Price) AS Price, count(*) AS Samples, max(Time) AS LastTime
+                               FROM measurements WHERE Time >= ? AND Time < ? GROUP BY Hour) AS hourly
+                         JOIN measurements ON measurements.Time = hourly.LastTime"""
+# Every accounted hour is added to the running totals of its hour, day, month and of all time
+ADD_PROFIT = """INSERT INTO profit VALUES (?,?,?,?,?,?,?,?)
+                ON CONFLICT(Period, Start) DO UPDATE SET Consumption = Consumption + excluded.Consumption,
+                                                         BatteryDelta = BatteryDelta + excluded.BatteryDelta,
+                                                         Cost = Cost + excluded.Cost,
+                                                         BaselineCost = BaselineCost + excluded.BaselineCost,
+                                                         Profit = Profit + excluded.Profit,
+                                                         Hours = Hours + excluded.Hours"""
+# Sums are rolled up (averages are found when loaded), so every hour is only added to its day and month once
+ADD_HISTORY = """INSERT INTO history VALUES (?,?,?,?,?,?,?,?,?,?,?)
+                 ON CONFLICT(Period, Start) DO UPDATE SET Price = Price + excluded.Price,
+                                                          SpotPrice = SpotPrice + excluded.SpotPrice,
+                                                          Soc = Soc + excluded.Soc,
+                                                          MinSoc = min(MinSoc, excluded.MinSoc),
+                                                          MaxSoc = max(MaxSoc, excluded.MaxSoc),
+                                                          Consumption = Consumption + excluded.Consumption,
+                                                          Solar = Solar + excluded.Solar,
+                                                          Savings = Savings + excluded.Savings,
+                                                          Hours = Hours + excluded.Hours"""
+# Measured hours with the values planned for them and their realized profit, joined on unique indexes
+LOAD_HISTORY_HOURS = """SELECT measurements_hourly.Time, plan_history.Price, plan_history.SpotPrice,
+                               measurements_hourly.Soc, measurements_hourly.MinSoc, measurements_hourly.MaxSoc,
+                               measurements_hourly.NetRate AS Consumption, plan_history.Power AS Solar,
+                               coalesce(profit.Profit, 0.0) AS Savings
+                        FROM measurements_hourly
+                        JOIN plan_history ON plan_history.Time = measurements_hourly.Time
+                        LEFT JOIN profit ON profit.Period = 'hour' AND profit.Start = measurements_hourly.Time
+                        WHERE measurements_hourly.Time >= ? AND measurements_hourly.Time < ?
+                        ORDER BY measurements_hourly.Time"""
+LOAD_HISTORY = """SELECT Start AS Time, Price / Hours AS Price, SpotPrice / Hours AS SpotPrice, Soc / Hours AS Soc,
+                         MinSoc, MaxSoc, Consumption, Solar, Savings, Hours
+                  FROM history WHERE Period = ? AND Start >= ? AND Start < ? ORDER BY Start"""
+
+class Database: # pylint: disable=too-many-public-methods
     """ Class for handling Database transactions with an open connection """
-    def __init__(self):
-        self.conn = sqlite3.connect(NAME)
+    def __init__(self, name: str = NAME):
+        self.conn = sqlite3.connect(name)
+        # Write-ahead logging lets the UI read while a plan is being written
+        self.conn.execute("PRAGMA journal_mode=WAL")
 
     def __del__(self):
         self.conn.close()
@@ -72,6 +210,20 @@ class Database:
                     cursor = self.conn.cursor()
                     cursor.execute(sql_str)
 
+        self.create_missing_indexes()
+
+
+    def create_missing_indexes(self) -> None:
+        """ Create missing indexes for tables in database """
+        with self.conn:
+            cursor = self.conn.cursor()
+
+            for index, (table, column) in EXPECTED_INDEXES.items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})")
+
+            for index, (table, column) in EXPECTED_UNIQUE_INDEXES.items():
+                cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({column})")
+
 
     def get_all_table_names(self) -> Any:
         """ Get a list of current table names in database 
@@ -140,27 +292,31 @@ class Database:
             table_content: Data to be updated in table
 
         """
-        table_to_update = [table for table in EXPECTED_TABLES if table == table_name]
+        if table_name not in EXPECTED_TABLES:
+            raise ValueError(f"Unknown table: {table_name}")
 
-        if not table_to_update:
-            # Error! Do something ...
-            pass
-        table_columns = [column[0] for column in EXPECTED_TABLE_CONTENT[table_to_update[0]]]
-        
-        set_list = []
-        for column, value in zip(table_columns, table_content):
-            if str(value):      # Not an empty string!
-                set_list.append(f"{column} = '{value}'")
-            elif value == 0:    # If value is an integer 0
-                set_list.append(f"{column} = '{value}'")
-            else:               # An empty string!
-                set_list.append(f"{column} = ''")
-        set_clause = ', '.join(set_list)
-        sql_str = f"""UPDATE {table_to_update[0]} SET {set_clause} WHERE rowid=1"""
+        table_columns = [column[0] for column in EXPECTED_TABLE_CONTENT[table_name]]
+        set_clause = ', '.join(f"{column} = ?" for column in table_columns[:len(table_content)])
+        sql_str = f"""UPDATE {table_name} SET {set_clause} WHERE rowid=1"""
 
         with self.conn:
             cursor = self.conn.cursor()
-            cursor.execute(sql_str)
+            cursor.execute(sql_str, table_content)
+
+
+    def save_plan(self, rows: list[tuple]) -> None: # type: ignore
+        """ Replace the saved plan with every hour of a new plan in a single transaction.
+        The hours are also saved in the plan history, so every passed hour keeps the values it was applied with.
+
+        Args:
+            rows: Plan and data rows with the columns of the plan table
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM plan")
+            cursor.executemany(INSERT_PLAN, rows)
+            cursor.executemany(SAVE_PLAN_HISTORY, rows)
 
 
     def load_settings(self) -> dict[str, str]:
@@ -181,19 +337,288 @@ class Database:
         return {column[0]:value for (column, value) in zip(description, result)}
     
 
-    def load_plan(self) -> dict[str, str]:
+    def load_plan(self, start_time: str = '') -> list[dict[str, Any]]:
         """ Loads saved plan from database into application memory
         
+        Args:
+            start_time: Only load hours from this time (formatted with TIME_FORMAT)
+
         Returns:
-            Dict with saved plan from database
+            List with a dict for every saved hour of the plan, ordered by time
 
         """
-        sql_str = "SELECT * FROM plan"
+        sql_str = "SELECT * FROM plan WHERE Time >= ? ORDER BY Time"
 
         with self.conn:
             cursor = self.conn.cursor()
-            cursor.execute(sql_str)
+            cursor.execute(sql_str, (start_time,))
             description = cursor.description
-            result = cursor.fetchall()[0]
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def insert_measurements(self, rows: list[tuple[str, float, float, str, float]]) -> None:
+        """ Append a batch of measurements in a single transaction
+
+        Args:
+            rows: Measurement rows with Time, Soc, NetRate, Action and Price
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.executemany(INSERT_MEASUREMENTS, rows)
+
+
+    def rollup_measurements(self, start_time: str, end_time: str) -> None:
+        """ Downsample measurements into hourly averages (the last action of every hour is kept).
+        Hours that are already rolled up are replaced, so a rollup can safely run again.
+
+        Args:
+            start_time: Roll up measurements from this time (formatted with TIME_FORMAT)
+            end_time: Roll up measurements until this time (should be a whole hour)
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute(ROLLUP_MEASUREMENTS, (start_time, end_time))
+
+
+    def load_last_rollup_hour(self) -> str | None:
+        """ Loads the start of the last hour rolled up into hourly measurements
+
+        Returns:
+            Start of the hour (formatted with TIME_FORMAT), or None if no hour is rolled up yet
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT max(Time) FROM measurements_hourly")
+            result = cursor.fetchone()[0]
+
+        return result if result is None else str(result)
+
+
+    def delete_measurements(self, raw_before: str, hourly_before: str) -> None:
+        """ Delete measurements older than their retention
+
+        Args:
+            raw_before: Delete measurements before this time (formatted with TIME_FORMAT)
+            hourly_before: Delete hourly measurements before this time (formatted with TIME_FORMAT)
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM measurements WHERE Time < ?", (raw_before,))
+            cursor.execute("DELETE FROM measurements_hourly WHERE Time < ?", (hourly_before,))
+
+
+    def load_measurements(self, start_time: str, end_time: str, hourly: bool = False) -> list[dict[str, Any]]:
+        """ Loads measurements within a time range from database
+
+        Args:
+            start_time: Load measurements from this time (formatted with TIME_FORMAT)
+            end_time: Load measurements before this time (formatted with TIME_FORMAT)
+            hourly: Load hourly measurements instead of every measurement
+
+        Returns:
+            List with a dict for every measurement, ordered by time
+
+        """
+        table = 'measurements_hourly' if hourly else 'measurements'
+        sql_str = f"SELECT * FROM {table} WHERE Time >= ? AND Time < ? ORDER BY Time"
+
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute(sql_str, (start_time, end_time))
+            description = cursor.description
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def save_model_state(self, name: str, updated: str, state: str) -> None:
+        """ Save the state of a forecasting model, replacing its previous state
+
+        Args:
+            name: Name of model
+            updated: Time of the newest data the model has learned from (formatted with TIME_FORMAT)
+            state: JSON encoded state of model
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("INSERT OR REPLACE INTO model_state VALUES (?,?,?)", (name, updated, state))
+
+
+    def load_model_state(self, name: str) -> dict[str, str] | None:
+        """ Loads the saved state of a forecasting model
+
+        Args:
+            name: Name of model
+
+        Returns:
+            Dict with Name, Updated and State of model, or None if model has no saved state
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM model_state WHERE Name = ?", (name,))
+            description = cursor.description
+            result = cursor.fetchone()
 
+        if result is None:
+            return None
         return {column[0]:value for (column, value) in zip(description, result)}
+
+
+    def save_spot_prices(self, rows: list[tuple[str, str, float]]) -> None:
+        """ Archive published spot prices, replacing already archived prices of the same hours
+
+        Args:
+            rows: Time (formatted with TIME_FORMAT), PriceArea and SpotPrice of every hour
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.executemany("INSERT OR REPLACE INTO spot_prices VALUES (?,?,?)", rows)
+
+
+    def load_spot_prices(self, price_area: str, start_time: str) -> list[dict[str, Any]]:
+        """ Loads archived spot prices of a price area from start_time
+
+        Args:
+            price_area: DK1 (West of Great Belt) or DK2 (East of Great Belt)
+            start_time: Time of the first hour (formatted with TIME_FORMAT)
+
+        Returns:
+            List of rows with Time, PriceArea and SpotPrice, ordered by time
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM spot_prices WHERE PriceArea = ? AND Time >= ? ORDER BY Time",
+                           (price_area, start_time))
+            description = cursor.description
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def add_profit(self, rows: list[tuple[str, str, float, float, float, float, float, int]]) -> None:
+        """ Add accounted hours to the running profit totals in a single transaction
+
+        Args:
+            rows: Period, Start, Consumption, BatteryDelta, Cost, BaselineCost, Profit and Hours to add
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.executemany(ADD_PROFIT, rows)
+
+
+    def load_profit(self, period: str, start_time: str, end_time: str) -> list[dict[str, Any]]:
+        """ Loads running profit totals of a period within a time range from database
+
+        Args:
+            period: 'hour', 'day', 'month' or 'total'
+            start_time: Load totals from this time (formatted with TIME_FORMAT)
+            end_time: Load totals before this time (formatted with TIME_FORMAT)
+
+        Returns:
+            List with a dict for every total, ordered by start time
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM profit WHERE Period = ? AND Start >= ? AND Start < ? ORDER BY Start",
+                           (period, start_time, end_time))
+            description = cursor.description
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def load_last_profit_hour(self) -> str | None:
+        """ Loads the start of the last hour added to the running profit totals
+
+        Returns:
+            Start of the hour (formatted with TIME_FORMAT), or None if no hour is accounted yet
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT max(Start) FROM profit WHERE Period = 'hour'")
+            result = cursor.fetchone()[0]
+
+        return result if result is None else str(result)
+
+
+    def load_history_hours(self, start_time: str, end_time: str) -> list[dict[str, Any]]:
+        """ Loads measured hours with their planned prices and solar power and their realized profit
+
+        Args:
+            start_time: Load hours from this time (formatted with TIME_FORMAT)
+            end_time: Load hours before this time (formatted with TIME_FORMAT)
+
+        Returns:
+            List with a dict of Time, Price, SpotPrice, Soc, MinSoc, MaxSoc, Consumption, Solar and Savings
+            for every hour, ordered by time
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute(LOAD_HISTORY_HOURS, (start_time, end_time))
+            description = cursor.description
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def add_history(self, rows: list[tuple[str, str, float, float, float, float, float,
+                                           float, float, float, int]]) -> None:
+        """ Add hours to the history rollups in a single transaction
+
+        Args:
+            rows: Period, Start, Price, SpotPrice, Soc, MinSoc, MaxSoc, Consumption, Solar, Savings and Hours to add
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.executemany(ADD_HISTORY, rows)
+
+
+    def load_history(self, period: str, start_time: str, end_time: str) -> list[dict[str, Any]]:
+        """ Loads history rollups of a period within a time range from database
+
+        Args:
+            period: 'hour', 'day' or 'month'
+            start_time: Load rollups from this time (formatted with TIME_FORMAT)
+            end_time: Load rollups before this time (formatted with TIME_FORMAT)
+
+        Returns:
+            List with a dict for every rollup (with average prices and SoC), ordered by time
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute(LOAD_HISTORY, (period, start_time, end_time))
+            description = cursor.description
+            result = cursor.fetchall()
+
+        return [{column[0]:value for (column, value) in zip(description, row)} for row in result]
+
+
+    def load_last_history_hour(self) -> str | None:
+        """ Loads the start of the last hour added to the history rollups
+
+        Returns:
+            Start of the hour (formatted with TIME_FORMAT), or None if no hour is rolled up yet
+
+        """
+        with self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT max(Start) FROM history WHERE Period = 'hour'")
+            result = cursor.fetchone()[0]
+
+        return result if result is None else str(result)
\ No newline at end of file
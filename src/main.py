@@ -10,10 +10,14 @@ Example:
 """
 
 import os
-from ui import Application
+import time
+
+STARTED = time.perf_counter()   # Before the heavy imports, so time-to-first-frame includes them
+
+from ui import Application  # pylint: disable=wrong-import-position
 
 if __name__ == "__main__":
     current_os = os.name
-    app = Application(current_os)
+    app = Application(current_os, started=STARTED)
     app.mainloop()
     
\ No newline at end of file
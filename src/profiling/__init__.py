@@ -0,0 +1,3 @@
+# pylint: skip-file
+from .metrics import Metrics, Histogram, METRICS, METRICS_FILE, timer, timed, count
+from .trace import Tracer, TRACER, TRACE_ENV, read_trace
\ No newline at end of file
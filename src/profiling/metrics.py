@@ -0,0 +1,251 @@
+"""
+Timers and counters for finding out where time goes in collecting data, planning and controlling the battery.
+Durations are aggregated into histograms in memory, which can be merged between processes and exported.
+
+Date:
+    19-10-2026
+
+Example:
+    >>> with timer('planner.fix_excess'):
+    ...     fix_excess()
+    >>> @timed('http.get_data')
+    ... def get_data(url): ...
+    >>> count('minicon.retries')
+    >>> METRICS.snapshot()['timers']['planner.fix_excess']['p95']
+    0.05
+
+"""
+
+import json
+import time
+import bisect
+import functools
+import threading
+
+from typing import Any, Callable, Iterator, TypeVar
+from contextlib import contextmanager
+
+from data.helperfunctions.atomic_write import write_atomic
+
+
+# Upper bounds of the histogram buckets in seconds (durations above the last bound go into an extra bucket)
+BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 60.0)
+QUANTILES = (0.5, 0.95)
+METRICS_FILE = "metrics.json"
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class Histogram:
+    """ Class for aggregating durations into fixed buckets """
+    def __init__(self) -> None:
+        self._buckets = [0] * (len(BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def __repr__(self):
+        return f"Histogram(count={self._count}, mean={self.mean:.4f})"
+
+    @property
+    def count(self) -> int:
+        """ Get number of observed durations """
+        return self._count
+
+    @property
+    def total(self) -> float:
+        """ Get sum of observed durations (s) """
+        return self._total
+
+    @property
+    def mean(self) -> float:
+        """ Get mean of observed durations (s) """
+        return self._total / self._count if self._count else 0.0
+
+    @property
+    def max(self) -> float:
+        """ Get longest observed duration (s) """
+        return self._max
+
+    @property
+    def buckets(self) -> list[int]:
+        """ Get number of durations in every bucket """
+        return self._buckets
+
+    def observe(self, seconds: float) -> None:
+        """ Add a duration to the histogram
+
+        Args:
+            seconds: Duration to add
+
+        """
+        self._buckets[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        self._max = max(self._max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """ Estimate a quantile of the durations from the buckets
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Upper bound of the bucket holding the quantile (at most the longest duration)
+
+        """
+        rank, seen = q * self._count, 0
+
+        for bound, bucket in zip(BOUNDS, self._buckets):
+            seen += bucket
+            if seen >= rank and seen > 0:
+                return min(bound, self._max)
+        return self._max
+
+    def merge(self, other: dict[str, Any]) -> None:
+        """ Add the durations of an exported histogram (e.g. from another process)
+
+        Args:
+            other: Histogram exported by `as_dict`
+
+        """
+        self._buckets = [mine + theirs for mine, theirs in zip(self._buckets, other['buckets'])]
+        self._count += other['count']
+        self._total += other['total']
+        self._max = max(self._max, other['max'])
+
+    def as_dict(self) -> dict[str, Any]:
+        """ Export the histogram with estimated quantiles
+
+        Returns:
+            Count, total, mean, max, quantiles (e.g. 'p95') and buckets
+
+        """
+        exported: dict[str, Any] = {'count': self._count, 'total': self._total, 'mean': self.mean, 'max': self._max}
+        exported.update({f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES})
+        exported['buckets'] = list(self._buckets)
+        return exported
+
+
+class Metrics:
+    """ Class for thread-safe timers and counters, shared by every module of a process """
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._timers: dict[str, Histogram] = {}
+        self._counters: dict[str, int] = {}
+
+    def __repr__(self):
+        return f"Metrics(timers={len(self._timers)}, counters={len(self._counters)})"
+
+    def observe(self, name: str, seconds: float) -> None:
+        """ Add a duration to the histogram of a timer
+
+        Args:
+            name: Name of timer (e.g. 'planner.fix_excess')
+            seconds: Duration to add
+
+        """
+        with self._lock:
+            self._timers.setdefault(name, Histogram()).observe(seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """ Add to a counter
+
+        Args:
+            name: Name of counter (e.g. 'minicon.retries')
+            value: Value to add
+
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """ Time a block of code (also when it raises)
+
+        Args:
+            name: Name of timer
+
+        """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(name, self._clock() - start)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """ Decorator timing every call of a function
+
+        Args:
+            name: Name of timer
+
+        Returns:
+            Decorator for the function
+
+        """
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.timer(name):
+                    return func(*args, **kwargs)
+            return wrapper # type: ignore
+        return decorator
+
+    def snapshot(self) -> dict[str, Any]:
+        """ Export every timer and counter
+
+        Returns:
+            Dict with the exported histogram of every timer and the value of every counter
+
+        """
+        with self._lock:
+            return {'timers': {name: histogram.as_dict() for name, histogram in sorted(self._timers.items())},
+                    'counters': dict(sorted(self._counters.items()))}
+
+    def drain(self) -> dict[str, Any]:
+        """ Export every timer and counter and start over (e.g. for sending them to another process)
+
+        Returns:
+            The exported timers and counters
+
+        """
+        with self._lock:
+            snapshot = {'timers': {name: histogram.as_dict() for name, histogram in self._timers.items()},
+                        'counters': dict(self._counters)}
+            self._timers, self._counters = {}, {}
+            return snapshot
+
+    def merge(self, snapshot: dict[str, Any]) -> None:
+        """ Add exported timers and counters (e.g. from the Planner worker process)
+
+        Args:
+            snapshot: Timers and counters exported by `snapshot` or `drain`
+
+        """
+        with self._lock:
+            for name, histogram in snapshot.get('timers', {}).items():
+                self._timers.setdefault(name, Histogram()).merge(histogram)
+            for name, value in snapshot.get('counters', {}).items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def export(self, path: str = METRICS_FILE) -> None:
+        """ Export every timer and counter to a JSON file (replaced at once, so readers never see half a file)
+
+        Args:
+            path: Path of file
+
+        """
+        snapshot = self.snapshot()
+        write_atomic(path, lambda file: json.dump(snapshot, file, indent=2))
+
+    def reset(self) -> None:
+        """ Remove every timer and counter """
+        with self._lock:
+            self._timers, self._counters = {}, {}
+
+
+METRICS = Metrics()     # Metrics of this process
+timer = METRICS.timer
+timed = METRICS.timed
+count = METRICS.count
@@ -0,0 +1,158 @@
+"""
+Opt-in decision trace of the Planner, written as compact JSON lines (one event per line).
+A trace holds the timing of every phase, the candidate hours evaluated, the accepted and rejected trials
+and the final action and reason of every hour. Enabled by setting PLANNER_TRACE to the path of the trace file
+(also for the Planner worker process, which inherits the environment).
+
+Date:
+    19-10-2026
+
+Example:
+    >>> TRACER.enable("planner_trace.jsonl")
+    >>> TRACER.start(hours=24)
+    >>> with TRACER.phase('fix_excess'):
+    ...     if TRACER.enabled:
+    ...         TRACER.event('candidate', hour=5, price=1.2)
+    >>> TRACER.finish()
+    >>> [event['event'] for event in read_trace("planner_trace.jsonl")]
+    ['start', 'candidate', 'phase', 'end']
+
+"""
+
+import os
+import json
+import time
+import itertools
+
+from typing import Any, Callable, Iterator
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+
+
+TRACE_ENV = "PLANNER_TRACE"
+
+
+class Tracer:
+    """ Class for buffering the events of a trace and appending them to a file when the trace is finished.
+    Call sites check `enabled` before building an event, so a disabled Tracer costs a single attribute check.
+
+    """
+    def __init__(self, path: str | None = None, clock: Callable[[], int] = time.perf_counter_ns):
+        self._path = path
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._trace = 0
+        self._started = 0
+        self._events: list[dict[str, Any]] = []
+
+    def __repr__(self):
+        return f"Tracer(path={self._path}, events={len(self._events)})"
+
+    @property
+    def enabled(self) -> bool:
+        """ Get whether traces are recorded """
+        return self._path is not None
+
+    @property
+    def path(self) -> str | None:
+        """ Get path of the trace file (None if disabled) """
+        return self._path
+
+    def enable(self, path: str) -> None:
+        """ Record traces and append them to a file
+
+        Args:
+            path: Path of the trace file
+
+        """
+        self._path = path
+
+    def disable(self) -> None:
+        """ Stop recording traces (an unfinished trace is dropped) """
+        self._path = None
+        self._events = []
+
+    def start(self, **fields: Any) -> None:
+        """ Start a new trace (an unfinished trace is dropped)
+
+        Args:
+            fields: Fields of the start event (e.g. number of hours)
+
+        """
+        if not self.enabled:
+            return
+
+        self._trace, self._started, self._events = next(self._ids), self._clock(), []
+        self.event('start', time=datetime.now().isoformat(timespec='seconds'), pid=os.getpid(), **fields)
+
+    def event(self, kind: str, **fields: Any) -> None:
+        """ Add an event to the trace
+
+        Args:
+            kind: Kind of event (e.g. 'candidate' or 'trial')
+            fields: Fields of the event (must be JSON serializable)
+
+        """
+        if not self.enabled:
+            return
+
+        self._events.append({'trace': self._trace, 'us': (self._clock() - self._started) // 1000,
+                             'event': kind, **fields})
+
+    def phase(self, name: str) -> Any:
+        """ Get a context manager adding a phase event with its duration when the phase ends
+
+        Args:
+            name: Name of phase
+
+        Returns:
+            Context manager of the phase (a shared no-op if disabled)
+
+        """
+        return self._phase(name) if self.enabled else nullcontext()
+
+    def finish(self, **fields: Any) -> None:
+        """ Finish the trace and append its events to the trace file
+
+        Args:
+            fields: Fields of the end event
+
+        """
+        if not self.enabled or not self._events:
+            return
+
+        self.event('end', **fields)
+        lines = [json.dumps(event, separators=(',', ':'), default=str) for event in self._events]
+        self._events = []
+
+        # One write of every line, so traces of different processes are not interleaved
+        with open(str(self._path), 'a', encoding='utf-8') as file:
+            file.write('\n'.join(lines) + '\n')
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """ Context manager adding a phase event with its duration (also when the phase raises) """
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.event('phase', name=name, duration_us=(self._clock() - start) // 1000)
+
+
+def read_trace(path: str) -> Iterator[dict[str, Any]]:
+    """ Read the events of a trace file
+
+    Args:
+        path: Path of the trace file
+
+    Returns:
+        Iterator of events, in the order they were written
+
+    """
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+TRACER = Tracer(os.environ.get(TRACE_ENV) or None)     # Tracer of this process
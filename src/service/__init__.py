@@ -0,0 +1,6 @@
+# pylint: skip-file
+from .host import AsyncioHost
+from .api_server import ApiServer, Response, fetch_json
+from .api import Api
+from .plan_store import PlanStore, PlanSnapshot
+from .daemon import Daemon, run_daemon
\ No newline at end of file
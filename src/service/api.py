@@ -0,0 +1,217 @@
+"""
+Routes of the local API, serving one shared Scheduler state and the measurement history
+
+Date:
+    19-10-2026
+
+Routes:
+    /status                             Status of the service
+    /plan?format=json|arrow             Current plan
+    /data?format=json|arrow             Input data of the current plan
+    /battery                            Latest battery telemetry
+    /history?start=&end=&hourly=1       Measurements in a time range (ISO times, end defaults to now)
+    /rollups?start=&end=&points=        Downsampled history rollups of a time range (ISO times, end defaults to now)
+    /metrics                            Timers and counters of data collection, planning and actuation
+
+"""
+
+import hashlib
+import pandas as pd
+
+from http import HTTPStatus
+from typing import Any, Callable
+from datetime import datetime
+
+from database import Database
+from database.database import NAME, TIME_FORMAT
+from controller.history import load_history, MAX_POINTS
+from profiling import METRICS
+from .api_server import Response, json_response, ARROW
+
+
+FORMATS = ('json', 'arrow')
+BLOCKING_ROUTES = ('/history', '/rollups')     # Routes querying the database
+
+
+class Api:
+    """ Class for the routes of the local API """
+    def __init__(self, scheduler: Any, status: Callable[[], dict[str, Any]], database: str = NAME):
+        self._scheduler = scheduler
+        self._status = status
+        self._database = database
+        # Plan and data are only encoded once for every plan version and format, however many clients poll
+        self._cache: dict[tuple[str, str], tuple[int, Response]] = {}
+
+    def __repr__(self):
+        return f"Api(routes={list(self.routes)})"
+
+    @property
+    def routes(self) -> dict[str, Callable[[dict[str, str]], Response]]:
+        """ Get the handler of every route """
+        return {
+            '/status': self.status,
+            '/plan': self.plan,
+            '/data': self.data,
+            '/battery': self.battery,
+            '/history': self.history,
+            '/rollups': self.rollups,
+            '/metrics': self.metrics,
+        }
+
+    @property
+    def blocking(self) -> tuple[str, ...]:
+        """ Get the routes that block on the database, to be run outside the event loop """
+        return BLOCKING_ROUTES
+
+    def status(self, query: dict[str, str]) -> Response: # pylint: disable=unused-argument
+        """ Get the status of the service """
+        return json_response(self._status())
+
+    def plan(self, query: dict[str, str]) -> Response:
+        """ Get the current plan """
+        return self._frame('plan', query.get('format', 'json'))
+
+    def data(self, query: dict[str, str]) -> Response:
+        """ Get the input data of the current plan """
+        return self._frame('data', query.get('format', 'json'))
+
+    def battery(self, query: dict[str, str]) -> Response: # pylint: disable=unused-argument
+        """ Get the latest battery telemetry """
+        battery = self._scheduler.battery
+        return json_response({'time': battery.time.isoformat(), 'soc': battery.soc,
+                              'real_consumption': battery.real_consumption})
+
+    def history(self, query: dict[str, str]) -> Response:
+        """ Get measurements in a time range, served from the Time index of the measurement tables """
+        try:
+            start = parse_time(query['start'])
+            end = parse_time(query['end']) if 'end' in query else datetime.now()
+        except (KeyError, ValueError):
+            return json_response({'error': "start (and end) must be ISO times"}, HTTPStatus.BAD_REQUEST)
+
+        hourly = query.get('hourly', '0').lower() in ('1', 'true')
+        rows = Database(self._database).load_measurements(datetime.strftime(start, TIME_FORMAT),
+                                                          datetime.strftime(end, TIME_FORMAT), hourly=hourly)
+        columns: dict[str, list[Any]] = {column: [row[column] for row in rows] for column in (rows[0] if rows else {})}
+
+        if 'Time' in columns:
+            columns['Time'] = [datetime.strptime(time, TIME_FORMAT).isoformat() for time in columns['Time']]
+
+        return json_response({'hourly': hourly, 'columns': columns})
+
+    def rollups(self, query: dict[str, str]) -> Response:
+        """ Get the history rollups of a time range, served from the index of the rollups and downsampled """
+        try:
+            start = parse_time(query['start'])
+            end = parse_time(query['end']) if 'end' in query else datetime.now()
+            points = int(query.get('points', MAX_POINTS))
+        except (KeyError, ValueError):
+            return json_response({'error': "start (and end) must be ISO times and points a number"},
+                                 HTTPStatus.BAD_REQUEST)
+
+        period, history = load_history(Database(self._database), start, end, points)
+        return json_response({'period': period, 'columns': frame_to_columns(history)})
+
+    def metrics(self, query: dict[str, str]) -> Response: # pylint: disable=unused-argument
+        """ Get the timers and counters of the service """
+        return json_response(METRICS.snapshot())
+
+    def _frame(self, name: str, fmt: str) -> Response:
+        """ Get the plan or data of the current plan version in a format
+
+        Args:
+            name: 'plan' or 'data'
+            fmt: 'json' or 'arrow'
+
+        Returns:
+            The encoded DataFrame
+
+        """
+        if fmt not in FORMATS:
+            return json_response({'error': f"Format must be one of {FORMATS}"}, HTTPStatus.BAD_REQUEST)
+
+        version = self._scheduler.plan_version
+        cached = self._cache.get((name, fmt))
+
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        frame = getattr(self._scheduler, name)
+        if fmt == 'json':
+            response = json_response({'version': version, 'columns': frame_to_columns(frame)})
+        else: # pragma: no cover
+            content = frame_to_arrow(frame)
+            if content is None:
+                return json_response({'error': "Arrow format needs pyarrow"}, HTTPStatus.NOT_ACCEPTABLE)
+            response = Response(HTTPStatus.OK, content, ARROW)
+
+        # Hashed from the content, so an ETag from before a restart does not match a different plan
+        response = Response(response.status, response.body, response.content_type,
+                            f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"')
+        self._cache[(name, fmt)] = (version, response)
+        return response
+
+
+def parse_time(value: str) -> datetime:
+    """ Parse an ISO time of a query into the naive local time used by the database
+
+    Args:
+        value: ISO time, with or without a UTC offset
+
+    Returns:
+        The time in local time without time zone
+
+    Raises:
+        ValueError: If the value is not an ISO time
+
+    """
+    time = datetime.fromisoformat(value)
+    return time.astimezone().replace(tzinfo=None) if time.tzinfo is not None else time
+
+
+def frame_to_columns(frame: pd.DataFrame) -> dict[str, list[Any]]:
+    """ Convert a DataFrame to JSON serializable columns
+
+    Args:
+        frame: DataFrame to convert
+
+    Returns:
+        List of values for every column, with ISO times and None for missing values
+
+    """
+    columns = {}
+
+    for column in frame.columns:
+        series = frame[column]
+
+        if pd.api.types.is_datetime64_any_dtype(series):
+            columns[column] = series.dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+        else:
+            columns[column] = series.astype(object).where(series.notna(), None).tolist()
+
+    return columns
+
+
+def frame_to_arrow(frame: pd.DataFrame) -> bytes | None: # pragma: no cover
+    """ Convert a DataFrame to an Arrow IPC stream
+
+    Args:
+        frame: DataFrame to convert
+
+    Returns:
+        The encoded stream, or None if pyarrow is not installed
+
+    """
+    try:
+        import pyarrow as pa    # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    # Planner builds its plan with object columns, so let pandas find the real types first
+    table = pa.Table.from_pandas(frame.infer_objects(), preserve_index=False)
+    sink = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return bytes(sink.getvalue().to_pybytes())
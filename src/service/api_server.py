@@ -0,0 +1,253 @@
+"""
+Local HTTP server for the JSON (or Arrow) API of the headless service
+
+Date:
+    19-10-2026
+
+Example:
+    >>> api = Api(scheduler, daemon.status)
+    >>> server = ApiServer(api.routes, api.blocking)
+    >>> await server.start()
+    >>> fetch_json('/plan')     # From the Tk or Dash UI
+    {'version': 3, 'columns': {'Time': [...], 'Action': [...], ...}}
+
+"""
+
+import json
+import asyncio
+import hashlib
+import urllib.request
+import numpy as np
+
+from http import HTTPStatus
+from typing import Any, Callable, Collection
+from datetime import date
+from dataclasses import dataclass, field, replace
+from urllib.parse import urlsplit, parse_qsl
+
+
+HOST = '127.0.0.1'      # Only local processes can attach
+PORT = 8765
+JSON = 'application/json'
+ARROW = 'application/vnd.apache.arrow.stream'
+
+
+@dataclass(frozen=True)
+class Response:
+    """ Class for storing an HTTP response """
+    _status: int
+    _body: bytes = field(default=b'')
+    _content_type: str = field(default=JSON)
+    _etag: str = field(default='')
+
+    def __repr__(self):
+        return f"Response(status={self._status}, content_type={self._content_type}, size={len(self._body)})"
+
+    @property
+    def status(self) -> int:
+        """ Get HTTP status code of Response """
+        return self._status
+
+    @property
+    def body(self) -> bytes:
+        """ Get encoded body of Response """
+        return self._body
+
+    @property
+    def content_type(self) -> str:
+        """ Get content type of body """
+        return self._content_type
+
+    @property
+    def etag(self) -> str:
+        """ Get entity tag of body (empty if not cacheable) """
+        return self._etag
+
+
+class ApiServer:
+    """ Class for serving routes over HTTP on the asyncio event loop.
+    Blocking routes (e.g. database queries) run in a worker thread, so they do not hold up the event loop.
+
+    """
+    def __init__(self, routes: dict[str, Callable[[dict[str, str]], Response]], blocking: Collection[str] = ()):
+        self._routes = routes
+        self._blocking = frozenset(blocking)
+        self._server: asyncio.Server | None = None
+
+    def __repr__(self):
+        return f"ApiServer(routes={list(self._routes)}, port={self.port})"
+
+    @property
+    def port(self) -> int | None:
+        """ Get the port the server listens on (None if not started) """
+        if self._server is None or not self._server.sockets:
+            return None
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def start(self, host: str = HOST, port: int = PORT) -> None:
+        """ Start listening for requests
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on (0 for any free port)
+
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+
+    async def stop(self) -> None:
+        """ Stop listening for requests """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def respond(self, request_line: str, headers: dict[str, str] | None = None) -> Response:
+        """ Get the response to a request.
+        Successful responses get an ETag, and 304 Not Modified is returned if it matches If-None-Match.
+
+        Args:
+            request_line: First line of the HTTP request (e.g. "GET /plan?format=arrow HTTP/1.1")
+            headers: Request headers with lower-case names
+
+        Returns:
+            The response
+
+        """
+        headers = headers if headers is not None else {}
+        parts = request_line.split()
+
+        if len(parts) < 2:
+            return json_response({'error': "Malformed request"}, HTTPStatus.BAD_REQUEST)
+
+        method, target = parts[0], urlsplit(parts[1])
+        route = self._routes.get(target.path)
+
+        if route is None:
+            return json_response({'error': f"No route {target.path}", 'routes': list(self._routes)},
+                                 HTTPStatus.NOT_FOUND)
+        if method != 'GET':
+            return json_response({'error': f"Method {method} is not allowed"}, HTTPStatus.METHOD_NOT_ALLOWED)
+
+        response = _call(route, dict(parse_qsl(target.query)))
+
+        if response.status != HTTPStatus.OK:
+            return response
+
+        etag = response.etag or f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+        if etag in headers.get('if-none-match', '').split(', '):
+            return Response(HTTPStatus.NOT_MODIFIED, b'', response.content_type, etag)
+
+        return replace(response, _etag=etag)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ Handle a single request on a connection """
+        try:
+            request_line = (await reader.readline()).decode('latin-1')
+            headers = {}
+
+            while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            writer.write(build_response(await self._respond(request_line, headers)))
+            await writer.drain()
+        except ConnectionError: # pragma: no cover
+            pass    # Client disconnected before the response
+        except Exception as exc:    # pylint: disable=broad-exception-caught
+            # Answer instead of dropping the connection (and leaving the exception to the event loop)
+            writer.write(build_response(error_response(exc)))
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: str, headers: dict[str, str]) -> Response:
+        """ Get the response to a request, in a worker thread if its route is blocking """
+        parts = request_line.split()
+
+        if len(parts) >= 2 and urlsplit(parts[1]).path in self._blocking:
+            return await asyncio.to_thread(self.respond, request_line, headers)
+        return self.respond(request_line, headers)
+
+
+def _call(route: Callable[[dict[str, str]], Response], query: dict[str, str]) -> Response:
+    """ Call a route, answering with 500 Internal Server Error if it raises """
+    try:
+        return route(query)
+    except Exception as exc:    # pylint: disable=broad-exception-caught
+        return error_response(exc)
+
+
+def error_response(exc: Exception) -> Response:
+    """ Create a 500 Internal Server Error response for an exception
+
+    Args:
+        exc: The raised exception
+
+    Returns:
+        The response with the type and message of the exception
+
+    """
+    return json_response({'error': f"{type(exc).__name__}: {exc}"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+
+def json_response(body: Any, status: int = HTTPStatus.OK) -> Response:
+    """ Create a response with a compact JSON body
+
+    Args:
+        body: JSON serializable body (NumPy scalars and times are converted)
+        status: HTTP status code
+
+    Returns:
+        The response
+
+    Raises:
+        TypeError: If the body holds a value that cannot be converted
+
+    """
+    content = json.dumps(body, separators=(',', ':'), default=_to_json)
+    return Response(status, content.encode())
+
+
+def _to_json(value: Any) -> Any:
+    """ Convert a NumPy scalar or a time, which `json` cannot serialize by itself """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def build_response(response: Response) -> bytes:
+    """ Build the HTTP message of a response
+
+    Args:
+        response: The response
+
+    Returns:
+        The encoded HTTP message
+
+    """
+    header = (f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}\r\n"
+              f"Content-Type: {response.content_type}\r\n"
+              f"Content-Length: {len(response.body)}\r\n")
+
+    if response.etag:
+        # Clients must revalidate, which is cheap since unchanged content is answered with 304
+        header += f"ETag: {response.etag}\r\nCache-Control: no-cache\r\n"
+
+    return (header + "Connection: close\r\n\r\n").encode('latin-1') + response.body
+
+
+def fetch_json(path: str = '/status', host: str = HOST, port: int = PORT) -> Any: # pragma: no cover
+    """ Get a JSON route of a running headless service
+
+    Args:
+        path: Route to get, including query (e.g. '/history?start=2023-10-01')
+        host: Address of the service
+        port: Port of the service
+
+    Returns:
+        The JSON body of the response
+
+    """
+    with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as response:
+        return json.loads(response.read())
@@ -0,0 +1,132 @@
+"""
+Headless service running the Scheduler, Planner, battery monitor and persistence without Tk.
+The HTTP API is only served by the daemon, not by the Tk Application, so run the daemon to query the API.
+
+Date:
+    19-10-2026
+
+Example:
+    >>> asyncio.run(run_daemon())   # Until SIGINT or SIGTERM
+
+"""
+
+import signal
+import asyncio
+
+from typing import Any
+from datetime import datetime
+
+from database import Database
+from database.database import DEFAULT_SETTINGS
+from data.helperfunctions import FETCHER
+from ui.scheduler import Scheduler
+from .host import AsyncioHost
+from .api import Api
+from .api_server import ApiServer, HOST, PORT
+
+
+class Daemon(AsyncioHost):
+    """ Class for hosting the Scheduler on an asyncio event loop """
+    def __init__(self, loop: asyncio.AbstractEventLoop, settings: dict[str, str]): # pragma: no cover
+        super().__init__(loop)
+        self._started = datetime.now()
+        self._action = ('', '')     # Last action and its reason
+        self._scheduler = Scheduler(self, settings)
+
+    def __repr__(self):
+        return f"Daemon(started={self._started}, action={self._action[0]})"
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """ Get the hosted Scheduler """
+        return self._scheduler
+
+    def update_ui(self, *args: Any, section: str = '') -> None:
+        """ Keep the last action from the Scheduler for the status route
+
+        Args:
+            args: Action and action reason (if section is 'action' or empty)
+            section: Section of the UI to update
+
+        """
+        if section in ('', 'action') and len(args) >= 2:
+            self._action = (args[0], args[1])
+
+    def status(self) -> dict[str, Any]:
+        """ Get the status of the service """
+        return build_status(self._scheduler, self._action, self._started)
+
+    async def run(self, host: str = HOST, port: int = PORT) -> None: # pragma: no cover
+        """ Run the Scheduler and the local API until SIGINT or SIGTERM
+
+        Args:
+            host: Address of the local API
+            port: Port of the local API
+
+        """
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._loop.add_signal_handler(signum, stop.set)
+
+        api = Api(self._scheduler, self.status)
+        server = ApiServer(api.routes, api.blocking)
+        await server.start(host, port)
+        self._scheduler.start()
+        print(f"HomeBatteryController running headless, API at http://{host}:{server.port}")
+
+        try:
+            await stop.wait()
+        finally:
+            # Measurements are flushed and the Planner worker process is stopped before exiting
+            self._scheduler.shutdown()
+            await server.stop()
+
+
+def build_status(scheduler: Any, action: tuple[str, str], started: datetime) -> dict[str, Any]:
+    """ Build the JSON status of the service
+
+    Args:
+        scheduler: The hosted Scheduler
+        action: Last action and its reason
+        started: Start time of the service
+
+    Returns:
+        Status with the last action, battery, plan, realized profit, prefetch, stale source and executor information
+
+    """
+    battery, plan = scheduler.battery, scheduler.plan
+
+    return {
+        'started': started.isoformat(),
+        'action': action[0],
+        'action_reason': action[1],
+        'battery': {'time': battery.time.isoformat(), 'soc': battery.soc,
+                    'real_consumption': battery.real_consumption},
+        'plan': {'version': scheduler.plan_version,
+                 'hours': len(plan),
+                 'start': plan['Time'].iloc[0].isoformat() if len(plan) else None,
+                 'end': plan['Time'].iloc[-1].isoformat() if len(plan) else None,
+                 'from_saved_plan': scheduler.from_saved_plan},
+        'profit': scheduler.profit_totals,
+        'prefetch': {name: {'fetched_at': status.fetched_at.isoformat() if status.fetched_at else None,
+                            'error': status.error}
+                     for name, status in scheduler.prefetch_status.items()},
+        'stale': {source: fetched_at.isoformat() for source, fetched_at in FETCHER.stale.items()},
+        'executor': scheduler.executor_stats,
+    }
+
+
+async def run_daemon(host: str = HOST, port: int = PORT) -> None: # pragma: no cover
+    """ Run HomeBatteryController headless with the saved user settings
+
+    Args:
+        host: Address of the local API
+        port: Port of the local API
+
+    """
+    db = Database()
+    db.create_missing_tables()
+    settings = db.load_settings() if not db.check_for_empty_table('settings') else dict(DEFAULT_SETTINGS)
+
+    daemon = Daemon(asyncio.get_running_loop(), settings)
+    await daemon.run(host, port)
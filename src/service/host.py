@@ -0,0 +1,75 @@
+"""
+Host for running the Scheduler on an asyncio event loop instead of a Tk window
+
+Date:
+    19-10-2026
+
+"""
+
+import asyncio
+import itertools
+import threading
+
+from typing import Any, Callable
+
+
+class AsyncioHost:
+    """ Class for running Tk-style `after` callbacks on an asyncio event loop """
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._loop_thread = threading.get_ident()   # Host must be created in the thread running the loop
+        self._ids = itertools.count()
+        self._handles: dict[str, asyncio.TimerHandle] = {}
+
+    def __repr__(self):
+        return f"AsyncioHost(pending={len(self._handles)})"
+
+    @property
+    def pending(self) -> int:
+        """ Get number of pending callbacks """
+        return len(self._handles)
+
+    def after(self, ms: int, func: Callable[..., Any], *args: Any) -> str:
+        """ Run a callback in the loop thread after a delay (like `tk.Tk.after`).
+        Can be called from any thread, e.g. from the completion callbacks of Executor tasks.
+
+        Args:
+            ms: Delay in milliseconds
+            func: Callback to run
+            args: Arguments for callback
+
+        Returns:
+            Id of the callback for `after_cancel`
+
+        """
+        timer_id = f"after#{next(self._ids)}"
+
+        if threading.get_ident() == self._loop_thread:
+            self._schedule(timer_id, ms, func, args)
+        else:
+            self._loop.call_soon_threadsafe(self._schedule, timer_id, ms, func, args)
+
+        return timer_id
+
+    def after_cancel(self, timer_id: str) -> None:
+        """ Cancel a pending callback (only from the loop thread)
+
+        Args:
+            timer_id: Id of the callback from `after`
+
+        """
+        handle = self._handles.pop(timer_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    def update_ui(self, *args: Any, section: str = '') -> None:
+        """ Called by the Scheduler when its state changes (nothing to update without a UI) """
+
+    def _schedule(self, timer_id: str, ms: int, func: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        """ Schedule a callback on the loop (runs in the loop thread) """
+        self._handles[timer_id] = self._loop.call_later(ms / 1000, self._run, timer_id, func, args)
+
+    def _run(self, timer_id: str, func: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        """ Run a due callback """
+        self._handles.pop(timer_id, None)
+        func(*args)
@@ -0,0 +1,209 @@
+"""
+Shared store of the current plan for dashboards, read from the database or the local API.
+Data derived from a plan (e.g. figures) is memoized per plan version, so every client shares one computation.
+
+Date:
+    19-10-2026
+
+Example:
+    >>> store = PlanStore('api')
+    >>> store.snapshot().version
+    '5be2d13f4c0a9e71'
+    >>> store.derived('costs', lambda snapshot: accumulated_costs(snapshot.data, snapshot.plan))
+    >>> period, history = store.history(datetime(2023, 9, 3), datetime(2023, 10, 3))
+
+"""
+
+import time
+import hashlib
+import threading
+import pandas as pd
+
+from typing import Any, Callable, Hashable, TypeVar
+from datetime import datetime
+from dataclasses import dataclass, field
+
+from database import Database
+from database.database import NAME, TIME_FORMAT, DATA_COLUMNS, EXPECTED_TABLE_CONTENT
+from controller.history import load_history
+from .api_server import fetch_json
+
+
+SOURCES = ('database', 'api')
+REFRESH = 10.0      # Seconds a loaded plan is served before the source is read again, however many clients ask
+HISTORIES = 8       # Loaded history ranges kept for other clients asking for the same range
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class PlanSnapshot:
+    """ Class for storing a version of the plan and its input data """
+    _version: str
+    _data: pd.DataFrame = field(compare=False)
+    _plan: pd.DataFrame = field(compare=False)
+
+    def __repr__(self):
+        return f"PlanSnapshot(version={self._version}, hours={len(self._plan)})"
+
+    @property
+    def version(self) -> str:
+        """ Get version of the plan (a hash of its content) """
+        return self._version
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """ Get the input data to Planner """
+        return self._data
+
+    @property
+    def plan(self) -> pd.DataFrame:
+        """ Get generated plan from Planner """
+        return self._plan
+
+    @property
+    def time_window(self) -> tuple[datetime, datetime]:
+        """ Get time of the first and last hour of the plan """
+        return (self._plan['Time'].iloc[0].to_pydatetime(), self._plan['Time'].iloc[-1].to_pydatetime())
+
+
+class PlanStore:
+    """ Class for sharing the current plan, and data derived from it, between threads """
+    def __init__(self, source: str = 'database', database: str = NAME, # pylint: disable=too-many-arguments
+                 fetch: Callable[[str], Any] = fetch_json, refresh: float = REFRESH,
+                 clock: Callable[[], float] = time.monotonic):
+        if source not in SOURCES:
+            raise ValueError(f"Source must be one of {SOURCES}")
+
+        self._source = source
+        self._database = database
+        self._fetch = fetch
+        self._refresh = refresh
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._snapshot: PlanSnapshot | None = None
+        self._loaded_at = 0.0
+        self._derived: dict[Hashable, Any] = {}     # Only holds data derived from the current version
+        self._histories: dict[tuple[datetime, datetime], tuple[str, pd.DataFrame]] = {}
+
+    def __repr__(self):
+        return f"PlanStore(source={self._source}, derived={len(self._derived)})"
+
+    @property
+    def source(self) -> str:
+        """ Get the source of plans ('database' or 'api') """
+        return self._source
+
+    def snapshot(self) -> PlanSnapshot:
+        """ Get the current plan, which is read from the source at most once every refresh period.
+        The last plan is kept if the source can not be read.
+
+        Returns:
+            Snapshot of the current plan
+
+        """
+        with self._lock:
+            if self._snapshot is not None and self._clock() - self._loaded_at < self._refresh:
+                return self._snapshot
+
+            try:
+                snapshot = self._load()
+            except OSError:
+                if self._snapshot is None:
+                    raise
+                snapshot = self._snapshot
+
+            if self._snapshot is None or snapshot.version != self._snapshot.version:
+                self._derived.clear()
+
+            self._snapshot, self._loaded_at = snapshot, self._clock()
+            return snapshot
+
+    def derived(self, name: Hashable, func: Callable[[PlanSnapshot], T]) -> T:
+        """ Get data derived from the current plan, computed once for every plan version
+
+        Args:
+            name: Name of the derived data
+            func: Function deriving the data from a snapshot
+
+        Returns:
+            The derived data
+
+        """
+        with self._lock:
+            snapshot = self.snapshot()
+
+            if name not in self._derived:
+                # Computed while holding the lock, so clients asking at the same time wait for one computation
+                self._derived[name] = func(snapshot)
+
+            value: T = self._derived[name]
+            return value
+
+    def history(self, start_time: datetime, end_time: datetime) -> tuple[str, pd.DataFrame]:
+        """ Get the downsampled history of a time range, loaded once for every range
+        (so clients should round the range, e.g. to whole hours, to share it)
+
+        Args:
+            start_time: Start of range
+            end_time: End of range
+
+        Returns:
+            The rollup period and a DataFrame with Time and every series of the history
+
+        """
+        with self._lock:
+            key = (start_time, end_time)
+
+            if key not in self._histories:
+                if len(self._histories) >= HISTORIES:
+                    self._histories.clear()
+                self._histories[key] = self._load_history(start_time, end_time)
+
+            return self._histories[key]
+
+    def _load(self) -> PlanSnapshot:
+        """ Load the plan and data from the source """
+        if self._source == 'api':
+            plan = pd.DataFrame(self._fetch('/plan')['columns'])
+            data = pd.DataFrame(self._fetch('/data')['columns'])
+            plan['Time'], data['Time'] = pd.to_datetime(plan['Time']), pd.to_datetime(data['Time'])
+        else:
+            saved = pd.DataFrame(Database(self._database).load_plan(),
+                                 columns=[column[0] for column in EXPECTED_TABLE_CONTENT['plan']])
+            saved['Time'] = pd.to_datetime(saved['Time'], format=TIME_FORMAT)
+            plan = saved[[column for column in saved.columns if column not in DATA_COLUMNS]]
+            data = saved[['Time', *DATA_COLUMNS]]
+
+        return PlanSnapshot(plan_version(data, plan), data, plan)
+
+    def _load_history(self, start_time: datetime, end_time: datetime) -> tuple[str, pd.DataFrame]:
+        """ Load the downsampled history of a time range from the source """
+        if self._source == 'api':
+            rollups = self._fetch(f"/rollups?start={start_time.isoformat()}&end={end_time.isoformat()}")
+            history = pd.DataFrame(rollups['columns'])
+            history['Time'] = pd.to_datetime(history['Time'])
+            return rollups['period'], history
+
+        return load_history(Database(self._database), start_time, end_time)
+
+
+def plan_version(data: pd.DataFrame, plan: pd.DataFrame) -> str:
+    """ Get the version of a plan and its data from their content
+
+    Args:
+        data: Input data to Planner
+        plan: Generated plan from Planner
+
+    Returns:
+        Hash of the content
+
+    """
+    digest = hashlib.blake2b(digest_size=8)
+
+    for frame in (data, plan):
+        digest.update(','.join(frame.columns).encode())
+        digest.update(pd.util.hash_pandas_object(frame.infer_objects(), index=False).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
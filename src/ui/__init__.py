@@ -1,2 +1,13 @@
 # pylint: skip-file
-from .application import Application
\ No newline at end of file
+from typing import TYPE_CHECKING
+from data.helperfunctions.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from .application import Application
+
+# Application is loaded lazily, so the headless service can use the Scheduler without Tk
+_EXPORTS = {
+    'Application': '.application',
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_import(__name__, _EXPORTS)
\ No newline at end of file
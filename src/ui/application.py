@@ -7,12 +7,15 @@ Date:
 """
 
 
+import time
 import tkinter as tk
 from tkinter import ttk
 
 from .scheduler import Scheduler
 from .tab_layout import TabLayout
 from database import Database
+from database.database import DEFAULT_SETTINGS
+from profiling import METRICS
 
 
 WIDTH = 800
@@ -20,8 +23,10 @@ HEIGHT = 480
 
 class Application(tk.Tk):
     """ Application Root """
-    def __init__(self, os: str):
+    def __init__(self, os: str, started: float | None = None):
         super().__init__()
+        self._started = started if started is not None else time.perf_counter()
+        self._first_frame_time: float | None = None
         self.title("HomeBatteryController")
         self.geometry(f"{WIDTH}x{HEIGHT}")
         self.resizable(False, False)
@@ -29,10 +34,18 @@ class Application(tk.Tk):
         self._settings = self._get_settings()
         self._scheduler = Scheduler(self, self._settings)
         self._tabs = TabLayout(self, self._settings, self._scheduler)
+        self._scheduler.start()
         self._style()
         self.protocol("WM_DELETE_WINDOW", self._quit)
         if os == 'posix':
             self.overrideredirect(True)
+        # Runs once the mainloop has drawn the window
+        self.after_idle(self._report_first_frame)
+
+    @property
+    def first_frame_time(self) -> float | None:
+        """ Get seconds from start of application until the first frame was drawn (None until drawn) """
+        return self._first_frame_time
 
     def update_ui(self, *args, section: str = '') -> None:
         """ Updates entire UI with new information or only specified section
@@ -43,17 +56,21 @@ class Application(tk.Tk):
 
         """
         if section == 'battery':
-            self._tabs.home_tab.update_battery_section(self._scheduler.battery)
+            self._tabs.home_tab.update_battery_section()
         elif section == 'action':
             self._tabs.home_tab.update_action_section(*args)
+        elif section == 'profit':
+            self._tabs.home_tab.update_profit_section()
         else:
+            # Only the labels that changed are written again
             self._tabs.home_tab.update_action_section(*args)
-            self._tabs.home_tab.update_profit_section(self._scheduler.data, self._scheduler.plan)
-            self._tabs.home_tab.update_battery_section(self._scheduler.battery)
-            self._tabs.home_tab.update_consumption_section(self._scheduler.data)
-            self._tabs.home_tab.update_data_section(self._scheduler.data)
-            self._tabs.home_tab.update_next_action(self._scheduler.plan)
-            
+            self._tabs.home_tab.refresh()
+
+    def _report_first_frame(self) -> None:
+        """ Measure the time from start of application until the first frame and record it in the metrics """
+        self.update_idletasks()
+        self._first_frame_time = time.perf_counter() - self._started
+        METRICS.observe('ui.first_frame', self._first_frame_time)
 
     def _init_database(self) -> None:
         """ Initialize Database and create tables if they don't exist """
@@ -73,25 +90,7 @@ class Application(tk.Tk):
         if not db.check_for_empty_table('settings'):
             return db.load_settings()
 
-        return {
-            'address': '',
-            'city': '',
-            'postal': '',
-            'country': '',
-            'price_area': 'DK1',
-            'solar_strategy': 'Sell All',
-            'solcast_key': '',
-            'solcast_ids': '',
-            'tariff_company': 'Radius Elnet A/S',
-            'provider': '',
-            'basis': '',
-            'prices': '',
-            'capacity': '20',
-            'effectivity': '90',
-            'threshold': '0',
-            'max_rate': '3',
-            'model': 'SmartBuy'
-        }
+        return dict(DEFAULT_SETTINGS)
     
     def _style(self) -> None:
         """ Application Style """
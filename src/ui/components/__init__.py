@@ -1,2 +1,2 @@
 # pylint: skip-file
-from .tabs import HomeTab, PlanTab, GraphsTab, ProfileTab
\ No newline at end of file
+from .tabs import HomeTab, PlanTab, GraphsTab, ProfileTab, LoggingTab
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Bar graph with persistent bars that are updated in place and drawn with blitting
+
+Date:
+    19-10-2026
+
+Example:
+    >>> graph = BarGraph(fig, 'Electricity Prices', 'Price (kr/kWh)', 0.5)
+    >>> graph.update(data['Time'], data['Price'])
+    >>> graph.show(fig.canvas)      # Full draw, as the layout changed
+    >>> graph.show(fig.canvas)      # Restores the saved background and only draws the bars
+
+"""
+
+import math
+import numpy as np
+import numpy.typing as npt
+
+from typing import Any
+from datetime import datetime
+from collections.abc import Sequence
+
+from matplotlib import ticker
+from matplotlib.figure import Figure
+
+
+MAX_HOURS = 24      # Graphs with more hours get narrow bars and small tick labels
+
+
+class BarGraph:
+    """ Class for a bar graph of hourly values """
+    def __init__(self, fig: Figure, title: str, ylabel: str, ytick: float):
+        self._ax = fig.add_subplot(label=title)
+        self._ax.set_visible(False)
+        self._ax.set_title(title)
+        self._ax.set_ylabel(ylabel)
+        self._ax.set_xlabel('Time (hour)')
+        self._ax.yaxis.set_major_locator(ticker.MultipleLocator(ytick))
+        self._ytick = ytick
+        self._bars: list[Any] = []
+        self._hours: list[int] = []
+        self._background: Any = None    # Rendered figure without the bars (None if the layout changed)
+
+    def __repr__(self):
+        return f"BarGraph(title={self._ax.get_title()}, bars={len(self._bars)})"
+
+    @property
+    def ax(self) -> Any:
+        """ Get the Axes of the graph """
+        return self._ax
+
+    @property
+    def heights(self) -> list[float]:
+        """ Get the height of every bar """
+        return [rectangle.get_height() for rectangle in self._bars]
+
+    @property
+    def needs_draw(self) -> bool:
+        """ Get whether the layout changed, so the next show must draw the full figure """
+        return self._background is None
+
+    def update(self, times: Sequence[datetime], values: Sequence[float]) -> None:
+        """ Update the bars in place (bars are only created again if the number of hours changed)
+
+        Args:
+            times: Start of every hour
+            values: Value of every hour
+
+        """
+        heights = np.asarray(values, dtype=float)
+        hours = [time.hour for time in times]
+
+        if len(hours) != len(self._bars):
+            for rectangle in self._bars:
+                rectangle.remove()
+            width = 0.5 if len(hours) > MAX_HOURS else 0.8
+            # Animated bars are left out of full draws, so the background can be saved without them
+            self._bars = list(self._ax.bar(range(len(hours)), heights, width=width, animated=True))
+            self._hours = []
+            self._background = None
+        else:
+            for rectangle, height in zip(self._bars, heights):
+                rectangle.set_height(height)
+
+        if hours != self._hours:
+            fontsize = 'x-small' if len(hours) > MAX_HOURS else 'medium'
+            self._ax.set_xticks(range(len(hours)), [str(hour) for hour in hours], fontsize=fontsize)
+            self._hours = hours
+            self._background = None
+
+        limits = y_limits(heights, self._ytick)
+        if limits != self._ax.get_ylim():
+            self._ax.set_ylim(*limits)
+            self._background = None
+
+    def set_visible(self, visible: bool) -> None:
+        """ Show or hide the graph (on the next draw) """
+        self._ax.set_visible(visible)
+
+    def show(self, canvas: Any) -> None:
+        """ Show the graph on a canvas.
+        The saved background is restored and only the bars are drawn, unless the layout changed.
+
+        Args:
+            canvas: Canvas of the figure
+
+        """
+        if self._background is None:
+            canvas.draw()   # Saves the background and draws the bars from the draw event
+            return
+
+        canvas.restore_region(self._background)
+        self.draw_bars()
+        canvas.blit(self._ax.figure.bbox)
+
+    def save_background(self, canvas: Any) -> None:
+        """ Save the rendered figure as background (should be called from the draw event of the canvas) """
+        self._background = canvas.copy_from_bbox(self._ax.figure.bbox)
+
+    def draw_bars(self) -> None:
+        """ Draw the animated bars on top of the rendered figure """
+        for rectangle in self._bars:
+            self._ax.draw_artist(rectangle)
+
+
+def y_limits(values: npt.NDArray[np.float64], tick: float) -> tuple[float, float]:
+    """ Get limits of the y-axis, rounded out to whole ticks, so small changes in values keep the layout
+
+    Args:
+        values: Heights of bars
+        tick: Distance between ticks
+
+    Returns:
+        Bottom and top of the y-axis (the bottom is 0 unless some values are negative)
+
+    """
+    finite = values[np.isfinite(values)]
+    low = float(finite.min()) if finite.size else 0.0
+    high = float(finite.max()) if finite.size else 0.0
+
+    bottom = math.floor(min(low, 0.0) / tick) * tick
+    top = max(math.ceil(high / tick) * tick, bottom + tick)
+    return (bottom, top)
@@ -0,0 +1,73 @@
+"""
+Line graph of a downsampled history series
+
+Date:
+    19-10-2026
+
+Example:
+    >>> graph = HistoryGraph(fig, 'Electricity Prices', 'Price (kr/kWh)')
+    >>> period, history = load_history(Database(), datetime(2023, 9, 3), datetime(2023, 10, 3))
+    >>> graph.update(history['Time'], history['Price'], period)
+    >>> graph.show(fig.canvas)
+
+"""
+
+import numpy as np
+
+from typing import Any
+from datetime import datetime
+from collections.abc import Sequence
+
+from matplotlib import dates
+from matplotlib.figure import Figure
+
+
+class HistoryGraph:
+    """ Class for a line graph of a history series, which is drawn again whenever it is shown """
+    def __init__(self, fig: Figure, title: str, ylabel: str):
+        self._ax = fig.add_subplot(label=f"{title} history")
+        self._ax.set_visible(False)
+        self._ax.set_title(title)
+        self._ax.set_ylabel(ylabel)
+        locator = dates.AutoDateLocator(maxticks=8)
+        self._ax.xaxis.set_major_locator(locator)
+        self._ax.xaxis.set_major_formatter(dates.ConciseDateFormatter(locator))
+        (self._line,) = self._ax.plot([], [], linewidth=1)
+        self._end: datetime | None = None
+
+    def __repr__(self):
+        return f"HistoryGraph(title={self._ax.get_title()}, points={len(self._line.get_xdata())})"
+
+    @property
+    def ax(self) -> Any:
+        """ Get the Axes of the graph """
+        return self._ax
+
+    @property
+    def end(self) -> datetime | None:
+        """ Get the end of the shown history (None if nothing is shown yet) """
+        return self._end
+
+    def update(self, times: Sequence[datetime], values: Sequence[float], period: str, end: datetime) -> None:
+        """ Update the line with a history
+
+        Args:
+            times: Start of every rollup
+            values: Value of every rollup
+            period: Rollup period of the history ('hour', 'day' or 'month')
+            end: End of the history range
+
+        """
+        self._line.set_data(list(times), np.asarray(values, dtype=float))
+        self._ax.set_xlabel(f"Time (per {period})")
+        self._ax.relim()
+        self._ax.autoscale_view()
+        self._end = end
+
+    def set_visible(self, visible: bool) -> None:
+        """ Show or hide the graph (on the next draw) """
+        self._ax.set_visible(visible)
+
+    def show(self, canvas: Any) -> None:
+        """ Show the graph on a canvas with a full draw """
+        canvas.draw()
@@ -2,4 +2,5 @@
 from .home_tab import HomeTab
 from .plan_tab import PlanTab
 from .graphs_tab import GraphsTab
-from .profile_tab import ProfileTab
\ No newline at end of file
+from .profile_tab import ProfileTab
+from .logging_tab import LoggingTab
\ No newline at end of file
@@ -7,13 +7,13 @@ Date:
 """
 
 import tkinter as tk
-import matplotlib.pyplot as plt
 
 from tkinter import ttk
-from matplotlib import ticker
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from typing import Any
+from datetime import datetime, timedelta
 
-from controller import Planner
+from database import Database
+from controller.history import load_history
 
 
 GRAPHS = (
@@ -23,43 +23,57 @@ GRAPHS = (
     'BatteryCap'
 )
 
+# Ranges of the hours of the current plan and of the history up to the current hour
+PLAN = 'Plan'
+HISTORY_RANGES = {
+    'Week': timedelta(days=7),
+    'Month': timedelta(days=30),
+    'Year': timedelta(days=365)
+}
+
 class GraphsTab(ttk.Frame):
     """ Class for the Graphs Tab """
-    def __init__(self, parent: ttk.Notebook, planner: Planner):
+    def __init__(self, parent: ttk.Notebook, scheduler):
         super().__init__(parent)
 
         # CREATE VARIABLES
-        self._data, self._plan = planner.data, planner.plan
+        self._scheduler = scheduler
         self._current_graph = tk.StringVar(value=GRAPHS[0])
         self._current_graph.trace_add('write', self._plot_graph)
-        self._graph_content = {
+        self._current_range = tk.StringVar(value=PLAN)
+        self._current_range.trace_add('write', self._plot_graph)
+        self._graph_content: dict[str, dict[str, Any]] = {
             GRAPHS[0]: {
                 'df': 'data',
                 'column': "Price", 
                 'title': 'Electricity Prices',
                 'ylabel': 'Price (kr/kWh)',
-                'ytick': 0.5
+                'ytick': 0.5,
+                'history': ('Price', 'Electricity Prices', 'Price (kr/kWh)')
             },
             GRAPHS[1]: {
                 'df': 'data',
                 'column': "ExpectedConsumption",
                 'title': 'Household Consumption Expectancy',
                 'ylabel': 'Consumption (kWh)',
-                'ytick': 0.2
+                'ytick': 0.2,
+                'history': ('Consumption', 'Household Consumption', 'Consumption (kWh)')
             },
             GRAPHS[2]: {
                 'df': 'data',
                 'column': "Power",
                 'title': 'Expected Production Of Solar Panels',
                 'ylabel': 'Power (kWh)',
-                'ytick': 0.1
+                'ytick': 0.1,
+                'history': ('Solar', 'Production Of Solar Panels', 'Power (kWh)')
             },
             GRAPHS[3]: {
                 'df': 'plan',
                 'column': "BatteryExpected",
                 'title': 'Battery Capacity Expectancy',
                 'ylabel': 'Capacity (kWh)',
-                'ytick': 0.5
+                'ytick': 0.5,
+                'history': ('Soc', 'Battery State Of Charge', 'State of charge (%)')
             }
         }
 
@@ -71,46 +85,132 @@ class GraphsTab(ttk.Frame):
                                              width=17, values=GRAPHS,
                                              textvariable=self._current_graph,
                                              takefocus=False)
-        
-        # CREATE GRAPH
-        self._fig, self._ax = plt.subplots(figsize=(7, 4.5))
-        self._graph_canvas = FigureCanvasTkAgg(self._fig, self)
-        
+        self._ranges_dropdown = ttk.Combobox(self, state='readonly',
+                                             width=17, values=[PLAN, *HISTORY_RANGES],
+                                             textvariable=self._current_range,
+                                             takefocus=False)
+
+        # GRAPHS ARE CREATED WHEN THE TAB IS FIRST SHOWN, SO MATPLOTLIB IS NOT IMPORTED AT STARTUP
+        self._fig: Any = None
+        self._graph_canvas: Any = None
+        self._graphs: dict[str, Any] = {}    # Persistent BarGraph of every graph, created when first shown
+        self._stale: set[str] = set()        # Graphs with bars from an older plan
+        self._histories: dict[tuple[str, str], Any] = {}   # HistoryGraph of every graph and range
+        self.bind('<Map>', self._create_graph)
+        scheduler.subscribe(self._plan_updated)
+
         # INIT FUNCTIONS
         self._place_components()
+
+
+    def _create_graph(self, *args) -> None: # pylint: disable=unused-argument
+        """ Callback for creating the graph canvas the first time the tab is shown
+        (and for updating the shown graph if a new plan or hour came while the tab was hidden)
+
+        """
+        if self._graph_canvas is not None:
+            if self._current_graph.get() in self._stale or self._current_range.get() != PLAN:
+                self._plot_graph()
+            return
+
+        # pylint: disable=import-outside-toplevel
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self._fig = plt.figure(figsize=(7, 4.5))
+        self._graph_canvas = FigureCanvasTkAgg(self._fig, self)
+        # Every full draw (also when Tk redraws the canvas) saves the background of the shown graph
+        self._graph_canvas.mpl_connect('draw_event', self._on_draw)
+        # Canvas to hold graphs
+        self._graph_canvas.get_tk_widget().grid(row=0, column=1, rowspan=3, columnspan=3)
         self._plot_graph()
 
 
     def _plot_graph(self, *args) -> None: # pylint: disable=unused-argument
-        """ Callback for plotting the correct graph based on current entry value """
-        self._ax.clear()
-
-        # Same x-axis used on every graph
-        df_time = self._data.loc[:, "Time"]
-        x_length = len(df_time)
-        x_range = range(x_length)
-        time_in_hours = [time.hour for time in df_time]
-        self._ax.set_xlabel('Time (hour)')
-
-        if x_length > 24:
-            self._ax.set_xticks(x_range, time_in_hours, fontsize='x-small')
-            width = 0.5
-        else:
-            self._ax.set_xticks(x_range, time_in_hours)
-            width = 0.8
+        """ Callback for showing the correct graph based on current entry value.
+        Graphs keep their bars and background, so an unchanged graph is shown by blitting alone.
+
+        """
+        if self._graph_canvas is None:
+            return
 
         current_graph = self._current_graph.get()
-        if self._graph_content[current_graph]['df'] == 'plan':
-            y = self._plan.loc[:, self._graph_content[current_graph]['column']]  
-        else:
-            y = self._data.loc[:, self._graph_content[current_graph]['column']]
+        if self._current_range.get() != PLAN:
+            self._plot_history(current_graph, self._current_range.get())
+            return
+
+        graph = self._graphs.get(current_graph)
+
+        if graph is None:
+            from ui.components.bar_graph import BarGraph # pylint: disable=import-outside-toplevel
+            content = self._graph_content[current_graph]
+            graph = BarGraph(self._fig, content['title'], content['ylabel'], content['ytick'])
+            self._graphs[current_graph] = graph
+            self._stale.add(current_graph)
+
+        if current_graph in self._stale:
+            # Same x-axis used on every graph
+            content = self._graph_content[current_graph]
+            graph.update(self._scheduler.data['Time'], getattr(self._scheduler, content['df'])[content['column']])
+            self._stale.discard(current_graph)
 
-        self._ax.bar(x_range, y, width=width)
-        self._ax.yaxis.set_major_locator(ticker.MultipleLocator(
-                                         self._graph_content[current_graph]['ytick'])) # type: ignore
-        self._ax.set_title(self._graph_content[current_graph]['title'])
-        self._ax.set_ylabel(self._graph_content[current_graph]['ylabel'])
-        self._graph_canvas.draw()
+        # The background of a graph is saved with only that graph visible, so restoring it hides the others
+        self._hide_graphs()
+        graph.set_visible(True)
+        graph.show(self._graph_canvas)
+
+
+    def _plot_history(self, current_graph: str, current_range: str) -> None:
+        """ Show the history of a graph up to the current hour, which is loaded again once the hour has passed
+
+        Args:
+            current_graph: Name of graph
+            current_range: Name of range
+
+        """
+        column, title, ylabel = self._graph_content[current_graph]['history']
+        graph = self._histories.get((current_graph, current_range))
+
+        if graph is None:
+            from ui.components.history_graph import HistoryGraph # pylint: disable=import-outside-toplevel
+            graph = HistoryGraph(self._fig, title, ylabel)
+            self._histories[(current_graph, current_range)] = graph
+
+        end_time = datetime.now().replace(minute=0, second=0, microsecond=0)
+        if graph.end != end_time:
+            # Served from the rollups of the range and downsampled, so a year is as light as a week
+            period, history = load_history(Database(), end_time - HISTORY_RANGES[current_range], end_time)
+            graph.update(history['Time'], history[column], period, end_time)
+
+        self._hide_graphs()
+        graph.set_visible(True)
+        graph.show(self._graph_canvas)
+
+
+    def _hide_graphs(self) -> None:
+        """ Hide every graph (on the next draw) """
+        for graph in [*self._graphs.values(), *self._histories.values()]:
+            graph.set_visible(False)
+
+
+    def _on_draw(self, *args) -> None: # pylint: disable=unused-argument
+        """ Callback for full draws of the canvas, saving the background and drawing the bars of the shown graph """
+        if self._current_range.get() != PLAN:
+            return
+
+        graph = self._graphs.get(self._current_graph.get())
+
+        if graph is not None:
+            graph.save_background(self._graph_canvas)
+            graph.draw_bars()
+
+
+    def _plan_updated(self) -> None:
+        """ Callback for new plans from the Scheduler. Bars of hidden graphs are updated once they are shown. """
+        self._stale = set(self._graphs)
+
+        if self._graph_canvas is not None and self.winfo_ismapped():
+            self._plot_graph()
 
 
     def _place_components(self) -> None:
@@ -120,6 +220,4 @@ class GraphsTab(ttk.Frame):
 
         # ROW 1, COLUMN 1
         self._graphs_dropdown.grid(row=0, column=0, sticky=f'{tk.W}{tk.N}', padx=5, pady=40)
-
-        # Canvas to hold graphs
-        self._graph_canvas.get_tk_widget().grid(row=0, column=1, rowspan=3, columnspan=3)
+        self._ranges_dropdown.grid(row=0, column=0, sticky=f'{tk.W}{tk.N}', padx=5, pady=70)
@@ -6,14 +6,14 @@ Date:
 
 """
 
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
+from typing import Any
+from datetime import datetime, timedelta
 
 import ui.helperfunctions as hf
-from data import Battery
 from ui.post_processing import Profit
+from ui.view_model import ViewModel
 
 
 STATE_OF_CHARGE = 0.87
@@ -24,7 +24,11 @@ class HomeTab(ttk.Frame):
         super().__init__(parent)
 
         # CREATE VARIABLES
+        self._scheduler = scheduler
         self._current_action = tk.StringVar()
+        self._view = ViewModel()                    # Displayed text of every label
+        self._profit_key: tuple[Any, ...] = ()      # Plan version and totals the profit was calculated for
+        self._profit_texts: dict[str, str] = {}
     
         # CREATE SEPARATORS
         self._vertical_separator = ttk.Separator(self, orient='vertical')
@@ -82,59 +86,108 @@ class HomeTab(ttk.Frame):
         self._place_data_section()
         self._place_trigger_section()
 
+        self._texts = {
+            'current_profit': self._current_profit_text,
+            'expected_profit': self._expected_profit_text,
+            'total_profit': self._total_profit_text,
+            'soc': self._soc_text,
+            'expected_consumption': self._expected_consumption_text,
+            'current_consumption': self._current_consumption_text,
+            'current_elprice': self._current_elprice_text,
+            'current_spotprice': self._current_spotprice_text,
+            'current_solpower': self._current_solpower_text,
+            'next_action': self._next_action_text,
+        }
+
         # RUN UPDATES ON INIT
         self.update_action_section(scheduler.plan['Action'].iloc[0], scheduler.plan['ActionReason'].iloc[0])
-        self.update_profit_section(scheduler.data, scheduler.plan)
-        self.update_battery_section(scheduler.battery)
-        self.update_consumption_section(scheduler.data)
-        self.update_data_section(scheduler.data)
-        self.update_time(scheduler)
-        self.update_next_action(scheduler.plan)
+        self.refresh()
+        self.update_time()
+        scheduler.subscribe(self.refresh)
+
+
+    def refresh(self) -> None:
+        """ Update every section from the Scheduler, only writing the labels that changed """
+        self._show({**self._profit_labels(), **self._battery_labels(), **self._consumption_labels(),
+                    **self._data_labels(), **self._next_action_labels()})
 
 
     def update_action_section(self, action: str, action_reason: str) -> None:
         """ Update the Action and ActionReason labels """
-        self._set_action_label(action)
-        self._reason_label['text'] = action_reason
+        if self._view.diff({'action': (action, action_reason)}, partial=True):
+            self._set_action_label(action)
+            self._reason_label['text'] = action_reason
 
 
-    def update_profit_section(self, data: pd.DataFrame, plan: pd.DataFrame) -> None:
-        """ Update the profit section """
-        profit = Profit(data, plan) # TODO: Temporary
-        hf.write_text(self._current_profit_text, "0.0 kr")
-        hf.write_text(self._expected_profit_text, f"{profit.expected_profit} kr")
-        hf.write_text(self._total_profit_text, "0.0 kr")
-        
+    def update_profit_section(self) -> None:
+        """ Update the profit section with the expected profit and the precomputed realized profit """
+        self._show(self._profit_labels())
+
 
-    def update_battery_section(self, battery: Battery) -> None:
+    def update_battery_section(self) -> None:
         """ Update the battery section """
-        hf.write_text(self._soc_text, f"{round(battery.soc*100, 1)} %")
+        self._show(self._battery_labels())
 
 
-    def update_consumption_section(self, data: pd.DataFrame) -> None:
-        """ Update the consumption section """
-        hf.write_text(self._expected_consumption_text, f"{data.at[0, 'ExpectedConsumption']} kWh")
-        hf.write_text(self._current_consumption_text, "0 kWh")
+    def update_time(self) -> None:
+        """ Updates time_text with current time and wakes up again at the next whole minute """
+        current_time = datetime.now()
+        hf.write_text(self._time_text, current_time.strftime("%H:%M"))
+        next_minute = current_time.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        self.after(int((next_minute - current_time).total_seconds() * 1000) + 1, self.update_time)
 
 
-    def update_data_section(self, data: pd.DataFrame) -> None:
-        """ Update the data section """
-        hf.write_text(self._current_elprice_text, f"{data.at[0, 'Price']} kr/kWh")
-        hf.write_text(self._current_spotprice_text, f"{data.at[0, 'SpotPrice']} kr/kWh")
-        hf.write_text(self._current_solpower_text, f"{round(data.at[0, 'Power'], 4)} kWh")
+    def _show(self, labels: dict[str, str]) -> None:
+        """ Write the labels that changed since they were last shown
 
+        Args:
+            labels: Text of labels, keyed by name
 
-    def update_time(self, scheduler) -> None:
-        """ Updates time_text with current time """
-        current_time = datetime.now()
-        hf.write_text(self._time_text, current_time.strftime("%H:%M"))
-        scheduler.clock_it(current_time)
-        self.after(10000, self.update_time, scheduler)
+        """
+        diff = self._view.diff(labels, partial=True)
+
+        for name, text in diff.changed + [(name, text) for _, name, text in diff.inserted]:
+            hf.write_text(self._texts[name], text)
+
+
+    def _profit_labels(self) -> dict[str, str]:
+        """ Get the labels of the profit section (Profit is only calculated again for a new plan or new totals) """
+        scheduler = self._scheduler
+        key = (scheduler.plan_version, tuple(scheduler.profit_totals.values()))
+
+        if key != self._profit_key:
+            self._profit_key = key
+            profit = Profit(scheduler.data, scheduler.plan, scheduler.profit_totals)
+            self._profit_texts = {'current_profit': f"{profit.current_profit} kr",
+                                  'expected_profit': f"{profit.expected_profit} kr",
+                                  'total_profit': f"{profit.calculate_total_profit()} kr"}
+
+        return self._profit_texts
+
+
+    def _battery_labels(self) -> dict[str, str]:
+        """ Get the labels of the battery section """
+        return {'soc': f"{round(self._scheduler.battery.soc*100, 1)} %"}
+
+
+    def _consumption_labels(self) -> dict[str, str]:
+        """ Get the labels of the consumption section """
+        data = self._scheduler.data
+        return {'expected_consumption': f"{data.at[0, 'ExpectedConsumption']} kWh",
+                'current_consumption': "0 kWh"}
+
+
+    def _data_labels(self) -> dict[str, str]:
+        """ Get the labels of the data section """
+        data = self._scheduler.data
+        return {'current_elprice': f"{data.at[0, 'Price']} kr/kWh",
+                'current_spotprice': f"{data.at[0, 'SpotPrice']} kr/kWh",
+                'current_solpower': f"{round(data.at[0, 'Power'], 4)} kWh"}
 
 
-    def update_next_action(self, plan: pd.DataFrame) -> None:
-        """ Updates next_action_text with time for next planned action """
-        hf.write_text(self._next_action_text, plan.at[1, 'Time'].strftime("%H:%M"))
+    def _next_action_labels(self) -> dict[str, str]:
+        """ Get the label with time for next planned action """
+        return {'next_action': self._scheduler.plan.at[1, 'Time'].strftime("%H:%M")}
 
 
     def _place_separators(self) -> None:
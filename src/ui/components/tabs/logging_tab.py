@@ -0,0 +1,92 @@
+"""
+GUI Logging Tab with the timers and counters of data collection, planning and actuation
+
+Date:
+    19-10-2026
+
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from profiling import METRICS, METRICS_FILE
+from ui.view_model import ViewModel, metric_rows
+
+
+REFRESH_INTERVAL = 5000     # Milliseconds between every refresh while the tab is shown
+COLUMNS = {
+    "Name": 160,
+    "Count": 50,
+    "Mean (ms)": 60,
+    "P50 (ms)": 60,
+    "P95 (ms)": 60,
+    "Max (ms)": 60
+}
+
+class LoggingTab(ttk.Frame):
+    """ Class for the Logging Tab """
+    def __init__(self, parent: ttk.Notebook):
+        super().__init__(parent)
+        self._view = ViewModel()
+        self._refresh_id = ''
+        self._metrics_view = ttk.Treeview(self, takefocus=False, selectmode='none')
+        self._metrics_view['columns'] = tuple(COLUMNS)
+        self._metrics_view.column("#0", width=0, stretch=False)
+
+        for column, width in COLUMNS.items():
+            self._metrics_view.column(column, anchor=tk.W, width=width)
+            self._metrics_view.heading(column, text=column, anchor=tk.W)
+
+        self._export_label = ttk.Label(self, text="", font=('Calibri', 10))
+        self._export_button = ttk.Button(self, text="Export", takefocus=False, command=self._export)
+
+        self._metrics_view.bind('<Motion>', 'break')
+        # Only refreshed while shown
+        self.bind('<Map>', self._refresh)
+        self.bind('<Unmap>', self._stop_refresh)
+
+        # INIT FUNCTIONS
+        self._place_components()
+
+
+    def _refresh(self, *args) -> None: # pylint: disable=unused-argument
+        """ Callback for refreshing the metrics view, which refreshes itself until the tab is hidden.
+        Only the metrics that changed since the last refresh are touched.
+
+        """
+        diff = self._view.diff(metric_rows(METRICS.snapshot()))
+
+        for name in diff.removed:
+            self._metrics_view.delete(name)
+
+        for name, values in diff.changed:
+            self._metrics_view.item(name, values=values)
+
+        for position, name, values in diff.inserted:
+            self._metrics_view.insert('', position, iid=name, values=values)
+
+        self._stop_refresh()
+        self._refresh_id = self.after(REFRESH_INTERVAL, self._refresh)
+
+
+    def _stop_refresh(self, *args) -> None: # pylint: disable=unused-argument
+        """ Callback for stopping the refreshes when the tab is hidden """
+        if self._refresh_id:
+            self.after_cancel(self._refresh_id)
+            self._refresh_id = ''
+
+
+    def _export(self) -> None:
+        """ Callback for exporting the metrics to a file """
+        try:
+            METRICS.export(METRICS_FILE)
+            self._export_label.config(text=f"Exported to {METRICS_FILE}")
+        except OSError as error:
+            self._export_label.config(text=f"Export failed: {error.strerror}")
+
+
+    def _place_components(self) -> None:
+        """ Place UI components related to Logging Tab """
+        self._metrics_view.pack(expand=True, fill='both')
+        self._export_button.pack(side=tk.RIGHT, padx=5, pady=5)
+        self._export_label.pack(side=tk.RIGHT, padx=5, pady=5)
@@ -6,18 +6,18 @@ Date:
 
 """
 
-from datetime import timedelta
 import pandas as pd
 import tkinter as tk
 from tkinter import ttk
 
-from controller import Planner
+from ui.view_model import ViewModel, plan_rows
 
 
 class PlanTab(ttk.Frame):
     """ Class for the Plan Tab """
-    def __init__(self, parent: ttk.Notebook, planner: Planner):
+    def __init__(self, parent: ttk.Notebook, scheduler):
         super().__init__(parent)
+        self._view = ViewModel()
         self._plan_view = ttk.Treeview(self, takefocus=False, selectmode='none')
         self._plan_view['columns'] = ("Action", "Start", "End", "Reason")
         self._plan_view.column("#0", width=0, stretch=False)
@@ -29,10 +29,11 @@ class PlanTab(ttk.Frame):
         self._plan_view.heading("Start", text="Start", anchor=tk.W)
         self._plan_view.heading("End", text="End", anchor=tk.W)
         self._plan_view.heading("Reason", text="Reason", anchor=tk.W)
-        self._fill_plan_view(planner.plan)
+        self._fill_plan_view(scheduler.plan)
 
         self._plan_view.bind('<Motion>', 'break')
         self._plan_view.pack(expand=True, fill='both')
+        scheduler.subscribe(lambda: self.update_plan(scheduler.plan))
 
 
     def update_plan(self, plan: pd.DataFrame) -> None:
@@ -46,20 +47,21 @@ class PlanTab(ttk.Frame):
 
 
     def _fill_plan_view(self, plan: pd.DataFrame) -> None:
-        """ Fills the Plan treeview with actions, timestamps and reasons
+        """ Fills the Plan treeview with actions, timestamps and reasons.
+        Only the hours that changed since the displayed plan are touched.
 
         Args:
             plan: Generated plan from Controller
 
         """
-        plan_length = plan.index.values.size
-
-        for row in range(0, plan_length):
-            start_time = plan.at[row, 'Time']
-            end_time = plan.at[row, 'Time'] + timedelta(hours=1)
-            
-            action = (f'{plan.at[row, "Action"]}',
-                      f'{start_time}',
-                      f'{end_time}',
-                      f'{plan.at[row, "ActionReason"]}')
-            self._plan_view.insert('', tk.END, values=action)
+        diff = self._view.diff(plan_rows(plan))
+
+        for start in diff.removed:
+            self._plan_view.delete(start)
+
+        for start, action in diff.changed:
+            self._plan_view.item(start, values=action)
+
+        # Hours are keyed by start, and are inserted in order, so every position is right once inserted
+        for position, start, action in diff.inserted:
+            self._plan_view.insert('', position, iid=start, values=action)
@@ -9,7 +9,6 @@ Date:
 import tkinter as tk
 from tkinter import ttk
 
-from .geolocator import GeoLocator
 from .danish_regions import DANISH_REGIONS
 from .solar_panels_top import SolarPanelsTop
 from .supplement_top import SupplementTop
@@ -182,6 +181,8 @@ class ProfileTab(ttk.Frame):
         country = self._country_var.get()
 
         if address and city and postal and country:
+            # geopy is slow to import and only needed when settings are applied
+            from .geolocator import GeoLocator  # pylint: disable=import-outside-toplevel
             geolocator = GeoLocator(address, city, postal, country)
             region = geolocator.locate('region')
 
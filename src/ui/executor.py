@@ -0,0 +1,250 @@
+"""
+Executor with separate lanes for I/O-bound, CPU-bound and real-time tasks
+
+Date:
+    19-10-2026
+
+"""
+
+import itertools
+import threading
+import multiprocessing
+
+from enum import unique, StrEnum
+from queue import PriorityQueue
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from concurrent.futures import Executor as PoolExecutor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+
+@unique
+class Lane(StrEnum):
+    """ Enum for the lanes a task can run in """
+    IO = "io"               # Fetching data from the Internet
+    CPU = "cpu"             # Planning in a separate process
+    REALTIME = "realtime"   # Communication with the battery system
+
+
+class Task:
+    """ Class for a task submitted to the Executor """
+    def __init__(self, name: str, lane: Lane, deadline: datetime | None, drop_if_late: bool, # pylint: disable=too-many-arguments
+                 function: Callable[..., Any], args: tuple[Any, ...]):
+        self._name = name
+        self._lane = lane
+        self._deadline = deadline
+        self._drop_if_late = drop_if_late
+        self._function = function
+        self._args = args
+        self._future: Future = Future() # type: ignore
+        self._missed_deadline = False
+
+    def __repr__(self):
+        return f"Task(name={self._name}, lane={self._lane}, deadline={self._deadline})"
+
+    @property
+    def name(self) -> str:
+        """ Get name of Task """
+        return self._name
+
+    @property
+    def lane(self) -> Lane:
+        """ Get lane of Task """
+        return self._lane
+
+    @property
+    def deadline(self) -> datetime | None:
+        """ Get deadline of Task """
+        return self._deadline
+
+    @property
+    def drop_if_late(self) -> bool:
+        """ Get whether Task should be dropped if its deadline passed while queued """
+        return self._drop_if_late
+
+    @property
+    def function(self) -> Callable[..., Any]:
+        """ Get function run by Task """
+        return self._function
+
+    @property
+    def args(self) -> tuple[Any, ...]:
+        """ Get arguments for function run by Task """
+        return self._args
+
+    @property
+    def future(self) -> Future: # type: ignore
+        """ Get future holding the result of Task """
+        return self._future
+
+    @property
+    def missed_deadline(self) -> bool:
+        """ Get whether Task finished (or was dropped) after its deadline """
+        return self._missed_deadline
+
+    def mark_missed_deadline(self) -> None:
+        """ Mark that Task finished (or was dropped) after its deadline """
+        self._missed_deadline = True
+
+    def cancel(self) -> bool:
+        """ Cancel Task if it has not started yet
+
+        Returns:
+            True/False if Task was cancelled or not
+
+        """
+        return self._future.cancel()
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    """ Class for ordering queued tasks by priority, deadline and submission order """
+    priority: int
+    deadline: datetime
+    sequence: int
+    task: Task | None = field(compare=False)
+
+
+class _LaneExecutor:
+    """ Class for running the tasks of a single lane in order of priority """
+    def __init__(self, lane: Lane, pool: PoolExecutor, max_workers: int):
+        self._lane = lane
+        self._pool = pool
+        self._queue: PriorityQueue[_QueuedTask] = PriorityQueue()
+        self._slots = threading.Semaphore(max_workers)
+        self._sequence = itertools.count()
+        self._stats_lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'missed': 0}
+        self._dispatcher = threading.Thread(target=self._dispatch, name=f"executor-{lane}", daemon=True)
+        self._dispatcher.start()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """ Get task statistics of lane """
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def submit(self, task: Task, priority: int) -> None:
+        """ Queue a task in lane
+
+        Args:
+            task: The task to queue
+            priority: Priority of task (lowest runs first)
+
+        """
+        self._count('submitted')
+        deadline = task.deadline if task.deadline is not None else datetime.max
+        self._queue.put(_QueuedTask(priority, deadline, next(self._sequence), task))
+
+    def shutdown(self) -> None:
+        """ Stop dispatching and cancel queued tasks """
+        self._queue.put(_QueuedTask(-1, datetime.min, -1, None))
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self) -> None:
+        """ Dispatch queued tasks to the pool whenever a worker is free """
+        while True:
+            self._slots.acquire() # pylint: disable=consider-using-with
+            task = self._queue.get().task
+
+            if task is None:
+                self._cancel_queued()
+                return
+
+            if not task.future.set_running_or_notify_cancel():
+                self._count('cancelled')
+                self._slots.release()
+                continue
+
+            if task.drop_if_late and task.deadline is not None and datetime.now() > task.deadline:
+                # Result would be useless, so do not even start the task
+                task.mark_missed_deadline()
+                self._count('missed')
+                task.future.set_exception(TimeoutError(f"{task.name} dropped after deadline {task.deadline}"))
+                self._slots.release()
+                continue
+
+            try:
+                future = self._pool.submit(task.function, *task.args)
+            except RuntimeError as exc:     # Pool has been shut down
+                task.future.set_exception(exc)
+                self._slots.release()
+                continue
+            future.add_done_callback(lambda future, task=task: self._finish(task, future)) # type: ignore
+
+    def _finish(self, task: Task, future: Future) -> None: # type: ignore
+        """ Pass the result of a finished pool future on to the task """
+        self._slots.release()
+
+        if task.deadline is not None and datetime.now() > task.deadline:
+            task.mark_missed_deadline()
+            self._count('missed')
+
+        if future.cancelled():
+            self._count('cancelled')
+            task.future.set_exception(RuntimeError(f"{task.name} was cancelled by shutdown"))
+        elif future.exception() is not None:
+            self._count('failed')
+            task.future.set_exception(future.exception()) # type: ignore
+        else:
+            self._count('completed')
+            task.future.set_result(future.result())
+
+    def _cancel_queued(self) -> None:
+        """ Cancel all tasks that are still queued """
+        while not self._queue.empty():
+            task = self._queue.get().task
+            if task is not None and task.cancel():
+                self._count('cancelled')
+
+    def _count(self, stat: str) -> None:
+        """ Increment a task statistic """
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+
+class Executor:
+    """ Class for running tasks in separate I/O, CPU and real-time lanes """
+    def __init__(self, io_workers: int = 2, cpu_workers: int = 1,
+                 cpu_initializer: Callable[[], None] | None = None):
+        self._lanes = {
+            Lane.IO: _LaneExecutor(Lane.IO, ThreadPoolExecutor(max_workers=io_workers,
+                                                               thread_name_prefix='io'), io_workers),
+            # Spawn instead of fork, since forking a process with Tk and threads is unsafe
+            Lane.CPU: _LaneExecutor(Lane.CPU, ProcessPoolExecutor(max_workers=cpu_workers,
+                                                                  mp_context=multiprocessing.get_context('spawn'),
+                                                                  initializer=cpu_initializer), cpu_workers),
+            Lane.REALTIME: _LaneExecutor(Lane.REALTIME, ThreadPoolExecutor(max_workers=1,
+                                                                           thread_name_prefix='realtime'), 1),
+        }
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        """ Get task statistics for every lane """
+        return {str(lane): lane_executor.stats for lane, lane_executor in self._lanes.items()}
+
+    def submit(self, lane: Lane, function: Callable[..., Any], *args: Any, name: str = '',
+               priority: int = 0, deadline: datetime | None = None, drop_if_late: bool = False) -> Task:
+        """ Submit a task to a lane
+
+        Args:
+            lane: The lane to run the task in
+            function: The function to run (must be picklable for the CPU lane)
+            args: Arguments for the function
+            name: Name of task
+            priority: Priority of task within lane (lowest runs first)
+            deadline: Time the task should be finished by
+            drop_if_late: Do not start the task if its deadline has passed while queued
+
+        Returns:
+            Handle for the submitted task
+
+        """
+        task = Task(name or function.__name__, lane, deadline, drop_if_late, function, args)
+        self._lanes[lane].submit(task, priority)
+        return task
+
+    def shutdown(self) -> None:
+        """ Shutdown every lane and cancel queued tasks """
+        for lane_executor in self._lanes.values():
+            lane_executor.shutdown()
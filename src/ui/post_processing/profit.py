@@ -9,12 +9,15 @@ Date:
 
 import pandas as pd
 
+from controller.accounting import hourly_costs
+
 
 class Profit:
     """ Class for calculating system profit """
-    def __init__(self, data: pd.DataFrame, plan: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, plan: pd.DataFrame, totals: dict[str, float] | None = None):
         self._data = data
         self._plan = plan
+        self._totals = totals if totals is not None else {}  # Realized profit accounted in database
 
     @property
     def current_profit(self) -> float:
@@ -27,15 +30,13 @@ class Profit:
         return self._calculate_expected_profit(self._data, self._plan)
     
     def calculate_total_profit(self) -> float:
-        """ Calculate total profit """
-        # TODO
-        return 0.0
+        """ Calculate total profit (realized since the system was started) """
+        return self._totals.get('total', 0.0)
 
 
     def _calculate_current_profit(self, data: pd.DataFrame, plan: pd.DataFrame) -> float:
-        """ Calculate current profit """
-        # TODO
-        return 0.0
+        """ Calculate current profit (realized today) """
+        return self._totals.get('today', 0.0)
 
 
     def _calculate_expected_profit(self, data: pd.DataFrame, plan: pd.DataFrame) -> float:
@@ -49,26 +50,6 @@ class Profit:
             Profit for current action and hour in comparison to NormalBuy
 
         """
-        action = plan.at[0, "Action"]
-        normal_buy = data.at[0, "ExpectedConsumption"] * data.at[0, "Price"]
-        smart_buy = 0
-
-        if action == 'idle':
-            if plan.at[0, "SolarSurplus"] > 0:
-                if not data.at[0, "SpotPrice"] <= 0:
-                    smart_buy = data.at[0, "SpotPrice"] * plan.at[0, "SolarSurplus"]
-            elif plan.at[0, "SolarSurplus"] < 0:
-                smart_buy = data.at[0, "Price"] * abs(plan.at[0, "SolarSurplus"])
-
-        elif action == 'charge':
-            if plan.at[0, "SolarSurplus"] < 0:
-                smart_buy = data.at[0, "Price"] * abs(plan.at[0, "SolarSurplus"])
-                smart_buy += data.at[0, "Price"] * plan.at[0, "ElNetCharge"]
-            elif plan.at[0, "SolarSurplus"] >= 0 and plan.at[0, "SolarSurplus"] < 3:
-                smart_buy = data.at[0, "Price"] * plan.at[0, "ElNetCharge"]
-            elif plan.at[0, "SolarSurplus"] > 3:
-                if not data.at[0, "SpotPrice"] <= 0:
-                    smart_buy = data.at[0, "SpotPrice"] * (plan.at[0, "SolarSurplus"] - 3)
-
-        return float(round(normal_buy - smart_buy, 2))
-    
\ No newline at end of file
+        costs = hourly_costs(data.iloc[:1], plan.iloc[:1])
+
+        return float(round(costs.at[0, "NormalBuy"] - costs.at[0, "SmartBuy"], 2))
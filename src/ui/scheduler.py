@@ -6,85 +6,161 @@ Date:
 
 """
 
+import queue
+import heapq
 import pandas as pd
 
-from typing import Any
+from typing import Any, Callable
 from copy import deepcopy
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import Future
 
 from data import get_battery, Battery
 from controller import Planner, ActionReason
+from controller.collector import Collector
+from controller import plan_worker
+from controller.prefetch import Prefetcher, SourceStatus, next_prefetch_time
+from controller.realized_profit import track_profit, load_profit_totals
+from controller.history import rollup_history
+from controller.forecasting import load_consumption_forecaster, train_consumption_forecaster, \
+                                  load_solar_corrector, train_solar_corrector
 from database import Database
+from database.database import EXPECTED_TABLE_CONTENT, TIME_FORMAT, DATA_COLUMNS
+from profiling import METRICS, METRICS_FILE, count
+from .executor import Executor, Lane
 
 
 # Max Capacity (cap), BatteryExpected (exp)
 expected_soc = lambda cap, exp : round((exp * 100 / cap), 4)   # TODO: Make sure Application
                                                                #       can't set cap to 0 
 
+# Timers due at the same time run in order of priority (lowest first)
+TASK_PRIORITY = {
+    'action': 0,
+    'planner': 1,
+    'monitor': 2,
+    'prefetch': 3,
+}
+PLANNER_LEAD_TIME = timedelta(minutes=2)    # Planner runs at XX:58:00
+MONITOR_INTERVAL = timedelta(minutes=1)     # Monitor runs every XX:XX:00
+MEASUREMENT_BATCH_SIZE = 15                 # Monitor measurements are written to database every 15 minutes
+RAW_RETENTION = timedelta(days=7)           # Every measurement is kept for a week ...
+HOURLY_RETENTION = timedelta(days=730)      # ... and hourly measurements for two years
+COMPLETION_POLL_MS = 50                     # Finished tasks are handed to the UI thread every 50 ms (while any run)
+PLANNER_RETRY = timedelta(minutes=5)        # A failed Planner is retried after 5 minutes
+
 class Scheduler:
     """ Class for scheduling tasks in application """
-    def __init__(self, app: Any, settings: dict[str, Any]):
+    def __init__(self, app: Any, settings: dict[str, Any], fast_startup: bool = True):
         self._app = app
         self._settings = self._transform_settings(settings)
-        self._planner = Planner(self._settings)
+        saved = self._load_plan_and_data(datetime.now()) if fast_startup else None
+
+        if saved is not None:
+            # Show the saved plan right away and replace it with a live plan from the background
+            self._plan, self._data = saved
+            self._battery: Battery = self._load_battery(datetime.now())
+        else:
+            planner = Planner(self._settings)
+            self._plan, self._data = planner.plan, planner.data
+            self._battery = planner.battery
+            self._save_plan_and_data()
+
+        self._from_saved_plan = saved is not None
+        self._plan_version = 1                                  # Incremented on every new plan
         self._plan_index = 0
-        # self._load_plan_and_data() TODO: Fix this so it loads entire plan and data!
-        self._battery: Battery = self._planner.battery
-        self._expected_soc = expected_soc(self._settings['capacity'], self._planner.plan.at[1, "BatteryExpected"])
-        self._executor = ThreadPoolExecutor(max_workers=1)
-        self._tasks = {
-            'planner': {
-                'next_schedule': datetime.now(),
-                'scheduled': False,
-                'waiting': False,
-                'future': Future(),
-            },
-
-            'monitor': {
-                'next_schedule': datetime.now(),
-                'scheduled': False,
-                'waiting': False,
-                'future': Future(),
-            },
-        }
+        self._last_action_time = datetime.min
+        self._expected_soc = expected_soc(self._settings['capacity'], self._plan.at[1, "BatteryExpected"])
+        # Planner runs in a warm worker process, so it does not block the UI thread with the GIL
+        self._executor = Executor(cpu_initializer=plan_worker.warm_up)
+        self._planning = False
+        self._collected_data = pd.DataFrame()
+        self._prefetcher = Prefetcher(self._settings)
+        self._action = ('idle', float('nan'))                  # Applied action and its price
+        self._measurements: list[tuple[str, float, float, str, float]] = []
+        self._profit_totals = load_profit_totals(Database(), datetime.now())
+        self._timers: list[tuple[datetime, int, str]] = []     # Heap of (due time, priority, task)
+        self._subscribers: list[Callable[[], None]] = []      # Called in the UI thread on every new plan
+        self._timer_id = ''
+        # Completion callbacks of finished tasks, put by worker threads and run by the UI thread
+        self._completions: queue.SimpleQueue[tuple[Callable[..., None], tuple[Any, ...]]] = queue.SimpleQueue()
+        self._poll_id = ''
+        self._in_flight = 0                                     # Tasks whose completion callback has not run yet
     
     @property
     def plan(self) -> pd.DataFrame:
         """ Get generated plan from Planner """
-        return self._planner.plan
+        return self._plan
     
     @property
     def data(self) -> pd.DataFrame:
         """ Get the input data to Planner """
-        return self._planner.data
+        return self._data
     
     @property
     def battery(self) -> Battery:
         """ Get the battery information """
         return self._battery
 
+    @property
+    def plan_version(self) -> int:
+        """ Get version of the current plan and data (incremented on every new plan) """
+        return self._plan_version
+
+    @property
+    def from_saved_plan(self) -> bool:
+        """ Get whether the current plan is the saved plan from the last run (until a live plan is ready) """
+        return self._from_saved_plan
+
+    @property
+    def profit_totals(self) -> dict[str, float]:
+        """ Get the realized profit of today, this month and of all time """
+        return self._profit_totals
+
+    @property
+    def executor_stats(self) -> dict[str, dict[str, int]]:
+        """ Get task statistics (including missed deadlines) for every executor lane """
+        return self._executor.stats
+
+    @property
+    def forecast_metrics(self) -> dict[str, Any]:
+        """ Get error metrics of the consumption forecaster and the solar corrector (for every rooftop) """
+        return {'consumption': load_consumption_forecaster().metrics, 'solar': load_solar_corrector().metrics}
+
+    @property
+    def prefetch_status(self) -> dict[str, SourceStatus]:
+        """ Get the fetch status (readiness and staleness) of every prefetched source """
+        return self._prefetcher.status
+
+
+    def start(self) -> None:
+        """ Start scheduling of the action, planner and monitor tasks.\n
+        This method should only be called once the Application UI is created!
+
+        """
+        # Start the Planner worker process now, so the first plan does not wait for it to spawn and warm up
+        self._executor.submit(Lane.CPU, plan_worker.ready, name='warm-up', priority=1)
+        self._schedule_plan_tasks()
+        self._push_timer(self._next_minute(datetime.now()), 'monitor')
+        self._push_timer(datetime.now(), 'prefetch')
+
+        if self._from_saved_plan:
+            # The saved plan was made with old prices, so plan again now instead of at XX:58
+            self._remove_timers('planner')
+            self._run_planner(datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1))
+
+        self._arm_timer()
+
 
-    def clock_it(self, current_time: datetime) -> None:
-        """ Scheduler "clocks" itself every 10s to check for scheduling and running tasks
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        """ Subscribe to new plans. The callback runs in the UI thread once a new plan and its data are set.
 
         Args:
-            current_time: Current day and time
-        
-        """
-        next_action_time = self.plan.at[self._plan_index, 'Time'].to_pydatetime()
-        next_planner_time = next_action_time - timedelta(minutes=2)                 # XX:58:00
-        next_monitor_time = current_time + timedelta(minutes=1)                     # XX:01:XX
-        self._scheduling(current_time, next_planner_time, next_monitor_time)
-        self._update_tasks(current_time)
-        self._fetch_results()
-
-        if current_time >= next_action_time:
-            if not self._tasks['monitor']['future'].running(): # type: ignore
-                # set_battery(self.plan.at[self._plan_index, 'Action'])
-                self._app.update_ui()
-                self._plan_index = 1
-            
+            callback: Function to call on every new plan
+
+        """
+        self._subscribers.append(callback)
+
 
     def update_settings(self, settings: dict[str, str]) -> None:
         """ Update settings attribute in Scheduler object\n
@@ -95,136 +171,390 @@ class Scheduler:
 
         """
         self._settings = self._transform_settings(settings)
+        self._prefetcher.update_settings(self._settings)
 
 
     def shutdown(self) -> None:
-        """ Shutdown of ThreadPoolExecutor attribute in Scheduler object """
-        self._executor.shutdown(wait=False, cancel_futures=True)
+        """ Shutdown of timers and Executor attribute in Scheduler object """
+        if self._timer_id:
+            self._app.after_cancel(self._timer_id)
+            self._timer_id = ''
+        if self._poll_id:
+            self._app.after_cancel(self._poll_id)
+            self._poll_id = ''
+        self._timers.clear()
+        self._executor.shutdown()
+
+        if self._measurements:
+            _task_save_measurements(self._measurements, datetime.now(), self._settings['capacity'])
+            self._measurements = []
+
+        # Timers and counters of this run are kept for finding the cause of late actions afterwards
+        METRICS.export(METRICS_FILE)
 
 
-    def _scheduling(self, current_time: datetime,
-                    next_planner_time: datetime, next_monitor_time: datetime) -> None:
-        """ Scheduling of tasks based on current timing 
-        
+    def _when_done(self, future: Future, callback: Callable[..., None], *args: Any) -> None: # type: ignore
+        """ Run a completion callback in the UI thread once a task has finished (call from the UI thread)
+
         Args:
-            current_time: Current day and time
-            next_planner_time: Next time to run Planner task
-            next_monitor_time: Next time to run Monitor task
+            future: Future of the task
+            callback: Completion callback, called with the future and args
+            args: Extra arguments for callback
+
+        """
+        # Worker threads must not touch Tk, so they only put the callback on a queue for the UI thread
+        future.add_done_callback(lambda done: self._completions.put((callback, (done, *args))))
+        self._in_flight += 1
+
+        # The queue is only polled while tasks run, so an idle Scheduler does not wake up the UI thread
+        if not self._poll_id:
+            self._poll_id = self._app.after(COMPLETION_POLL_MS, self._poll_completions)
+
+
+    def _poll_completions(self) -> None:
+        """ Run the completion callbacks of finished tasks (runs in the UI thread) """
+        self._poll_id = ''
+
+        while True:
+            try:
+                callback, args = self._completions.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight -= 1
+            callback(*args)
+
+        if self._in_flight > 0 and not self._poll_id:
+            self._poll_id = self._app.after(COMPLETION_POLL_MS, self._poll_completions)
+
+
+    def _push_timer(self, due_time: datetime, task: str) -> None:
+        """ Push a timer for a task onto the timer heap
+
+        Args:
+            due_time: Time to run the task
+            task: Name of the task ('action', 'planner', 'monitor' or 'prefetch')
+
+        """
+        heapq.heappush(self._timers, (due_time, TASK_PRIORITY[task], task))
+
+
+    def _remove_timers(self, task: str) -> None:
+        """ Remove all pending timers for a task
+
+        Args:
+            task: Name of the task ('action', 'planner', 'monitor' or 'prefetch')
 
         """
-        if not self._tasks['planner']['scheduled']:
-            if next_planner_time > current_time:
-                self._tasks['planner']['next_schedule'] = next_planner_time
-                self._tasks['planner']['scheduled'] = True
-                
-        if not self._tasks['monitor']['scheduled']:
-            self._tasks['monitor']['next_schedule'] = next_monitor_time
-            self._tasks['monitor']['scheduled'] = True
+        self._timers = [timer for timer in self._timers if timer[2] != task]
+        heapq.heapify(self._timers)
+
+
+    def _arm_timer(self) -> None:
+        """ Arm a single Tk timer that wakes up at the earliest pending timer """
+        if self._timer_id:
+            self._app.after_cancel(self._timer_id)
+            self._timer_id = ''
+
+        if self._timers:
+            delay = (self._timers[0][0] - datetime.now()).total_seconds()
+            self._timer_id = self._app.after(max(0, int(delay * 1000) + 1), self._on_timer)
+
+
+    def _on_timer(self) -> None:
+        """ Run all tasks that are due and re-arm the timer for the next pending task """
+        self._timer_id = ''
+        current_time = datetime.now()
+
+        while self._timers and self._timers[0][0] <= current_time:
+            due_time, _, task = heapq.heappop(self._timers)
+            # How late every task starts, e.g. an action waiting for a busy UI thread
+            METRICS.observe(f'scheduler.{task}_delay', (current_time - due_time).total_seconds())
+
+            if task == 'action':
+                self._run_action()
+            elif task == 'planner':
+                self._run_planner(due_time + PLANNER_LEAD_TIME)
+            elif task == 'monitor':
+                self._run_monitor(current_time)
+            else:
+                self._run_prefetch()
 
+        self._arm_timer()
+
+
+    def _schedule_plan_tasks(self) -> None:
+        """ Schedule the next action and the next planner run from the current plan """
+        self._remove_timers('action')
+        self._remove_timers('planner')
+        current_time = datetime.now()
+        action_times = [time.to_pydatetime() for time in self.plan.loc[self._plan_index:, 'Time']]
+
+        if action_times:
+            self._push_timer(action_times[0], 'action')
+
+        # Planner must not be scheduled in the past, else it would run again right away
+        planner_times = [time - PLANNER_LEAD_TIME for time in action_times if time - PLANNER_LEAD_TIME > current_time]
+        if planner_times:
+            self._push_timer(planner_times[0], 'planner')
+
+
+    def _run_action(self) -> None:
+        """ Apply the planned action for the current hour """
+        # set_battery(self.plan.at[self._plan_index, 'Action'])
+        self._last_action_time = self.plan.at[self._plan_index, 'Time'].to_pydatetime()
+        price = self.data.loc[self.data['Time'] == self.plan.at[self._plan_index, 'Time'], 'Price']
+        self._action = (self.plan.at[self._plan_index, 'Action'],
+                        float(price.iloc[0]) if not price.empty else float('nan'))
+        self._app.update_ui(self.plan.at[self._plan_index, 'Action'],
+                            self.plan.at[self._plan_index, 'ActionReason'])
+        self._plan_index += 1
+
+        if self._plan_index < self.plan.index.values.size:
+            next_action_time = self.plan.at[self._plan_index, 'Time'].to_pydatetime()
+            self._push_timer(next_action_time, 'action')
+
+            if not self._planning:
+                self._remove_timers('planner')
+                self._push_timer(next_action_time - PLANNER_LEAD_TIME, 'planner')
+
+
+    def _run_planner(self, deadline: datetime) -> None:
+        """ Run the Planner task in the background.
+        Data is collected in the I/O lane and the plan is generated in the CPU lane.
+
+        Args:
+            deadline: Time of the action the plan must be ready for
+
+        """
+        self._planning = True
+        task = self._executor.submit(Lane.IO, _task_collector, self._settings, self._battery, self._prefetcher,
+                                     name='collector', deadline=deadline)
+        self._when_done(task.future, self._collector_done, deadline)
+
+
+    def _run_monitor(self, current_time: datetime) -> None:
+        """ Run the battery monitor task in the background and schedule the next run
 
-    def _update_tasks(self, current_time: datetime) -> None:
-        """ Update and run tasks based on their scheduled timings
-        
         Args:
             current_time: Current day and time
-            next_action_time: Next time to take an action
-
-        """
-        if not self._tasks['planner']['future'].running() and self._tasks['planner']['scheduled']: # type: ignore
-            if current_time >= self._tasks['planner']['next_schedule']:                            # type: ignore
-                self._tasks['planner']['future'] = self._executor.submit(self._task_planner,
-                                                                         self._settings)
-                self._tasks['planner']['scheduled'] = False
-                self._tasks['planner']['waiting'] = True
-
-        # Check if Planner task is running since it has higher priority
-        if not self._tasks['planner']['future'].running() and self._tasks['monitor']['scheduled']: # type: ignore
-            if current_time >= self._tasks['monitor']['next_schedule']:                            # type: ignore
-                self._tasks['monitor']['future'] = self._executor.submit(self._task_battery_monitor)
-                self._tasks['monitor']['scheduled'] = False
-                self._tasks['monitor']['waiting'] = True
-
-
-    def _fetch_results(self) -> None:
-        """ Fetches the results from finished tasks """
-        if self._tasks['planner']['waiting']:
-            if self._tasks['planner']['future'].done(): # type: ignore
-                self._planner = self._tasks['planner']['future'].result() # type: ignore
-                self._tasks['planner']['waiting'] = False
-                
-        if self._tasks['monitor']['waiting']:
-            if self._tasks['monitor']['future'].done(): # type: ignore
-                self._battery = self._tasks['monitor']['future'].result() # type: ignore
-
-                if self._battery.soc >= self._expected_soc:
-                    # set_battery("idle")
-                    self._app.update_ui("idle", ActionReason.IDLE.value, section="action")
-                
-                self._app.update_ui(section="battery")    
-                self._tasks['monitor']['waiting'] = False
-
-
-    def _save_plan_and_data(self) -> None:  # TODO: Fix this so it saves entire plan and data!
-        """ Save current Planner plan and data in database incase of unexpected shutdown """
-        db = Database()
-        current_plan = self._planner.plan.loc[0].to_list()
-        current_plan.extend(self._planner.data.loc[0].to_list()[1:])
-        current_plan[0] = datetime.strftime(current_plan[0].to_pydatetime(), "%Y-%m-%d, %H:%M:%S")
-
-        if db.check_for_empty_table('plan'):
-            db.insert_into_table('plan', tuple(current_plan))
+
+        """
+        next_monitor_time = self._next_minute(current_time)
+        # A battery reading is worthless once the next one is due, so drop it if it is late
+        task = self._executor.submit(Lane.REALTIME, _task_battery_monitor, name='monitor',
+                                     deadline=next_monitor_time, drop_if_late=True)
+        self._when_done(task.future, self._monitor_done)
+        self._push_timer(next_monitor_time, 'monitor')
+
+
+    def _run_prefetch(self) -> None:
+        """ Run the prefetch task in the background, so the Planner can start from ready data """
+        task = self._executor.submit(Lane.IO, _task_prefetch, self._prefetcher, self._settings,
+                                     name='prefetch', priority=1)
+        self._when_done(task.future, self._prefetch_done)
+
+
+    def _collector_done(self, future: Future, deadline: datetime) -> None: # type: ignore
+        """ Completion callback for the collector task (runs in the UI thread)
+
+        Args:
+            future: Finished collector task
+            deadline: Time of the action the plan must be ready for
+
+        """
+        if future.cancelled() or future.exception() is not None:
+            self._planner_done(future)
+            return
+
+        collector = future.result()
+        self._collected_data = collector.data
+        # Only compact NumPy arrays are pickled to and from the worker process
+        task = self._executor.submit(Lane.CPU, plan_worker.plan, self._settings,
+                                     plan_worker.encode_frame(collector.data),
+                                     collector.battery, name='planner', deadline=deadline)
+        self._when_done(task.future, self._planner_done)
+
+
+    def _planner_done(self, future: Future) -> None: # type: ignore
+        """ Completion callback for the Planner task (runs in the UI thread)
+
+        Args:
+            future: Finished Planner task
+
+        """
+        self._planning = False
+
+        failed = future.cancelled() or future.exception() is not None
+
+        if failed:
+            count('planner.failures')
         else:
-            db.update_table('plan', tuple(current_plan))
+            payload = future.result()
+            METRICS.merge(payload.get('metrics', {}))
+            self._plan = plan_worker.decode_frame(payload)
+            self._data = self._collected_data
+            self._from_saved_plan = False
+            self._plan_version += 1
+            # Continue from the first hour of the new plan that has not been applied yet
+            self._plan_index = int((self.plan['Time'] <= self._last_action_time).sum())
+            self._expected_soc = expected_soc(self._settings['capacity'], self.plan.at[1, "BatteryExpected"])
+            self._save_plan_and_data()
 
+            for callback in self._subscribers:
+                callback()
 
-    def _load_plan_and_data(self) -> None: # TODO: Fix this so it loads entire plan and data!
-        """ Check if there is a relevant saved plan in database and load into application """
-        db = Database()
-        next_action_time = self.plan.at[0, 'Time'].to_pydatetime()
-        last_action_time = next_action_time - timedelta(1)
+        self._schedule_plan_tasks()
+        if failed:
+            self._schedule_planner_retry(datetime.now() + PLANNER_RETRY)
+        self._arm_timer()
 
-        # Check that a plan exists in Database
-        if not db.check_for_empty_table('plan'):
-            content = db.load_plan()
-            saved_time = datetime.strptime(content['Time'], "%Y-%m-%d, %H:%M:%S")
 
-            # Check if the time for the saved plan is still relevant
-            if saved_time > last_action_time and saved_time < next_action_time: # pylint: disable=chained-comparison
-                content_values = list(content.values())
-                columns = list(content.keys())
+    def _schedule_planner_retry(self, retry_time: datetime) -> None:
+        """ Schedule the Planner to run again after a failure, unless it is scheduled to run sooner anyway
 
-                # Insert saved rows into plan and data
-                plan = pd.Series([saved_time, *content_values[1:len(self._planner.plan.columns)]],
-                                 index=columns[:len(self._planner.plan.columns)])
-                data = pd.Series([saved_time, *content_values[len(self._planner.plan.columns):]],
-                                 index=[columns[0], *columns[len(self._planner.plan.columns):]])
-                self._planner.plan.loc[0] = plan    # type: ignore
-                self._planner.data.loc[0] = data    # type: ignore
-                self._planner.plan.sort_index(inplace=True)
-                self._planner.data.sort_index(inplace=True)
+        Args:
+            retry_time: Time to retry the Planner
+
+        """
+        planner_times = [due_time for due_time, _, task in self._timers if task == 'planner']
 
+        if not planner_times or retry_time < min(planner_times):
+            self._remove_timers('planner')
+            self._push_timer(retry_time, 'planner')
+
+
+    def _prefetch_done(self, future: Future) -> None: # type: ignore
+        """ Completion callback for the prefetch task (runs in the UI thread)
 
-    def _task_planner(self, settings: dict[str, Any]) -> Planner:
-        """ Task for running the Planner and generate a new Planner object 
-        
         Args:
-            settings: User settings from Application
+            future: Finished prefetch task
+
+        """
+        if future.cancelled():
+            return
+
+        current_time = datetime.now()
+        ready = future.exception() is None and self._prefetcher.is_ready(current_time)
+        self._push_timer(next_prefetch_time(current_time, ready), 'prefetch')
+        self._arm_timer()
+
+
+    def _monitor_done(self, future: Future) -> None: # type: ignore
+        """ Completion callback for the battery monitor task (runs in the UI thread)
+
+        Args:
+            future: Finished battery monitor task
+
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        self._battery = future.result()
+
+        if self._battery.soc >= self._expected_soc:
+            # set_battery("idle")
+            self._action = ('idle', self._action[1])
+            self._app.update_ui("idle", ActionReason.IDLE.value, section="action")
+
+        self._app.update_ui(section="battery")
+        self._record_measurement(self._battery)
+
+
+    def _record_measurement(self, battery: Battery) -> None:
+        """ Buffer a battery measurement and write the buffered measurements to database in batches
+
+        Args:
+            battery: Battery information from the battery monitor
+
+        """
+        action, price = self._action
+        self._measurements.append((datetime.strftime(battery.time, TIME_FORMAT), battery.soc,
+                                   battery.real_consumption, action, price))
+
+        if len(self._measurements) >= MEASUREMENT_BATCH_SIZE:
+            task = self._executor.submit(Lane.IO, _task_save_measurements, self._measurements, battery.time,
+                                         self._settings['capacity'], name='measurements', priority=2)
+            self._when_done(task.future, self._measurements_saved)
+            self._measurements = []
+
+
+    def _measurements_saved(self, future: Future) -> None: # type: ignore
+        """ Completion callback for the save measurements task (runs in the UI thread)
+
+        Args:
+            future: Finished save measurements task
+
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        self._profit_totals = future.result()
+        self._app.update_ui(section="profit")
+
+
+    def _next_minute(self, current_time: datetime) -> datetime:
+        """ Get the start of the next whole minute
+
+        Args:
+            current_time: Current day and time
+
+        Returns:
+            Time of the next whole minute
+
+        """
+        return current_time.replace(second=0, microsecond=0) + MONITOR_INTERVAL
+
+
+    def _save_plan_and_data(self) -> None:
+        """ Save every hour of the current plan and data in database incase of unexpected shutdown """
+        columns = [column[0] for column in EXPECTED_TABLE_CONTENT['plan']]
+        merged = pd.merge(self._plan, self._data, on='Time')
+        merged['Time'] = merged['Time'].dt.strftime(TIME_FORMAT)
+
+        Database().save_plan(list(merged[columns].itertuples(index=False, name=None)))
+
+
+    def _load_plan_and_data(self, current_time: datetime) -> tuple[pd.DataFrame, pd.DataFrame] | None:
+        """ Load the saved plan and data from database for the hours from the current hour
+
+        Args:
+            current_time: Current day and time
 
         Returns:
-            A Planner object with generated plan
-        
+            Saved plan and data, or None if there is no saved plan for the current hour
+
         """
-        return Planner(settings)
+        start_time = current_time.replace(minute=0, second=0, microsecond=0)
+        rows = Database().load_plan(datetime.strftime(start_time, TIME_FORMAT))
+
+        # The battery must have an expected SoC for the next hour
+        if len(rows) < 2 or rows[0]['Time'] != datetime.strftime(start_time, TIME_FORMAT):
+            return None
 
+        saved = pd.DataFrame(rows)
+        saved['Time'] = pd.to_datetime(saved['Time'], format=TIME_FORMAT)
+        plan_columns = [column for column in saved.columns if column not in DATA_COLUMNS]
 
-    def _task_battery_monitor(self) -> Battery:
-        """ Task for monitoring battery system and generate a new Battery object
+        return saved[plan_columns], saved[['Time', *DATA_COLUMNS]]
+
+
+    def _load_battery(self, current_time: datetime) -> Battery:
+        """ Load the last measured battery state from database
+
+        Args:
+            current_time: Current day and time
 
         Returns:
-            A Battery object with SoC and Real Consumption
-         
+            Battery from the newest measurement of the last day, or an empty Battery if there is none
+
         """
-        return get_battery()
+        rows = Database().load_measurements(datetime.strftime(current_time - timedelta(days=1), TIME_FORMAT),
+                                            datetime.strftime(current_time, TIME_FORMAT))
+
+        if not rows:
+            return Battery(current_time, 0.0, 0.0)
+
+        return Battery(datetime.strptime(rows[-1]['Time'], TIME_FORMAT), rows[-1]['Soc'], rows[-1]['NetRate'])
 
 
     def _transform_settings(self, settings: dict) -> dict[str, Any]: # type: ignore
@@ -246,5 +576,86 @@ class Scheduler:
 
         return transformed_settings
 
-    
-    
\ No newline at end of file
+
+def _task_collector(settings: dict[str, Any], battery: Battery, prefetcher: Prefetcher) -> Collector:
+    """ Task for collecting input data to the Planner.
+    Prefetched data is used when every source is ready, else data is collected from scratch.
+
+    Args:
+        settings: User settings from Application
+        battery: Latest battery information from the battery monitor
+        prefetcher: Prefetcher with data fetched ahead of time
+
+    Returns:
+        A Collector object with collected data
+
+    """
+    prefetcher.refresh()
+    data = prefetcher.collect()
+
+    if data is not None and not data.empty:
+        return Collector(settings, data=data, battery=battery)
+
+    return Collector(settings, battery=battery)
+
+
+def _task_prefetch(prefetcher: Prefetcher, settings: dict[str, Any]) -> None:
+    """ Task for prefetching Planner input data.
+    The solar corrector then learns from the Solcast files saved by the prefetch.
+
+    Args:
+        prefetcher: Prefetcher with data fetched ahead of time
+        settings: User settings from Application
+
+    """
+    prefetcher.refresh()
+
+    if settings['solcast_key'] and settings['solcast_ids']:
+        train_solar_corrector(Database(), settings['solcast_ids'], datetime.strftime(datetime.now(), TIME_FORMAT))
+
+
+def _task_save_measurements(measurements: list[tuple[str, float, float, str, float]],
+                            current_time: datetime, capacity: float) -> dict[str, float]:
+    """ Task for saving battery measurements, rolling up the last hours and deleting old measurements.
+    The consumption forecaster then learns from the rolled up hours, and the passed hours are added to the profit
+    and the history.
+
+    Args:
+        measurements: Buffered measurements with Time, Soc, NetRate, Action and Price
+        current_time: Current day and time
+        capacity: Max capacity of battery (kWh)
+
+    Returns:
+        The realized profit of today, this month and of all time
+
+    """
+    current_hour = current_time.replace(minute=0, second=0, microsecond=0)
+    db = Database()
+    db.insert_measurements(measurements)
+
+    # Only complete hours are rolled up, the current hour is rolled up once it has passed.
+    # Rolling up from the last rolled up hour catches up on hours saved before a shutdown.
+    rollup_start = current_hour - RAW_RETENTION
+    last_hour = db.load_last_rollup_hour()
+    if last_hour is not None:
+        rollup_start = max(rollup_start, datetime.strptime(last_hour, TIME_FORMAT))
+
+    db.rollup_measurements(datetime.strftime(rollup_start, TIME_FORMAT),
+                           datetime.strftime(current_hour, TIME_FORMAT))
+    db.delete_measurements(datetime.strftime(current_hour - RAW_RETENTION, TIME_FORMAT),
+                           datetime.strftime(current_hour - HOURLY_RETENTION, TIME_FORMAT))
+    train_consumption_forecaster(db, current_hour)
+    track_profit(db, current_time, capacity)
+    rollup_history(db, current_time)
+
+    return load_profit_totals(db, current_time)
+
+
+def _task_battery_monitor() -> Battery:
+    """ Task for monitoring battery system and generate a new Battery object
+
+    Returns:
+        A Battery object with SoC and Real Consumption
+     
+    """
+    return get_battery()
@@ -9,7 +9,7 @@ Date:
 import tkinter as tk
 from tkinter import ttk
 
-from ui.components import HomeTab, PlanTab, GraphsTab, ProfileTab
+from ui.components import HomeTab, PlanTab, GraphsTab, ProfileTab, LoggingTab
 
 WIDTH = 800
 HEIGHT = 480
@@ -22,14 +22,12 @@ class TabLayout(ttk.Notebook):
         self.plan_tab = PlanTab(self, scheduler)
         self.graphs_tab = GraphsTab(self, scheduler)
         self.profile_tab = ProfileTab(self, settings, scheduler)
-        self.logging_tab = ttk.Frame(self)
+        self.logging_tab = LoggingTab(self)
 
         self.add(self.home_tab, text="Home")
         self.add(self.plan_tab, text="Plan")
         self.add(self.graphs_tab, text="Graphs")
         self.add(self.profile_tab, text="Profile")
-        
-        # TODO: Logging Tab
         self.add(self.logging_tab, text="Logging")
         self.pack(expand=True, fill='both')
 
@@ -0,0 +1,124 @@
+"""
+View models remembering what a view displays, so only the rows and labels that changed are redrawn
+
+Date:
+    19-10-2026
+
+Example:
+    >>> view = ViewModel()
+    >>> view.diff({'a': 1, 'b': 2})
+    RowDiff(removed=0, inserted=2, changed=0)
+    >>> view.diff({'b': 3, 'c': 4})
+    RowDiff(removed=1, inserted=1, changed=1)
+
+"""
+
+import pandas as pd
+
+from typing import Any
+from datetime import timedelta
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class RowDiff:
+    """ Class for storing the difference between the displayed rows and new rows """
+    _removed: list[str] = field(default_factory=list)
+    _inserted: list[tuple[int, str, Any]] = field(default_factory=list)
+    _changed: list[tuple[str, Any]] = field(default_factory=list)
+
+    def __repr__(self):
+        return f"RowDiff(removed={len(self._removed)}, inserted={len(self._inserted)}, changed={len(self._changed)})"
+
+    def __len__(self) -> int:
+        return len(self._removed) + len(self._inserted) + len(self._changed)
+
+    @property
+    def removed(self) -> list[str]:
+        """ Get keys of the displayed rows that are not in the new rows """
+        return self._removed
+
+    @property
+    def inserted(self) -> list[tuple[int, str, Any]]:
+        """ Get position, key and value of the new rows that are not displayed (ordered by position) """
+        return self._inserted
+
+    @property
+    def changed(self) -> list[tuple[str, Any]]:
+        """ Get key and new value of the displayed rows with a changed value """
+        return self._changed
+
+
+class ViewModel:
+    """ Class for remembering the rows (or labels) of a view by key """
+    def __init__(self) -> None:
+        self._rows: dict[str, Any] = {}
+
+    def __repr__(self):
+        return f"ViewModel(rows={len(self._rows)})"
+
+    @property
+    def rows(self) -> dict[str, Any]:
+        """ Get the displayed value of every key """
+        return self._rows
+
+    def diff(self, rows: dict[str, Any], partial: bool = False) -> RowDiff:
+        """ Diff new rows against the displayed rows, which are then replaced by the new rows.
+        Rows that are kept must keep their order, like the hours of consecutive plans.
+
+        Args:
+            rows: New value of every key, in the order they are displayed
+            partial: Only replace the given rows and keep every other displayed row (e.g. a section of labels)
+
+        Returns:
+            The rows to remove, insert and change to display the new rows
+
+        """
+        removed = [] if partial else [key for key in self._rows if key not in rows]
+        inserted = [(position, key, value) for position, (key, value) in enumerate(rows.items())
+                    if key not in self._rows]
+        changed = [(key, value) for key, value in rows.items() if key in self._rows and self._rows[key] != value]
+
+        self._rows = {**self._rows, **rows} if partial else dict(rows)
+        return RowDiff(removed, inserted, changed)
+
+
+def plan_rows(plan: pd.DataFrame) -> dict[str, tuple[str, str, str, str]]:
+    """ Get the rows of the plan view
+
+    Args:
+        plan: Generated plan from Controller
+
+    Returns:
+        Action, start, end and reason of every planned hour, keyed by start
+        (so the hours of consecutive plans are matched)
+
+    """
+    starts = [str(time) for time in plan['Time']]
+    ends = [str(time + timedelta(hours=1)) for time in plan['Time']]
+
+    return {start: (str(action), start, end, str(reason))
+            for start, end, action, reason in zip(starts, ends, plan['Action'], plan['ActionReason'])}
+
+
+def metric_rows(snapshot: dict[str, Any]) -> dict[str, tuple[str, str, str, str, str, str]]:
+    """ Get the rows of the metrics view
+
+    Args:
+        snapshot: Timers and counters exported by `Metrics.snapshot`
+
+    Returns:
+        Name, count, mean, median, 95th percentile and max (in ms) of every timer,
+        and name and value of every counter, keyed by name
+
+    """
+    rows: dict[str, tuple[str, str, str, str, str, str]] = {}
+
+    for name, timer in snapshot['timers'].items():
+        mean, p50, p95, longest = (f"{timer[key] * 1000:.1f}" for key in ('mean', 'p50', 'p95', 'max'))
+        rows[name] = (name, str(timer['count']), mean, p50, p95, longest)
+
+    for name, value in snapshot['counters'].items():
+        rows[name] = (name, str(value), '', '', '', '')
+
+    return rows
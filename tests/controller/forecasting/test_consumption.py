@@ -0,0 +1,116 @@
+"""
+Pytests for consumption.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import math
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from controller.forecasting.consumption import ConsumptionForecaster, read_profiles, load_profiles, ALPHA
+
+
+MONDAY = datetime(2023, 10, 2, 0, 0, 0)
+
+
+def write_profiles(folder, offset=0):
+    for day, name in enumerate(['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']):
+        pd.DataFrame({'Hour': range(24), 'ExpectedConsumption': [day + offset] * 24}).to_csv(folder / f"{name}.csv")
+
+
+@pytest.fixture
+def forecaster():
+    profile = np.tile(np.arange(24, dtype=float) / 10, (7, 1))
+    return ConsumptionForecaster(profile)
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_forecaster_invalid_profile():
+    with pytest.raises(ValueError):
+        ConsumptionForecaster(np.zeros((24, 7)))
+
+
+def test_forecaster_no_metrics(forecaster: ConsumptionForecaster):
+    metrics = forecaster.metrics
+
+    assert metrics['samples'] == 0
+    assert math.isnan(metrics['mae'])
+    assert forecaster.__repr__() == "ConsumptionForecaster(last_update=0001-01-01 00:00:00, samples=0)"
+
+
+def test_forecaster_update(forecaster: ConsumptionForecaster):
+    times = [MONDAY + timedelta(hours=2), MONDAY + timedelta(hours=1), MONDAY + timedelta(hours=3)]
+    learned = forecaster.update(times, [1.2, 0.1, float('nan')])
+
+    assert learned == 2
+    assert forecaster.last_update == MONDAY + timedelta(hours=2)
+    assert forecaster.profile[0, 1] == pytest.approx(0.1)
+    assert forecaster.profile[0, 2] == pytest.approx(0.2 + ALPHA * (1.2 - 0.2))
+    assert forecaster.profile[1, 2] == pytest.approx(0.2)
+    assert forecaster.metrics == pytest.approx({'mae': 0.5, 'rmse': math.sqrt(0.5), 'bias': -0.5, 'samples': 2})
+
+    # Measurements that are already learned from are skipped
+    assert forecaster.update([MONDAY + timedelta(hours=2)], [5.0]) == 0
+
+
+def test_forecaster_expected_consumption(forecaster: ConsumptionForecaster):
+    time_window = (MONDAY + timedelta(hours=22), MONDAY + timedelta(hours=25))
+    forecaster.update([MONDAY + timedelta(days=1)], [1.0])
+
+    expected_consumption = forecaster.expected_consumption(time_window)
+
+    assert list(expected_consumption['Time']) == [MONDAY + timedelta(hours=hour) for hour in range(22, 26)]
+    assert list(expected_consumption['ExpectedConsumption']) == pytest.approx([2.2, 2.3, ALPHA * 1.0, 0.1])
+
+
+def test_forecaster_state(forecaster: ConsumptionForecaster):
+    forecaster.update([MONDAY], [1.0])
+    restored = ConsumptionForecaster.from_state(forecaster.to_state())
+
+    assert restored.last_update == MONDAY
+    assert restored.profile == pytest.approx(forecaster.profile)
+    assert restored.metrics == forecaster.metrics
+
+
+def test_forecaster_expected_consumption_slice():
+    forecaster = ConsumptionForecaster(np.arange(7 * 24, dtype=float).reshape(7, 24))
+    forecaster.update([MONDAY + timedelta(days=6, hours=23)], [0.0])
+    sunday = MONDAY + timedelta(days=6, hours=20)
+
+    for hours in [1, 12, 48, 168, 200]:
+        time_window = (sunday, sunday + timedelta(hours=hours - 1))
+        expected_consumption = forecaster.expected_consumption(time_window)
+
+        assert len(expected_consumption) == hours
+        assert list(expected_consumption['ExpectedConsumption']) == \
+               list(forecaster.forecast(pd.DatetimeIndex(expected_consumption['Time'])))
+
+
+def test_read_profiles(tmp_path):
+    write_profiles(tmp_path)
+    profiles = read_profiles(str(tmp_path))
+
+    assert profiles.shape == (7, 24)
+    assert list(profiles[:, 0]) == [0, 1, 2, 3, 4, 5, 6]
+
+
+def test_load_profiles(tmp_path):
+    write_profiles(tmp_path)
+    first = load_profiles(str(tmp_path))
+    second = load_profiles(str(tmp_path))
+
+    assert first is second
+
+    write_profiles(tmp_path, offset=1)
+    os.utime(tmp_path / "mon.csv", (0, 0))
+    third = load_profiles(str(tmp_path))
+
+    assert third is not first
+    assert list(third[:, 0]) == [1, 2, 3, 4, 5, 6, 7]
@@ -0,0 +1,99 @@
+"""
+Pytests for solar_bias.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import math
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from data import Solar
+from controller.forecasting.solar_bias import SolarCorrector, ALPHA, MIN_FACTOR, MAX_FACTOR
+
+
+ROOFTOP = "b68d-c05a-c2b3-2cf9"
+START = datetime(2023, 9, 21, 10, 0, 0)
+
+
+def periods(start: datetime, values: list[float]) -> list[dict]:
+    return [{'period_end': (start + timedelta(minutes=30 * index)).strftime("%Y-%m-%dT%H:%M:%S.0000000Z"),
+             'pv_estimate': value, 'period': 'PT30M'} for index, value in enumerate(values)]
+
+
+@pytest.fixture
+def corrector():
+    return SolarCorrector()
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_corrector_unknown_rooftop(corrector: SolarCorrector):
+    solars = [Solar(START, 2.0)]
+
+    assert list(corrector.factors(ROOFTOP)) == [1.0] * 24
+    assert corrector.correct(ROOFTOP, solars) == solars
+    assert corrector.metrics == {}
+    assert corrector.__repr__() == "SolarCorrector(rooftops=[])"
+
+
+def test_corrector_learn(corrector: SolarCorrector):
+    corrector.observe_forecasts(ROOFTOP, periods(START, [2.0, 2.0, 0.01]))
+    learned = corrector.observe_actuals(ROOFTOP, periods(START - timedelta(hours=1), [1.0, 1.0, 1.0, 1.0, 0.0]))
+
+    factors = corrector.factors(ROOFTOP)
+    metrics = corrector.metrics[ROOFTOP]
+
+    assert learned == 3
+    assert factors[10] == pytest.approx(MIN_FACTOR)     # Actual is half the forecast
+    assert factors[11] == 1.0                           # Too small forecasts are not corrected
+    assert metrics['samples'] == 3
+    assert metrics['mae'] == pytest.approx((1.0 + 1.0 + 0.01) / 3)
+    assert corrector.correct(ROOFTOP, [Solar(START, 2.0)]) == [Solar(START, 1.0)]
+
+    # Already learned periods are skipped and forecasts for them are ignored
+    corrector.observe_forecasts(ROOFTOP, periods(START, [9.0]))
+    assert corrector.observe_actuals(ROOFTOP, periods(START, [1.0])) == 0
+
+
+def test_corrector_factor_limits(corrector: SolarCorrector):
+    corrector.observe_forecasts(ROOFTOP, periods(START, [1.0]))
+    corrector.observe_actuals(ROOFTOP, periods(START, [5.0]))
+
+    assert corrector.factors(ROOFTOP)[10] == MAX_FACTOR
+
+
+def test_corrector_state(corrector: SolarCorrector):
+    corrector.observe_forecasts(ROOFTOP, periods(START, [2.0, 2.0]))
+    corrector.observe_actuals(ROOFTOP, periods(START, [1.5]))
+    restored = SolarCorrector.from_state(corrector.to_state())
+
+    assert list(restored.factors(ROOFTOP)) == list(corrector.factors(ROOFTOP))
+    assert restored.metrics == corrector.metrics
+    assert restored.observe_actuals(ROOFTOP, periods(START + timedelta(minutes=30), [2.0])) == 1
+
+
+def test_corrector_update_from_archive(corrector: SolarCorrector, tmp_path):
+    forecasts = tmp_path / ROOFTOP / "forecasts"
+    actuals = tmp_path / ROOFTOP / "estimated_actuals"
+    forecasts.mkdir(parents=True)
+    actuals.mkdir(parents=True)
+    (forecasts / "dummy.json").write_text("{}")
+    (forecasts / "2023-09-21.json").write_text(json.dumps({'forecasts': periods(START, [2.0] * 4)}))
+    (actuals / "2023-09-22.json").write_text(json.dumps({'estimated_actuals': periods(START, [3.0] * 2)}))
+
+    assert corrector.update_from_archive(ROOFTOP, str(tmp_path)) == 2
+    # Files are only read again if they change
+    assert corrector.update_from_archive(ROOFTOP, str(tmp_path)) == 0
+
+    (actuals / "2023-09-22.json").write_text(json.dumps({'estimated_actuals': periods(START, [3.0] * 4)}))
+    os.utime(actuals / "2023-09-22.json", (0, 0))
+
+    assert corrector.update_from_archive(ROOFTOP, str(tmp_path)) == 2
+    assert corrector.update_from_archive("unknown", str(tmp_path)) == 0
+    assert corrector.factors(ROOFTOP)[10] == pytest.approx(1.5)
@@ -0,0 +1,147 @@
+"""
+Pytests for spot_forecast.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from data.electricity.spot_price import SpotPrice
+from data.helperfunctions import FetchError
+from controller.forecasting import spot_forecast
+from controller.forecasting.spot_forecast import (SpotPriceForecaster, horizon_end, extend_spot_prices,
+                                                  extend_with_forecast, BACKFILL_COOLDOWN)
+
+
+MONDAY = datetime(2023, 10, 2, 0, 0, 0)
+
+
+@pytest.fixture
+def forecaster():
+    profile = np.tile(np.arange(24, dtype=float) / 10, (7, 1))
+    return SpotPriceForecaster(profile, level=0.5)
+
+class FakeDatabase:
+    """ Fake Database archiving spot prices in memory """
+    rows: dict[tuple[str, str], tuple[str, str, float]] = {}
+
+    def save_spot_prices(self, rows):
+        FakeDatabase.rows.update({row[:2]: row for row in rows})
+
+    def load_spot_prices(self, price_area, start_time):
+        return [{'Time': time, 'PriceArea': area, 'SpotPrice': price}
+                for time, area, price in sorted(FakeDatabase.rows.values())
+                if area == price_area and time >= start_time]
+
+
+@pytest.fixture
+def history(monkeypatch):
+    FakeDatabase.rows = {}
+    requests = []
+
+    def get_history(price_area, start):
+        requests.append(start)
+        if len(requests) == 1:
+            raise FetchError("(spot_price_history_DK1) Status code 503 and nothing is cached")
+        first = datetime.combine(start, datetime.min.time())
+        return [SpotPrice(first + timedelta(hours=hour), price_area, 0.5) for hour in range(spot_forecast.MIN_HISTORY)]
+
+    monkeypatch.setattr(spot_forecast, 'Database', FakeDatabase)
+    monkeypatch.setattr(spot_forecast, 'get_spot_price_history', get_history)
+    monkeypatch.setattr(spot_forecast, '_backfills', {})
+    return requests
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_forecaster_invalid_profile():
+    with pytest.raises(ValueError):
+        SpotPriceForecaster(np.zeros((24, 7)))
+
+    with pytest.raises(ValueError):
+        SpotPriceForecaster.fit([], [])
+
+
+def test_forecaster_forecast(forecaster: SpotPriceForecaster):
+    times = pd.date_range(MONDAY + timedelta(hours=22), periods=3, freq='h')
+
+    assert list(forecaster.forecast(times)) == pytest.approx([2.7, 2.8, 0.5])
+    assert forecaster.__repr__() == "SpotPriceForecaster(level=0.5)"
+
+
+def test_forecaster_fit():
+    # Two weeks with hourly prices of hour / 10, where the newest week is 1.0 DKK/kWh more expensive
+    times = [MONDAY + timedelta(hours=hour) for hour in range(14 * 24)]
+    prices = [time.hour / 10 + (1.0 if time >= MONDAY + timedelta(days=7) else 0.0) for time in times]
+
+    forecaster = SpotPriceForecaster.fit(times, prices)
+    weight = 0.5 ** (7 / 14)    # Weight of the oldest week relative to the newest
+
+    assert forecaster.profile[0, 5] == pytest.approx(0.5 + 1.0 / (1 + weight))
+    assert forecaster.level == pytest.approx(1.0 - 1.0 / (1 + weight))
+    next_monday = pd.date_range(MONDAY + timedelta(days=14), periods=24, freq='h')
+    assert forecaster.forecast(next_monday) == pytest.approx(np.arange(24) / 10 + 1.0)
+
+
+def test_forecaster_fit_fallback():
+    # Only Monday prices, so every other weekday falls back to the average of its hour
+    times = [MONDAY + timedelta(hours=hour) for hour in range(12)]
+    forecaster = SpotPriceForecaster.fit(times, [1.0] * 12)
+
+    assert forecaster.profile[3, 6] == pytest.approx(1.0)
+    # Hours without any prices fall back to the average of every price
+    assert forecaster.profile[3, 18] == pytest.approx(1.0)
+    assert forecaster.level == pytest.approx(0.0)
+
+
+def test_horizon_end():
+    assert horizon_end(datetime(2023, 10, 2, 0, 5, 0)) == datetime(2023, 10, 3, 23, 0, 0)
+    assert horizon_end(datetime(2023, 10, 2, 23, 58, 0)) == datetime(2023, 10, 3, 23, 0, 0)
+
+
+def test_extend_spot_prices(forecaster: SpotPriceForecaster):
+    spot_prices = [SpotPrice(MONDAY + timedelta(hours=hour), 'DK1', 1.0) for hour in range(14, 24)]
+    end = horizon_end(MONDAY + timedelta(hours=10))
+
+    extended = extend_spot_prices(spot_prices, forecaster, end)
+
+    assert extended[:10] == spot_prices
+    assert len(extended) == 34
+    assert extended[-1].time == end
+    assert extended[-1].price == pytest.approx(2.3 + 0.5)
+    assert all(spot_price.forecast for spot_price in extended[10:])
+    assert all(spot_price.price_area == 'DK1' for spot_price in extended)
+    # Published prices already reaching the end are not extended
+    assert extend_spot_prices(extended, forecaster, end) is extended
+    assert extend_spot_prices([], forecaster, end) == []
+
+
+def test_extend_with_forecast_backfill(history):
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    spot_prices = [SpotPrice(today + timedelta(hours=hour), 'DK1', 1.0) for hour in range(24)]
+
+    # A failed history fetch keeps the published prices
+    assert extend_with_forecast(spot_prices) == spot_prices
+    assert len(history) == 1
+
+    # Too few prices are still archived, but the history is not fetched again within the cooldown
+    extended = extend_with_forecast(spot_prices)
+    assert len(history) == 1
+    assert extended[-1].time == horizon_end(datetime.now())
+    assert all(spot_price.forecast for spot_price in extended[24:])
+
+    spot_forecast._backfills['DK1'] -= BACKFILL_COOLDOWN
+    extend_with_forecast(spot_prices)
+    assert len(history) == 2
+    assert len(FakeDatabase.rows) == spot_forecast.MIN_HISTORY + 24
+
+    # Prices older than the history are not forecasted from
+    old = [SpotPrice(today - timedelta(days=60), 'DK2', 1.0)]
+    spot_forecast._backfills['DK2'] = datetime.now()
+    assert extend_with_forecast(old) == old
+    assert extend_with_forecast([]) == []
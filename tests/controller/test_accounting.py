@@ -0,0 +1,99 @@
+"""
+Pytests for accounting.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from controller.accounting import hourly_costs, accumulated_costs, hourly_buy_prices, battery_loss
+
+
+START = datetime(2023, 10, 2, 0, 0, 0)
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'Time': [START + timedelta(hours=hour) for hour in range(7)],
+        'Price': [1.2, 1.1, 1.0, 0.9, 2.0, 2.5, 1.5],
+        'SpotPrice': [0.4, 0.3, 0.2, -0.1, 0.8, 1.0, 0.5],
+        'ExpectedConsumption': [0.5, 0.5, 0.4, 0.4, 0.6, 0.8, 0.7],
+    })
+
+
+@pytest.fixture
+def plan():
+    return pd.DataFrame({
+        'Time': [START + timedelta(hours=hour) for hour in range(6)],
+        'Action': ['idle', 'charge', 'charge', 'idle', 'charge', 'equalize'],
+        'SolarSurplus': [-1.0, -0.5, 1.0, 2.0, 4.0, 2.0],
+        'ElNetCharge': [0.0, 2.0, 1.0, 0.0, 0.0, 0.0],
+        'BatteryDelta': [0.0, 2.0, 1.0, 0.0, 1.0, -3.0],
+    })
+
+
+def reference_costs(data, plan, max_rate=3):
+    """ Row by row costs, as the Dash charts calculated them before """
+    rows = []
+    for row in range(len(plan)):
+        action, surplus = plan.at[row, 'Action'], plan.at[row, 'SolarSurplus']
+        price, spot_price = data.at[row, 'Price'], data.at[row, 'SpotPrice']
+        normal_buy = data.at[row, 'ExpectedConsumption'] * price
+        better_buy = (-spot_price * surplus if spot_price > 0 else 0) if surplus > 0 else price * abs(surplus)
+        smart_buy = 0
+        if action == 'idle':
+            if surplus > 0 and spot_price > 0:
+                smart_buy = -spot_price * surplus
+            elif surplus < 0:
+                smart_buy = price * abs(surplus)
+        elif action == 'charge':
+            if surplus < 0:
+                smart_buy = price * (abs(surplus) + plan.at[row, 'ElNetCharge'])
+            elif surplus < max_rate:
+                smart_buy = price * plan.at[row, 'ElNetCharge']
+            elif surplus > max_rate and spot_price > 0:
+                smart_buy = -spot_price * (surplus - max_rate)
+        rows.append([normal_buy, better_buy, smart_buy])
+    return np.array(rows)
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_hourly_costs(data, plan):
+    costs = hourly_costs(data, plan)
+
+    assert list(costs.columns) == ['Time', 'NormalBuy', 'BetterBuy', 'SmartBuy']
+    assert list(costs['Time']) == list(plan['Time'])
+    assert costs[['NormalBuy', 'BetterBuy', 'SmartBuy']].to_numpy() == pytest.approx(reference_costs(data, plan))
+
+
+def test_hourly_costs_max_rate(data, plan):
+    costs = hourly_costs(data, plan, max_rate=5)
+
+    assert costs[['NormalBuy', 'BetterBuy', 'SmartBuy']].to_numpy() == pytest.approx(reference_costs(data, plan, 5))
+    assert costs.at[4, 'SmartBuy'] == pytest.approx(0.0)
+
+
+def test_accumulated_costs(data, plan):
+    costs = accumulated_costs(data, plan)
+
+    assert costs['SmartBuy'].to_numpy() == pytest.approx(np.cumsum(reference_costs(data, plan)[:, 2]))
+    assert costs.iloc[-1]['NormalBuy'] == pytest.approx(sum(data['Price'][:6] * data['ExpectedConsumption'][:6]))
+
+
+def test_hourly_buy_prices(data, plan):
+    prices = hourly_buy_prices(data, plan)
+
+    assert list(prices['NormalBuyPrice']) == list(data['Price'][:6])
+    assert list(prices['BetterBuyPrice']) == pytest.approx([1.2, 1.1, -0.2, 0.0, -0.8, -1.0])
+    assert list(prices['SmartBuyPrice']) == pytest.approx([1.2, 1.1, 1.0, 0.0, -0.8, 0.0])
+
+
+def test_battery_loss(plan):
+    assert list(battery_loss(plan)) == pytest.approx([0.0, 0.2, 0.1, 0.0, 0.1, 0.3])
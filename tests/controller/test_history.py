@@ -0,0 +1,132 @@
+"""
+Pytests for history.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+
+from database import Database
+from database.database import TIME_FORMAT
+from controller.realized_profit import track_profit
+from controller.history import rollup_history, history_period, load_history, lttb
+
+
+START = datetime(2023, 10, 31, 22, 0, 0)
+
+
+def plan_row(time, price):
+    return (datetime.strftime(time, TIME_FORMAT), 'charge', 0.0, 3.0, 3.0, 10.0, 0.0, "Cheapest hour",
+            price, price * 0.8, 0.5, 0.6)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.create_missing_tables()
+    return db
+
+
+@pytest.fixture
+def measured(db):
+    """ Five measured hours with prices 1 to 5, where the battery is charged 5% an hour """
+    hours = [START + timedelta(hours=hour) for hour in range(6)]
+    db.insert_measurements([(datetime.strftime(hour + timedelta(minutes=minute), TIME_FORMAT),
+                             50 + minute / 10, 1.0, 'charge', float(index + 1))
+                            for index, hour in enumerate(hours) for minute in range(0, 60, 10)])
+    db.rollup_measurements(datetime.strftime(START, TIME_FORMAT), datetime.strftime(hours[-1], TIME_FORMAT))
+    db.save_plan([plan_row(hour, float(index + 1)) for index, hour in enumerate(hours)])
+    track_profit(db, hours[-1], capacity=20)
+    return db
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_rollup_history(measured: Database):
+    assert rollup_history(measured, START + timedelta(hours=3, minutes=5)) == 3
+    assert rollup_history(measured, START + timedelta(hours=3, minutes=20)) == 0
+
+    hours = measured.load_history('hour', '', '~')
+    assert [hour['Price'] for hour in hours] == [1.0, 2.0, 3.0]
+    assert [hour['SpotPrice'] for hour in hours] == pytest.approx([0.8, 1.6, 2.4])
+    assert [hour['Savings'] for hour in hours] == pytest.approx([-1.0, -2.0, -3.0])
+
+    # Prices and SoC are averaged, while consumption, solar power and savings are summed
+    days = measured.load_history('day', '', '~')
+    assert [day['Time'] for day in days] == ['2023-10-31, 00:00:00', '2023-11-01, 00:00:00']
+    assert days[0]['Price'] == pytest.approx(1.5)
+    assert days[0]['Soc'] == pytest.approx(52.5)
+    assert days[0]['MinSoc'] == 50 and days[0]['MaxSoc'] == 55
+    assert days[0]['Consumption'] == pytest.approx(2.0)
+    assert days[0]['Solar'] == pytest.approx(1.0)
+    assert days[0]['Savings'] == pytest.approx(-3.0)
+    assert days[0]['Hours'] == 2
+    assert [month['Hours'] for month in measured.load_history('month', '', '~')] == [2, 1]
+
+
+def test_rollup_history_without_plan(db: Database):
+    db.insert_measurements([(datetime.strftime(START, TIME_FORMAT), 50.0, 1.0, 'charge', 1.0)])
+    db.rollup_measurements(datetime.strftime(START, TIME_FORMAT),
+                           datetime.strftime(START + timedelta(hours=1), TIME_FORMAT))
+
+    # Hours without planned values are not rolled up
+    assert rollup_history(db, START + timedelta(hours=2)) == 0
+    assert db.load_last_history_hour() is None
+
+
+def test_history_period():
+    assert history_period(START, START + timedelta(days=30)) == 'hour'
+    assert history_period(START, START + timedelta(days=365)) == 'day'
+    assert history_period(START, START + timedelta(days=3650)) == 'month'
+    assert history_period(START, START + timedelta(days=30), max_points=100) == 'day'
+
+
+def test_load_history(measured: Database):
+    rollup_history(measured, START + timedelta(hours=6))
+    period, history = load_history(measured, START, START + timedelta(days=1))
+
+    assert period == 'hour'
+    assert list(history['Time']) == [START + timedelta(hours=hour) for hour in range(5)]
+
+    period, history = load_history(measured, START, START + timedelta(hours=12), max_points=3)
+    assert period == 'hour'
+    assert len(history) == 3
+    assert history['Time'].iloc[0] == START and history['Time'].iloc[-1] == START + timedelta(hours=4)
+
+
+def test_load_history_max_points(db: Database):
+    rng = np.random.default_rng(7)
+    db.add_history([('hour', datetime.strftime(START + timedelta(hours=hour), TIME_FORMAT),
+                     *rng.normal(1.0, 0.5, 2).tolist(), *rng.uniform(0, 100, 3).tolist(),
+                     *rng.uniform(0, 3, 3).tolist(), 1)
+                    for hour in range(2000)])
+
+    for hours, max_points in ((2000, 500), (40, 10)):
+        period, history = load_history(db, START, START + timedelta(hours=hours), max_points)
+        assert period == 'hour'
+        assert len(history) <= max_points
+        assert history['Time'].iloc[0] == START
+        assert history['Time'].iloc[-1] == START + timedelta(hours=hours - 1)
+
+
+def test_lttb():
+    x = np.arange(10, dtype=float)
+    y = np.array([0, 1, 0, 0, 9, 0, 0, -5, 0, 0], dtype=float)
+
+    kept = lttb(x, y, 4)
+    assert list(kept) == [0, 4, 7, 9]
+    assert list(lttb(x, y, 10)) == list(range(10))
+    assert list(lttb(x, y, 2)) == list(range(10))
+
+
+def test_lttb_missing_values():
+    x = np.arange(8, dtype=float)
+    y = np.array([0, np.nan, 5, np.nan, np.nan, np.nan, np.nan, 0], dtype=float)
+
+    kept = lttb(x, y, 4)
+    assert kept[1] == 2
+    assert len(kept) == 4
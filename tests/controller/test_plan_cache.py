@@ -0,0 +1,116 @@
+"""
+Pytests for plan_cache.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+
+from data import Battery
+from controller.plan_worker import encode_frame, decode_frame
+from controller.plan_cache import PlanCache, fingerprint
+from profiling import METRICS
+
+
+START = datetime(2023, 10, 2, 0, 0, 0)
+SETTINGS = {'capacity': 5, 'effectivity': 0.9, 'threshold': 0.0, 'max_rate': 1, 'solar_strategy': 'Sell All',
+            'price_area': 'DK1'}
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({
+        'Time': [START + timedelta(hours=hour) for hour in range(4)],
+        'Price': [1.0, 2.0, 1.5, 0.5],
+        'Power': [0.0, 1.0, 0.5, 0.0],
+        'Forecast': [False, False, True, True],
+    })
+
+
+@pytest.fixture
+def plan_payload(data):
+    return encode_frame(data.assign(Action=['charge', 'idle', 'sell', 'idle']))
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_fingerprint(data: pd.DataFrame):
+    key = fingerprint(SETTINGS, encode_frame(data), Battery(START, 40.2, 0.0))
+
+    assert key == fingerprint(SETTINGS, encode_frame(data), Battery(START, 39.8, 0.3))
+    assert key == fingerprint({**SETTINGS, 'price_area': 'DK2'}, encode_frame(data), Battery(START, 40.0, 0.0))
+    assert key != fingerprint(SETTINGS, encode_frame(data), Battery(START, 41.0, 0.0))
+    assert key != fingerprint({**SETTINGS, 'capacity': 10}, encode_frame(data), Battery(START, 40.0, 0.0))
+    assert key != fingerprint(SETTINGS, encode_frame(data.assign(Price=[1.0, 2.0, 1.5, 0.6])),
+                              Battery(START, 40.0, 0.0))
+    assert key != fingerprint(SETTINGS, encode_frame(data.assign(Action=['idle'] * 4)), Battery(START, 40.0, 0.0))
+
+
+def test_plan_cache_memory(plan_payload, metrics):
+    cache = PlanCache(None, memory_size=2)
+
+    assert cache.get('a') is None
+    cache.put('a', plan_payload)
+    cache.put('b', plan_payload)
+    assert cache.get('a') is plan_payload
+
+    # 'b' is the least recently used plan
+    cache.put('c', plan_payload)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is plan_payload
+    assert metrics.snapshot()['counters'] == {'plan_cache.memory_hits': 2, 'plan_cache.misses': 2}
+    assert cache.__repr__() == "PlanCache(folder=None, plans=2)"
+
+
+def test_plan_cache_disk(plan_payload, data, tmp_path, metrics):
+    PlanCache(str(tmp_path)).put('a', plan_payload)
+
+    # Another process or a restart
+    cache = PlanCache(str(tmp_path))
+    payload = cache.get('a')
+    assert payload is not None and len(cache) == 1
+    assert payload['columns']['Action'][0] == 'text'
+    assert decode_frame(payload).equals(decode_frame(plan_payload))
+    assert metrics.snapshot()['counters'] == {'plan_cache.disk_hits': 1}
+
+    (tmp_path / 'b.npz').write_text("Not a plan")
+    assert cache.get('b') is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert os.listdir(tmp_path) == []
+    assert cache.get('a') is None
+
+
+def test_plan_cache_disk_size(plan_payload, tmp_path):
+    for index, key in enumerate(['a', 'b', 'c']):
+        PlanCache(str(tmp_path)).put(key, plan_payload)
+        os.utime(tmp_path / f"{key}.npz", (index, index))
+
+    PlanCache(str(tmp_path), disk_size=2).put('d', plan_payload)
+    assert sorted(os.listdir(tmp_path)) == ['c.npz', 'd.npz']
+
+
+def test_plan_cache_failed_store(plan_payload, tmp_path, capsys):
+    (tmp_path / 'file').write_text("")
+    cache = PlanCache(str(tmp_path / 'file'))
+
+    cache.put('a', plan_payload)
+    assert "Could not write" in capsys.readouterr().out
+    assert cache.get('a') is plan_payload
+
+    cache.clear()
+    assert len(cache) == 0
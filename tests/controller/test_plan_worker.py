@@ -0,0 +1,106 @@
+"""
+Pytests for plan_worker.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+from data import Battery
+from controller.planner import Planner
+from controller.plan_worker import encode_frame, decode_frame, plan, warm_up, ready
+from controller.plan_cache import PlanCache
+from profiling import METRICS
+
+
+PRICES = [1.2, 1.1, 1.0, 0.9, 0.9, 1.4, 2.5, 3.1, 2.8, 2.0, 1.6, 1.2,
+          1.0, 0.9, 1.1, 1.5, 2.4, 3.5, 3.8, 3.0, 2.2, 1.8, 1.5, 1.3]
+POWER = [0, 0, 0, 0, 0, 0, 0.1, 0.5, 1.2, 2.1, 3.0, 3.6,
+         3.8, 3.4, 2.6, 1.6, 0.7, 0.1, 0, 0, 0, 0, 0, 0]
+SETTINGS = {'capacity': 5, 'effectivity': 0.9, 'threshold': 0.0, 'max_rate': 1, 'solar_strategy': 'Sell All'}
+
+
+@pytest.fixture
+def data():
+    start = datetime(2023, 10, 2, 0, 0, 0)
+    return pd.DataFrame({
+        'Time': [start + timedelta(hours=hour) for hour in range(24)],
+        'Price': PRICES,
+        'SpotPrice': [round(price * 0.4, 4) for price in PRICES],
+        'Power': POWER,
+        'ExpectedConsumption': [0.5] * 24,
+    })
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_encode_decode_frame(data: pd.DataFrame):
+    frame = data.assign(Action=['idle', 'charge'] * 12, Forecast=[False] * 12 + [True] * 12)
+    payload = encode_frame(frame)
+    decoded = decode_frame(payload)
+
+    assert payload['columns']['Time'][0] == 'time'
+    assert payload['columns']['Action'][0] == 'text'
+    assert list(payload['columns']['Action'][1][0]) == ['charge', 'idle']
+    assert list(decoded.columns) == list(frame.columns)
+    assert (decoded['Time'] == frame['Time']).all()
+    assert (decoded['Price'] == frame['Price']).all()
+    assert list(decoded['Action']) == list(frame['Action'])
+    assert payload['columns']['Forecast'][0] == 'flag'
+    assert decoded['Forecast'].dtype == bool
+    assert list(decoded['Forecast']) == list(frame['Forecast'])
+
+
+def test_encode_decode_many_categories():
+    frame = pd.DataFrame({'Reason': [f"Reason {index}" for index in range(300)] * 2})
+    payload = encode_frame(frame)
+
+    assert payload['columns']['Reason'][1][1].dtype == np.int16
+    assert list(decode_frame(payload)['Reason']) == list(frame['Reason'])
+
+
+def test_plan(data: pd.DataFrame):
+    battery = Battery(data.at[0, 'Time'], 0.0, 0.0)
+    expected = Planner(SETTINGS, data=data, battery=battery).plan
+    result = decode_frame(plan(SETTINGS, encode_frame(data), battery, cache=None))
+
+    assert list(result.columns) == list(expected.columns)
+    assert list(result['Action']) == list(expected['Action'])
+    assert (result['BatteryExpected'] == expected['BatteryExpected']).all()
+
+
+def test_plan_cached(data: pd.DataFrame, tmp_path):
+    battery = Battery(data.at[0, 'Time'], 0.0, 0.0)
+    cache = PlanCache(str(tmp_path))
+    METRICS.reset()
+
+    planned = plan(SETTINGS, encode_frame(data), battery, cache)
+    assert planned['metrics']['counters'] == {'plan_cache.misses': 1}
+    assert 'planner.total' in planned['metrics']['timers']
+
+    cached = plan(SETTINGS, encode_frame(data), battery, cache)
+    assert cached['metrics'] == {'timers': {}, 'counters': {'plan_cache.memory_hits': 1}}
+    assert decode_frame(cached).equals(decode_frame(planned))
+    assert 'metrics' not in cache.get(next(iter(cache._plans)))
+
+
+def test_plan_in_worker_process(data: pd.DataFrame):
+    battery = Battery(data.at[0, 'Time'], 0.0, 0.0)
+
+    with ProcessPoolExecutor(max_workers=1, initializer=warm_up) as executor:
+        assert executor.submit(ready).result()
+        result = decode_frame(executor.submit(plan, SETTINGS, encode_frame(data), battery, None).result())
+
+    assert len(result) == len(data)
+
+
+def test_warm_up():
+    warm_up()
+
+    assert ready()
@@ -0,0 +1,207 @@
+"""
+Pytests for prefetch.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+
+from data import Electricity, Solar
+from data.electricity.spot_price import SpotPrice
+from data.electricity.tariff import Tariff
+from data.electricity.provider import Provider
+from controller.prefetch import SourceStatus, Prefetcher, build_data, next_prefetch_time, _validate
+
+
+START = datetime(2023, 10, 2, 14, 0, 0)
+END = datetime(2023, 10, 3, 23, 0, 0)
+HOURS = 34
+SETTINGS = {'price_area': 'DK1', 'tariff_company': 'N1 A/S', 'solcast_key': '', 'solcast_ids': ['']}
+
+
+@pytest.fixture
+def times():
+    return [START + timedelta(hours=hour) for hour in range(HOURS)]
+
+
+@pytest.fixture
+def prefetcher(times):
+    prefetcher = Prefetcher({'price_area': 'DK1', 'tariff_company': 'N1 A/S',
+                             'solcast_key': '', 'solcast_ids': ['']})
+    prefetcher._spot_prices = [SpotPrice(time, 'DK1', 0.5) for time in times]
+    prefetcher._tariffs = [Tariff(time, 0.2) for time in times]
+    prefetcher._providers = [Provider(time, 0.1) for time in times]
+    prefetcher._solar = [Solar(time, 1.0) for time in times]
+    prefetcher._expected_consumption = pd.DataFrame({'Time': times, 'ExpectedConsumption': [0.5] * HOURS})
+    return prefetcher
+
+@pytest.fixture
+def getters(times):
+    """ Fake getters with published prices until END and forecasted prices for another day """
+    forecast = [END + timedelta(hours=hour) for hour in range(1, 25)]
+    window_times = lambda window: [time for time in times + forecast if window[0] <= time <= window[1]]
+    return {
+        'spot_prices': lambda settings, window: ([SpotPrice(time, 'DK1', 0.5) for time in times],
+                                                 [SpotPrice(time, 'DK1', 0.5) for time in times + forecast]),
+        'tariffs': lambda settings, window: ([Tariff(time, 0.2) for time in window_times(window)],
+                                             [Provider(time, 0.1) for time in window_times(window)]),
+        'solar': lambda settings, window: [Solar(time, 1.0) for time in window_times(window)],
+        'consumption': lambda settings, window: pd.DataFrame({'Time': window_times(window),
+                                                              'ExpectedConsumption': 0.5}),
+    }
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_source_status_not_fetched():
+    status = SourceStatus('spot_prices')
+
+    assert status.is_stale(START, None)
+    assert not status.is_ready(START, None)
+    assert status.name == 'spot_prices'
+    assert status.fetched_at is None
+    assert status.error == ''
+    assert status.__repr__() == "SourceStatus(name=spot_prices, fetched_at=None, error=)"
+
+
+def test_source_status_spot_prices():
+    fetched_at = datetime(2023, 10, 2, 13, 5, 0)
+    status = SourceStatus('spot_prices', fetched_at, (START, END))
+
+    assert status.is_ready(datetime(2023, 10, 2, 20, 0, 0), None)
+    # Prices for the 4th are published at 13:00 on the 3rd
+    assert status.is_ready(datetime(2023, 10, 3, 12, 50, 0), None)
+    assert status.is_stale(datetime(2023, 10, 3, 13, 0, 0), None)
+    # Too old, even though it would still cover the next hours
+    assert status.is_stale(fetched_at + timedelta(hours=25), None)
+
+
+def test_source_status_dependent_source():
+    status = SourceStatus('solar', START, (START, END))
+
+    assert status.is_ready(START + timedelta(minutes=30), (START, END))
+    assert status.is_stale(START + timedelta(minutes=30), (START + timedelta(hours=1), END))
+    assert status.is_stale(START + timedelta(hours=2), (START, END))
+    assert SourceStatus('solar', START, (START, END), "HTTPError").is_stale(START, (START, END))
+
+
+def test_prefetcher_not_ready(prefetcher: Prefetcher):
+    assert not prefetcher.is_ready(START)
+    assert prefetcher.time_window is None
+    assert prefetcher.collect(START) is None
+    assert list(prefetcher.status) == ['spot_prices', 'tariffs', 'solar', 'consumption']
+
+
+def test_prefetcher_collect(prefetcher: Prefetcher):
+    fetched_at = datetime(2023, 10, 2, 13, 50, 0)
+    for source in prefetcher.status:
+        prefetcher._set_status(SourceStatus(source, fetched_at, (START, END)))
+
+    current_time = datetime(2023, 10, 2, 14, 30, 0)
+    data = prefetcher.collect(current_time)
+
+    assert prefetcher.is_ready(current_time)
+    assert prefetcher.time_window == (START, END)
+    assert list(data.columns) == ['Time', 'Price', 'SpotPrice', 'Forecast', 'Power', 'ExpectedConsumption']
+    assert data.at[0, 'Time'] == START + timedelta(hours=1)
+    assert len(data) == HOURS - 1
+    assert data.at[0, 'Price'] == Electricity(prefetcher._spot_prices[1], prefetcher._tariffs[1],
+                                              prefetcher._providers[1]).price
+
+    prefetcher.update_settings({'price_area': 'DK2', 'tariff_company': 'N1 A/S', 'solcast_key': '', 'solcast_ids': ['']})
+    assert not prefetcher.is_ready(current_time)
+    assert "fetched_at=None" in prefetcher.__repr__()
+
+
+def test_prefetcher_planning_window(prefetcher: Prefetcher):
+    fetched_at = datetime(2023, 10, 2, 13, 50, 0)
+    planning_window = (START, END + timedelta(hours=24))
+    prefetcher._set_status(SourceStatus('spot_prices', fetched_at, (START, END)))
+    prefetcher._planning_window = planning_window
+    for source in ['tariffs', 'solar', 'consumption']:
+        prefetcher._set_status(SourceStatus(source, fetched_at, planning_window))
+
+    # Dependent sources cover the forecasted hours, while the published prices decide when to fetch again
+    assert prefetcher.time_window == planning_window
+    assert prefetcher.is_ready(datetime(2023, 10, 2, 14, 30, 0))
+    assert prefetcher.status['spot_prices'].is_stale(datetime(2023, 10, 3, 13, 0, 0), prefetcher.time_window)
+
+    prefetcher.update_settings({'price_area': 'DK1', 'tariff_company': 'N1 A/S', 'solcast_key': '', 'solcast_ids': ['']})
+    assert prefetcher.time_window is None
+
+
+def test_build_data(times):
+    electricity = [Electricity(SpotPrice(time, 'DK1', 1.0), Tariff(time, 0.0), Provider(time, 0.0)) for time in times]
+    solar = [Solar(time, 2.0) for time in times]
+    expected_consumption = pd.DataFrame({'Time': times, 'ExpectedConsumption': [0.5] * HOURS})
+
+    data = build_data(electricity, solar, expected_consumption, END - timedelta(hours=2))
+
+    assert list(data['Time']) == [END - timedelta(hours=1), END]
+    assert list(data['SpotPrice']) == [1.0, 1.0]
+
+
+def test_next_prefetch_time():
+    assert next_prefetch_time(datetime(2023, 10, 2, 9, 10, 0), True) == datetime(2023, 10, 2, 9, 50, 0)
+    assert next_prefetch_time(datetime(2023, 10, 2, 9, 55, 0), True) == datetime(2023, 10, 2, 10, 50, 0)
+    assert next_prefetch_time(datetime(2023, 10, 2, 12, 55, 0), True) == datetime(2023, 10, 2, 13, 0, 0)
+    assert next_prefetch_time(datetime(2023, 10, 2, 13, 0, 0), False) == datetime(2023, 10, 2, 13, 5, 0)
+    assert next_prefetch_time(datetime(2023, 10, 2, 13, 48, 0), False) == datetime(2023, 10, 2, 13, 50, 0)
+
+
+def test_prefetcher_refresh(getters):
+    prefetcher = Prefetcher(SETTINGS, getters)
+    fetched_at = datetime(2023, 10, 2, 13, 50, 0)
+    status = prefetcher.refresh(fetched_at)
+    planning_window = (START, END + timedelta(hours=24))
+
+    # Dependent sources are fetched for the forecasted hours, while the published prices decide staleness
+    assert status['spot_prices'].time_window == (START, END)
+    assert prefetcher.time_window == planning_window
+    assert all(status[source].time_window == planning_window for source in ['tariffs', 'solar', 'consumption'])
+    assert all(source.fetched_at == fetched_at and source.error == '' for source in status.values())
+    assert len(prefetcher.collect(fetched_at)) == HOURS + 24
+
+    # Sources that are not stale are not fetched again
+    getters['solar'] = lambda settings, window: pytest.fail("Solar is not stale")
+    assert prefetcher.refresh(fetched_at + timedelta(minutes=5))['solar'].fetched_at == fetched_at
+
+
+def test_prefetcher_refresh_waiting_for_spot_prices(getters):
+    getters['spot_prices'] = lambda settings, window: ([], [])
+    status = Prefetcher(SETTINGS, getters).refresh(START)
+
+    assert status['spot_prices'].error == "ValueError: No spot prices found"
+    assert all(status[source].error == "Waiting for spot prices" for source in ['tariffs', 'solar', 'consumption'])
+
+
+def test_prefetcher_refresh_errors(getters, times):
+    def failing(settings, window):
+        raise ConnectionError("Solcast is down")
+
+    getters['solar'] = failing
+    getters['consumption'] = lambda settings, window: pd.DataFrame({'Time': times[1:], 'ExpectedConsumption': 0.5})
+    prefetcher = Prefetcher(SETTINGS, getters)
+    status = prefetcher.refresh(START)
+
+    assert status['solar'].error == "ConnectionError: Solcast is down"
+    assert status['solar'].fetched_at is None
+    assert status['consumption'].error.startswith("ValueError: consumption does not cover")
+    assert status['tariffs'].error == ''
+    assert not prefetcher.is_ready(START)
+    assert prefetcher.collect(START) is None
+
+
+def test_validate():
+    window = (START, END)
+
+    assert _validate('solar', [START, END], window) == window
+    assert _validate('solar', [START - timedelta(hours=1), END + timedelta(hours=1)], window) == window
+
+    for times in ([], [START + timedelta(hours=1), END], [START, END - timedelta(hours=1)]):
+        with pytest.raises(ValueError, match="solar does not cover"):
+            _validate('solar', times, window)
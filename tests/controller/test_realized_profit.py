@@ -0,0 +1,105 @@
+"""
+Pytests for realized_profit.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+from datetime import datetime, timedelta
+
+from database import Database
+from database.database import TIME_FORMAT
+from controller.realized_profit import hourly_profit, period_starts, track_profit, load_profit_totals
+
+
+START = datetime(2023, 10, 31, 22, 0, 0)
+
+
+def measurements(hours, start=START):
+    """ Measurements every 10 minutes, where the battery is charged 5% an hour at 1 kr and discharged at 3 kr """
+    rows = []
+    for hour in range(hours):
+        charge = (start + timedelta(hours=hour)).hour % 2 == 0
+        for minute in range(0, 60, 10):
+            time = start + timedelta(hours=hour, minutes=minute)
+            soc = 50 + (minute / 10) * (1 if charge else -1)
+            rows.append((datetime.strftime(time, TIME_FORMAT), soc, 2.0 if charge else 0.5,
+                         'charge' if charge else 'idle', 1.0 if charge else 3.0))
+    return rows
+
+
+def as_dicts(rows):
+    return [dict(zip(['Time', 'Soc', 'NetRate', 'Action', 'Price'], row)) for row in rows]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    db.create_missing_tables()
+    return db
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_hourly_profit():
+    rows = as_dicts(measurements(2))
+    rows[-1]['Price'] = float('nan')    # A missing price is left out of the average
+    profit = hourly_profit(rows, capacity=20)
+
+    assert list(profit['Time']) == ['2023-10-31, 22:00:00', '2023-10-31, 23:00:00']
+    assert list(profit['BatteryDelta']) == pytest.approx([1.0, -1.0])
+    assert list(profit['Cost']) == pytest.approx([2.0, 1.5])
+    assert list(profit['BaselineCost']) == pytest.approx([1.0, 4.5])
+    assert list(profit['Profit']) == pytest.approx([-1.0, 3.0])
+
+
+def test_hourly_profit_without_price():
+    rows = as_dicts(measurements(1))
+    for row in rows:
+        row['Price'] = float('nan')
+
+    assert hourly_profit(rows, capacity=20).empty
+    assert list(hourly_profit([], capacity=20).columns) == ['Time', 'Consumption', 'BatteryDelta', 'Cost',
+                                                            'BaselineCost', 'Profit']
+
+
+def test_period_starts():
+    assert period_starts('2023-10-31, 22:00:00') == ['2023-10-31, 22:00:00', '2023-10-31, 00:00:00',
+                                                     '2023-10-01, 00:00:00', '']
+
+
+def test_track_profit(db: Database):
+    db.insert_measurements(measurements(4))
+    assert db.load_last_profit_hour() is None
+
+    # The current hour (01:00) is not complete, so it is accounted later
+    assert track_profit(db, START + timedelta(hours=3, minutes=5), capacity=20) == 3
+    assert db.load_last_profit_hour() == '2023-11-01, 00:00:00'
+    assert track_profit(db, START + timedelta(hours=3, minutes=20), capacity=20) == 0
+    assert track_profit(db, START + timedelta(hours=4), capacity=20) == 1
+
+    hours = db.load_profit('hour', '', '~')
+    assert [row['Profit'] for row in hours] == pytest.approx([-1.0, 3.0, -1.0, 3.0])
+    assert [row['Profit'] for row in db.load_profit('day', '', '~')] == pytest.approx([2.0, 2.0])
+    assert [row['Hours'] for row in db.load_profit('month', '', '~')] == [2, 2]
+    assert db.load_profit('total', '', '~')[0]['Profit'] == pytest.approx(4.0)
+
+
+def test_track_profit_backlog(db: Database):
+    db.insert_measurements(measurements(2))
+
+    # Hours older than the raw measurement retention are not accounted
+    assert track_profit(db, START + timedelta(days=8), capacity=20) == 0
+    assert db.load_last_profit_hour() is None
+
+
+def test_load_profit_totals(db: Database):
+    assert load_profit_totals(db, START) == {'today': 0.0, 'month': 0.0, 'total': 0.0}
+
+    db.insert_measurements(measurements(4))
+    track_profit(db, START + timedelta(hours=4), capacity=20)
+
+    assert load_profit_totals(db, START + timedelta(hours=4)) == {'today': 2.0, 'month': 2.0, 'total': 4.0}
+    assert load_profit_totals(db, START) == {'today': 2.0, 'month': 2.0, 'total': 4.0}
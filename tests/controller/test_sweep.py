@@ -0,0 +1,104 @@
+"""
+Pytests for sweep.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+
+from controller.sweep import Sweep, load_archive, calculate_savings, _init_worker, _run_configuration
+
+
+PRICES = [1.2, 1.1, 1.0, 0.9, 0.9, 1.4, 2.5, 3.1, 2.8, 2.0, 1.6, 1.2,
+          1.0, 0.9, 1.1, 1.5, 2.4, 3.5, 3.8, 3.0, 2.2, 1.8, 1.5, 1.3]
+POWER = [0, 0, 0, 0, 0, 0, 0.1, 0.5, 1.2, 2.1, 3.0, 3.6,
+         3.8, 3.4, 2.6, 1.6, 0.7, 0.1, 0, 0, 0, 0, 0, 0]
+CONSUMPTION = [0.4, 0.3, 0.3, 0.3, 0.3, 0.5, 0.9, 1.2, 0.8, 0.6, 0.5, 0.6,
+               0.7, 0.6, 0.6, 0.8, 1.3, 1.9, 2.1, 1.6, 1.2, 0.9, 0.7, 0.5]
+
+
+@pytest.fixture
+def data():
+    start = datetime(2023, 10, 2, 0, 0, 0)
+    return pd.DataFrame({
+        'Time': [start + timedelta(hours=hour) for hour in range(24)],
+        'Price': PRICES,
+        'SpotPrice': [round(price * 0.4, 4) for price in PRICES],
+        'Power': POWER,
+        'ExpectedConsumption': CONSUMPTION,
+    })
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_sweep_configurations(data: pd.DataFrame):
+    sweep = Sweep([data], {'capacity': [10, 20], 'max_rate': [2, 3], 'solar_strategy': ['Sell All', 'Save All']})
+
+    assert len(sweep.configurations) == 8
+    assert sweep.configurations[0] == {'capacity': 10, 'effectivity': 0.9, 'threshold': 0.0,
+                                       'max_rate': 2, 'solar_strategy': 'Sell All'}
+    assert sweep.__repr__() == "Sweep(days=1, configurations=8)"
+
+
+def test_sweep_unknown_setting(data: pd.DataFrame):
+    with pytest.raises(ValueError):
+        Sweep([data], {'price_area': ['DK1']})
+
+
+def test_sweep_run(data: pd.DataFrame):
+    sweep = Sweep([data, data], {'capacity': [5], 'max_rate': [1, 2], 'solar_strategy': ['Sell All', 'Save All']})
+    results = sweep.run(max_workers=1)
+
+    assert len(results) == 4
+    assert list(results.columns[-3:]) == ['NormalBuy', 'SmartBuy', 'Savings']
+    assert results['NormalBuy'].nunique() == 1
+    assert results['Savings'].is_monotonic_decreasing
+    assert (results['Savings'] == (results['NormalBuy'] - results['SmartBuy']).round(2)).all()
+
+
+def test_run_configuration(data: pd.DataFrame):
+    _init_worker([data])
+    configuration = {'capacity': 5, 'effectivity': 0.9, 'threshold': 0.0, 'max_rate': 1, 'solar_strategy': 'Sell All'}
+    row = _run_configuration(configuration)
+
+    assert row[:5] == list(configuration.values())
+    assert row[-1] == round(row[-3] - row[-2], 2)
+
+
+def test_run_configuration_planner_failure(data: pd.DataFrame):
+    _init_worker([data])
+    row = _run_configuration({'capacity': 5})
+
+    assert row[0] == 5
+    assert all(pd.isna(value) for value in row[1:])
+
+
+def test_calculate_savings(data: pd.DataFrame):
+    plan = pd.DataFrame({
+        'Time': data['Time'][:5],
+        'Action': ['idle', 'charge', 'charge', 'charge', 'equalize'],
+        'SolarSurplus': [-1.0, -0.5, 1.0, 4.0, 2.0],
+        'ElNetCharge': [0.0, 2.0, 1.0, 0.0, 0.0],
+    })
+    normal_buy, smart_buy = calculate_savings(data.loc[:4], plan, max_rate=3)
+
+    expected_normal_buy = sum(price * consumption for price, consumption in zip(PRICES[:5], CONSUMPTION[:5]))
+    expected_smart_buy = 1.2 * 1.0 + 1.1 * 2.5 + 1.0 * 1.0 - 0.36 * 1.0
+
+    assert normal_buy == pytest.approx(expected_normal_buy)
+    assert smart_buy == pytest.approx(expected_smart_buy)
+
+
+def test_load_archive(data: pd.DataFrame, tmp_path):
+    csv_file = str(tmp_path / "2023-10-02.csv")
+    data.to_csv(csv_file, index=False)
+
+    first = load_archive([csv_file])
+    second = load_archive([csv_file])
+
+    assert first[0] is second[0]
+    assert first[0]['Time'].iloc[0] == datetime(2023, 10, 2, 0, 0, 0)
@@ -28,6 +28,8 @@ def test_spot_price_class(spot_price: SpotPrice):
     assert spot_price.time == expected_time
     assert spot_price.price_area == expected_price_area
     assert spot_price.price == expected_price
+    assert not spot_price.forecast
+    assert SpotPrice(expected_time, expected_price_area, expected_price, True).forecast
 
 
 def test_spot_price_repr(spot_price: SpotPrice):
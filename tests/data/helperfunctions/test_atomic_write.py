@@ -0,0 +1,44 @@
+"""
+Pytests for atomic_write.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import json
+import pytest
+
+from data.helperfunctions import write_atomic
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / 'cache' / 'metrics.json'
+
+    assert write_atomic(str(path), lambda file: json.dump({'count': 1}, file))
+    assert write_atomic(str(path), lambda file: json.dump({'count': 2}, file))
+    assert json.loads(path.read_text()) == {'count': 2}
+    assert os.listdir(tmp_path / 'cache') == ['metrics.json']
+
+    assert write_atomic(str(tmp_path / 'plan.bin'), lambda file: file.write(b'\x00\x01'), binary=True)
+    assert (tmp_path / 'plan.bin').read_bytes() == b'\x00\x01'
+
+
+def test_write_atomic_failed(tmp_path, capsys):
+    path = tmp_path / 'metrics.json'
+    path.write_text('{"count": 1}')
+
+    def failing(file):
+        file.write('{"count"')
+        raise OSError("No space left on device")
+
+    assert not write_atomic(str(path), failing)
+    assert "Could not write" in capsys.readouterr().out
+    assert json.loads(path.read_text()) == {'count': 1}
+    assert os.listdir(tmp_path) == ['metrics.json']
+
+    (tmp_path / 'file').write_text("")
+    assert not write_atomic(str(tmp_path / 'file' / 'metrics.json'), lambda file: None)
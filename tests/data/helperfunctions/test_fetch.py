@@ -0,0 +1,196 @@
+"""
+Pytests for fetch.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import pytest
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from data.helperfunctions import Fetched, FetchError, Fetcher, CircuitBreaker
+from data.helperfunctions.fetch import RETRIES, FAILURE_THRESHOLD, COOLDOWN
+from profiling import METRICS
+
+
+URL = 'https://api.energidataservice.dk/dataset/Elspotprices'
+
+
+class FakeGet:
+    """ Fake get_data answering with the given responses in turn (an exception is raised) """
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def response(status_code, json=None):
+    return SimpleNamespace(status_code=status_code, json=json)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def fetcher(tmp_path, sleeps, clock):
+    def make(*responses):
+        return Fetcher(str(tmp_path), FakeGet(*responses), sleeps.append, clock)
+    return make
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    METRICS.reset()
+    yield METRICS
+    METRICS.reset()
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_fetch(fetcher, sleeps):
+    fetched = fetcher(response(200, {'records': [1, 2]})).fetch('spot_prices', URL)
+
+    assert fetched.json == {'records': [1, 2]}
+    assert not fetched.stale
+    assert sleeps == []
+    assert fetched.__repr__().startswith("Fetched(fetched_at=")
+
+
+def test_fetch_retries_with_backoff(fetcher, sleeps, metrics):
+    fetcher = fetcher(response(503), OSError("Connection reset"), response(200, {'records': []}))
+    assert fetcher.fetch('spot_prices', URL).json == {'records': []}
+
+    assert len(sleeps) == RETRIES - 1
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+    assert metrics.snapshot()['counters']['fetch.retries'] == RETRIES - 1
+
+
+def test_fetch_does_not_retry_client_errors(fetcher, sleeps):
+    fetcher = fetcher(response(404))
+
+    with pytest.raises(FetchError, match="Status code 404 and nothing is cached"):
+        fetcher.fetch('spot_prices', URL)
+    assert sleeps == []
+
+
+def test_fetch_invalid_json(fetcher, sleeps):
+    with pytest.raises(FetchError, match="ValueError"):
+        fetcher(ValueError("Expecting value")).fetch('spot_prices', URL)
+    assert len(sleeps) == RETRIES - 1
+
+
+def test_fetch_falls_back_to_cache(fetcher, tmp_path, metrics):
+    # From memory
+    down = fetcher(response(200, {'records': [1]}), response(500))
+    fetched = down.fetch('tariffs', URL)
+    assert os.path.exists(tmp_path / 'tariffs.json')
+    stale = down.fetch('tariffs', URL)
+    assert stale.stale and stale.json == {'records': [1]}
+    assert down.stale == {'tariffs': stale.fetched_at}
+
+    # From disk after a restart
+    restarted = fetcher(OSError("Network is unreachable"))
+    stale = restarted.fetch('tariffs', URL)
+    assert stale.stale and stale.json == {'records': [1]}
+    assert stale.fetched_at == fetched.fetched_at
+    assert metrics.snapshot()['counters']['fetch.tariffs.stale'] == 2
+
+    # Fresh data clears the stale source
+    down._get = FakeGet(response(200, {'records': [2]}))
+    assert down.fetch('tariffs', URL).json == {'records': [2]}
+    assert down.stale == {}
+
+
+def test_fetch_failed_store(fetcher, tmp_path, capsys):
+    (tmp_path / 'file').write_text("")
+    fetcher = Fetcher(str(tmp_path / 'file'), FakeGet(response(200, [1]), response(500)), lambda _: None)
+
+    assert fetcher.fetch('solar', URL).json == [1]
+    assert "Could not write" in capsys.readouterr().out
+    assert fetcher.fetch('solar', URL).stale
+
+
+def test_fetch_circuit_breaker(fetcher, clock):
+    fetcher = fetcher(response(200, [1]), response(500))
+    fetcher.fetch('solar', URL)
+
+    for _ in range(FAILURE_THRESHOLD):
+        assert fetcher.fetch('solar', URL).stale
+    assert fetcher.breaker('solar').state == 'open'
+
+    # No requests while the circuit is open
+    requests = len(fetcher._get.urls)
+    assert fetcher.fetch('solar', URL).stale
+    assert len(fetcher._get.urls) == requests
+
+    clock.now = COOLDOWN
+    assert fetcher.breaker('solar').state == 'half-open'
+    fetcher._get.responses = [response(200, [2])]
+    assert fetcher.fetch('solar', URL).json == [2]
+    assert fetcher.breaker('solar').state == 'closed'
+    assert fetcher.__repr__() == "Fetcher(sources=['solar'], stale=[])"
+
+
+def test_circuit_breaker(clock):
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == 'closed'
+    breaker.record_failure()
+    assert not breaker.allow() and breaker.state == 'open'
+
+    clock.now = 10.0
+    assert breaker.allow() and breaker.state == 'half-open'
+    # Only a single trial is allowed at a time
+    assert not breaker.allow()
+
+    # A failed trial opens the circuit again
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.__repr__() == "CircuitBreaker(state=open, failures=3)"
+
+    clock.now = 20.0
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_circuit_breaker_single_trial(clock):
+    breaker = CircuitBreaker(threshold=1, cooldown=10.0, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        allowed = list(executor.map(lambda _: breaker.allow(), range(32)))
+    assert allowed.count(True) == 1
+
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_fetched():
+    fetched = Fetched({'records': []}, None, True)
+    assert fetched.stale and fetched.json == {'records': []} and fetched.fetched_at is None
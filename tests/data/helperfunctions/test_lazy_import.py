@@ -0,0 +1,45 @@
+"""
+Pytests for lazy_import.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import sys
+import types
+import pytest
+
+from data.helperfunctions.lazy_import import lazy_import
+
+
+@pytest.fixture
+def package():
+    module = types.ModuleType('lazy_package')
+    sys.modules['lazy_package'] = module
+    sys.modules['lazy_package.constants'] = types.SimpleNamespace(ANSWER=42)
+    module.__getattr__, module.__dir__ = lazy_import('lazy_package', {'ANSWER': '.constants'})
+    yield module
+    del sys.modules['lazy_package'], sys.modules['lazy_package.constants']
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_lazy_import(package):
+    assert 'ANSWER' not in vars(package)
+    assert 'ANSWER' in dir(package)
+    assert package.ANSWER == 42
+    # Stored in package after the first access
+    assert vars(package)['ANSWER'] == 42
+
+
+def test_lazy_import_unknown_name(package):
+    with pytest.raises(AttributeError):
+        package.QUESTION
+
+
+def test_lazy_package_exports():
+    from data.helperfunctions import Parser
+    from data.helperfunctions.parser import Parser as ParserClass
+
+    assert Parser is ParserClass
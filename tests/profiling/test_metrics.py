@@ -0,0 +1,148 @@
+"""
+Pytests for metrics.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import json
+import pytest
+import threading
+
+from profiling import Metrics, Histogram
+from profiling.metrics import BOUNDS
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def metrics(clock):
+    return Metrics(clock=clock)
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.quantile(0.5) == 0.0
+    assert histogram.mean == 0.0
+
+    for seconds in [0.003, 0.004, 0.004, 0.015, 0.3, 90.0]:
+        histogram.observe(seconds)
+
+    assert histogram.count == 6
+    assert histogram.total == pytest.approx(90.326)
+    assert histogram.max == 90.0
+    assert histogram.buckets[BOUNDS.index(0.005)] == 3
+    assert histogram.buckets[-1] == 1
+
+    # Quantiles are the upper bound of their bucket
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.8) == 0.5
+    assert histogram.quantile(1.0) == 90.0
+    assert histogram.__repr__() == "Histogram(count=6, mean=15.0543)"
+
+    exported = histogram.as_dict()
+    assert exported['p50'] == 0.005 and exported['p95'] == 90.0
+    assert sum(exported['buckets']) == 6
+
+
+def test_histogram_quantile_capped_by_max():
+    histogram = Histogram()
+    histogram.observe(0.0004)
+
+    assert histogram.quantile(0.5) == 0.0004
+
+
+def test_metrics_timer(metrics: Metrics, clock: Clock):
+    with metrics.timer('planner.fix_excess'):
+        clock.now += 0.25
+
+    with pytest.raises(ValueError):
+        with metrics.timer('planner.fix_excess'):
+            clock.now += 0.5
+            raise ValueError("Failed phases are timed as well")
+
+    timers = metrics.snapshot()['timers']
+    assert timers['planner.fix_excess']['count'] == 2
+    assert timers['planner.fix_excess']['total'] == pytest.approx(0.75)
+    assert metrics.__repr__() == "Metrics(timers=1, counters=0)"
+
+
+def test_metrics_timed(metrics: Metrics, clock: Clock):
+    @metrics.timed('http.get_data')
+    def get_data(url):
+        """ Get data """
+        clock.now += 1.5
+        return url
+
+    assert get_data('url') == 'url'
+    assert get_data.__doc__ == " Get data "
+    assert metrics.snapshot()['timers']['http.get_data']['max'] == 1.5
+
+
+def test_metrics_counters(metrics: Metrics):
+    metrics.count('minicon.retries')
+    metrics.count('minicon.retries', 2)
+    metrics.count('http.errors')
+
+    assert metrics.snapshot()['counters'] == {'http.errors': 1, 'minicon.retries': 3}
+
+    metrics.reset()
+    assert metrics.snapshot() == {'timers': {}, 'counters': {}}
+
+
+def test_metrics_drain_and_merge(metrics: Metrics):
+    worker = Metrics()
+    worker.observe('planner.total', 0.2)
+    worker.count('planner.violations')
+    metrics.observe('planner.total', 0.4)
+
+    # Timers and counters of a worker process are added to the metrics of the UI process
+    metrics.merge(worker.drain())
+    metrics.merge(json.loads(json.dumps({'counters': {'planner.violations': 1}})))
+    snapshot = metrics.snapshot()
+
+    assert worker.snapshot() == {'timers': {}, 'counters': {}}
+    assert snapshot['timers']['planner.total']['count'] == 2
+    assert snapshot['timers']['planner.total']['max'] == 0.4
+    assert snapshot['counters'] == {'planner.violations': 2}
+
+
+def test_metrics_threads(metrics: Metrics):
+    def work():
+        for _ in range(1000):
+            metrics.count('calls')
+            metrics.observe('work', 0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.snapshot()['counters']['calls'] == 4000
+    assert metrics.snapshot()['timers']['work']['count'] == 4000
+
+
+def test_metrics_export(metrics: Metrics, tmp_path):
+    metrics.observe('solcast.solars', 2.0)
+    path = tmp_path / "metrics.json"
+
+    metrics.export(str(path))
+    metrics.export(str(path))
+
+    assert json.loads(path.read_text()) == metrics.snapshot()
+    assert [file.name for file in tmp_path.iterdir()] == ["metrics.json"]
@@ -0,0 +1,132 @@
+"""
+Pytests for trace.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+
+from data import Battery
+from controller.planner import Planner
+from profiling import Tracer, TRACER, read_trace
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "trace.jsonl")
+
+
+@pytest.fixture
+def tracer(clock, path):
+    return Tracer(path, clock=clock)
+
+
+@pytest.fixture
+def planner_tracer(path):
+    TRACER.enable(path)
+    yield TRACER
+    TRACER.disable()
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_tracer_disabled(clock):
+    tracer = Tracer(clock=clock)
+
+    tracer.start(hours=24)
+    tracer.event('candidate', hour=1)
+    with tracer.phase('fix_excess'):
+        clock.now += 1000
+
+    tracer.finish()
+    assert not tracer.enabled
+    assert tracer.path is None
+    assert tracer.__repr__() == "Tracer(path=None, events=0)"
+
+
+def test_tracer(tracer: Tracer, clock: Clock, path):
+    tracer.start(hours=24)
+    clock.now += 5_000
+    with tracer.phase('fix_excess'):
+        clock.now += 20_000
+        tracer.event('candidate', hour=5, price=1.2)
+        clock.now += 3_000
+    assert tracer.__repr__() == f"Tracer(path={path}, events=3)"
+    tracer.finish(violations=0)
+
+    events = list(read_trace(path))
+    assert [event['event'] for event in events] == ['start', 'candidate', 'phase', 'end']
+    assert events[0]['hours'] == 24 and events[0]['trace'] == 1
+    assert events[1] == {'trace': 1, 'us': 25, 'event': 'candidate', 'hour': 5, 'price': 1.2}
+    assert events[2]['name'] == 'fix_excess' and events[2]['duration_us'] == 23
+    assert events[3]['violations'] == 0
+
+    # Traces are appended, and a finished trace is not written again
+    tracer.finish()
+    tracer.start()
+    tracer.finish()
+    assert [event['trace'] for event in read_trace(path)] == [1, 1, 1, 1, 2, 2]
+
+
+def test_tracer_phase_raises(tracer: Tracer, path):
+    tracer.start()
+    with pytest.raises(ValueError):
+        with tracer.phase('peak_actions'):
+            raise ValueError("Phases are traced even when they fail")
+
+    tracer.finish()
+    assert [event['event'] for event in read_trace(path)] == ['start', 'phase', 'end']
+
+
+def test_tracer_enable_and_disable(clock, path):
+    tracer = Tracer(clock=clock)
+    tracer.enable(path)
+    tracer.start()
+    tracer.event('candidate', hour=1)
+
+    # An unfinished trace is dropped
+    tracer.disable()
+    tracer.enable(path)
+    tracer.finish()
+
+    with pytest.raises(FileNotFoundError):
+        list(read_trace(path))
+
+
+def test_planner_trace(planner_tracer: Tracer, path):
+    start = datetime(2023, 10, 2, 0, 0, 0)
+    data = pd.DataFrame({
+        'Time': [start + timedelta(hours=hour) for hour in range(6)],
+        'Price': [1.0, 3.0, 0.5, 3.5, 1.0, 2.0],
+        'SpotPrice': [0.4, 1.2, 0.2, 1.4, 0.4, 0.8],
+        'Power': [0.0, 0.0, 0.0, 0.0, 2.0, 0.0],
+        'ExpectedConsumption': [0.5] * 6,
+    })
+    settings = {'capacity': 5, 'effectivity': 0.9, 'threshold': 0.0, 'max_rate': 1, 'solar_strategy': 'Sell All'}
+    plan = Planner(settings, data=data, battery=Battery(start, 0.0, 0.0)).plan
+    events = list(read_trace(path))
+
+    assert events[0]['event'] == 'start' and events[0]['hours'] == 6
+    assert [event['name'] for event in events if event['event'] == 'phase'] == \
+           ['first_calculation', 'refill_buffer', 'fix_excess', 'peak_actions', 'sell_timeframe_surplus',
+            'sell_or_use_solar', 'check_violations']
+    assert any(event['event'] == 'candidate' for event in events)
+    assert [event['reason'] for event in events if event['event'] == 'hour'] == list(plan['ActionReason'])
+    assert events[-1]['event'] == 'end'
@@ -0,0 +1,119 @@
+"""
+Pytests for api.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import json
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+from data import Battery
+from database import Database
+from service.api import Api, frame_to_columns
+from profiling import Metrics
+
+
+START = datetime(2023, 10, 2, 12, 0, 0)
+
+
+@pytest.fixture
+def scheduler():
+    times = [START + timedelta(hours=hour) for hour in range(3)]
+    return SimpleNamespace(plan=pd.DataFrame({'Time': times, 'Action': ['charge', 'idle', 'sell']}),
+                           data=pd.DataFrame({'Time': times, 'Price': [1.0, float('nan'), 2.5]}),
+                           plan_version=1, battery=Battery(START, 55.0, 0.4))
+
+
+@pytest.fixture
+def api(scheduler, tmp_path):
+    name = str(tmp_path / "database.db")
+    db = Database(name)
+    db.create_missing_tables()
+    db.insert_measurements([("2023-10-02, 12:00:00", 50.0, 0.5, 'charge', 1.0),
+                            ("2023-10-02, 12:01:00", 51.0, 0.5, 'charge', 1.0),
+                            ("2023-10-03, 12:00:00", 60.0, 0.2, 'idle', 1.2)])
+    return Api(scheduler, lambda: {'action': 'charge'}, database=name)
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_frame_to_columns(scheduler):
+    columns = frame_to_columns(scheduler.data)
+
+    assert columns == {'Time': ['2023-10-02T12:00:00', '2023-10-02T13:00:00', '2023-10-02T14:00:00'],
+                       'Price': [1.0, None, 2.5]}
+
+
+def test_api_plan(api: Api, scheduler):
+    response = api.plan({})
+    body = json.loads(response.body)
+
+    assert body['version'] == 1
+    assert body['columns']['Action'] == ['charge', 'idle', 'sell']
+    # Encoded once for every plan version
+    assert api.plan({}) is response
+    assert api.data({}) is not response
+
+    scheduler.plan_version = 2
+    scheduler.plan = scheduler.plan.assign(Action=['idle'] * 3)
+    updated = api.plan({'format': 'json'})
+
+    assert updated.etag != response.etag
+    assert json.loads(updated.body)['columns']['Action'] == ['idle'] * 3
+    assert api.plan({'format': 'csv'}).status == 400
+
+
+def test_api_status_and_battery(api: Api):
+    assert json.loads(api.status({}).body) == {'action': 'charge'}
+    assert json.loads(api.battery({}).body) == {'time': '2023-10-02T12:00:00', 'soc': 55.0, 'real_consumption': 0.4}
+    assert list(api.routes) == ['/status', '/plan', '/data', '/battery', '/history', '/rollups', '/metrics']
+    assert api.__repr__() == "Api(routes=['/status', '/plan', '/data', '/battery', '/history', '/rollups', '/metrics'])"
+
+
+def test_api_history(api: Api):
+    body = json.loads(api.history({'start': '2023-10-02T12:00:00', 'end': '2023-10-03T00:00:00'}).body)
+
+    assert body['hourly'] is False
+    assert body['columns']['Time'] == ['2023-10-02T12:00:00', '2023-10-02T12:01:00']
+    assert body['columns']['Soc'] == [50.0, 51.0]
+
+    hourly = json.loads(api.history({'start': '2023-10-02T12:00:00', 'hourly': '1'}).body)
+    assert hourly == {'hourly': True, 'columns': {}}
+
+    assert api.history({}).status == 400
+
+    # Times with a UTC offset are converted to local time
+    aware = datetime(2023, 10, 2, 12, 0).astimezone().isoformat()
+    assert json.loads(api.history({'start': aware, 'end': '2023-10-03T00:00:00'}).body) == body
+    assert api.history({'start': 'yesterday'}).status == 400
+
+
+def test_api_rollups(api: Api):
+    db = Database(api._database)
+    db.add_history([('hour', '2023-10-02, 12:00:00', 1.0, 0.8, 50.0, 49.0, 51.0, 0.5, 0.2, 0.1, 1),
+                    ('hour', '2023-10-02, 13:00:00', 2.0, 1.6, 55.0, 54.0, 56.0, 0.4, 0.0, 0.3, 1)])
+    body = json.loads(api.rollups({'start': '2023-10-02T12:00:00', 'end': '2023-10-03T00:00:00'}).body)
+
+    assert body['period'] == 'hour'
+    assert body['columns']['Time'] == ['2023-10-02T12:00:00', '2023-10-02T13:00:00']
+    assert body['columns']['Price'] == [1.0, 2.0]
+
+    assert api.rollups({'start': '2023-10-02T12:00:00', 'points': 'many'}).status == 400
+    assert api.rollups({'start': '2023-10-01T00:00:00+00:00'}).status == 200
+    assert api.blocking == ('/history', '/rollups')
+
+
+def test_api_metrics(api: Api, monkeypatch):
+    metrics = Metrics()
+    metrics.observe('planner.total', 0.3)
+    metrics.count('http.errors')
+    monkeypatch.setattr('service.api.METRICS', metrics)
+    body = json.loads(api.metrics({}).body)
+
+    assert body['timers']['planner.total']['count'] == 1
+    assert body['counters'] == {'http.errors': 1}
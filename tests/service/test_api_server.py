@@ -0,0 +1,126 @@
+"""
+Pytests for api_server.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import json
+import asyncio
+import pytest
+import numpy as np
+from datetime import datetime
+
+from service.api_server import ApiServer, Response, json_response, build_response
+
+
+def raising(query):
+    raise TypeError("can't subtract offset-naive and offset-aware datetimes")
+
+
+@pytest.fixture
+def server():
+    return ApiServer({'/status': lambda query: json_response({'action': 'charge', **query}),
+                      '/broken': lambda query: json_response({'error': "Broken"}, 500),
+                      '/raising': raising},
+                     blocking=['/raising'])
+
+
+async def request(server, raw):
+    await server.start(port=0)
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+    writer.write(raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await server.stop()
+    return response
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_respond(server: ApiServer):
+    response = server.respond("GET /status HTTP/1.1")
+
+    assert response.status == 200
+    assert json.loads(response.body) == {'action': 'charge'}
+    assert response.etag.startswith('"')
+    assert json.loads(server.respond("GET /status?verbose=1 HTTP/1.1").body)['verbose'] == '1'
+    assert server.respond("POST /status HTTP/1.1").status == 405
+    assert server.respond("GET /plan HTTP/1.1").status == 404
+    assert server.respond("GET /broken HTTP/1.1").etag == ''
+    assert server.respond("").status == 400
+
+    response = server.respond("GET /raising HTTP/1.1")
+    assert response.status == 500
+    assert json.loads(response.body) == {'error': "TypeError: can't subtract offset-naive and offset-aware datetimes"}
+
+
+def test_respond_not_modified(server: ApiServer):
+    etag = server.respond("GET /status HTTP/1.1").etag
+    response = server.respond("GET /status HTTP/1.1", {'if-none-match': f'"other", {etag}'})
+
+    assert response.status == 304
+    assert response.body == b''
+    assert response.etag == etag
+    assert server.respond("GET /status HTTP/1.1", {'if-none-match': '"other"'}).status == 200
+
+
+def test_json_response():
+    response = json_response({'soc': np.float64(0.5), 'samples': np.int64(3)})
+
+    assert response.body == b'{"soc":0.5,"samples":3}'
+    assert response.content_type == 'application/json'
+    assert response.__repr__() == "Response(status=200, content_type=application/json, size=23)"
+    assert json_response({'time': datetime(2023, 10, 2, 12, 0)}).body == b'{"time":"2023-10-02T12:00:00"}'
+
+    with pytest.raises(TypeError, match="object is not JSON serializable"):
+        json_response({'value': object()})
+
+
+def test_build_response():
+    message = build_response(Response(404, b'{"error":"No route"}'))
+    header, body = message.split(b'\r\n\r\n')
+
+    assert header.startswith(b'HTTP/1.1 404 Not Found')
+    assert f"Content-Length: {len(body)}".encode() in header
+    assert b'ETag' not in header
+    assert b'ETag: "abc"\r\nCache-Control: no-cache' in build_response(Response(200, b'{}', _etag='"abc"'))
+
+
+def test_server(server: ApiServer):
+    assert server.port is None
+
+    message = asyncio.run(request(server, b'GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n'))
+    header, body = message.split(b'\r\n\r\n')
+
+    assert header.startswith(b'HTTP/1.1 200 OK')
+    assert json.loads(body) == {'action': 'charge'}
+    assert server.__repr__() == "ApiServer(routes=['/status', '/broken', '/raising'], port=None)"
+    asyncio.run(server.stop())
+
+
+def test_server_errors(server: ApiServer, monkeypatch):
+    # Blocking routes run in a worker thread
+    message = asyncio.run(request(server, b'GET /raising HTTP/1.1\r\n\r\n'))
+    assert message.startswith(b'HTTP/1.1 500 Internal Server Error')
+    assert b'"error":"TypeError' in message
+
+    def broken(request_line, headers):
+        raise ValueError("Broken server")
+
+    monkeypatch.setattr(server, 'respond', broken)
+    message = asyncio.run(request(server, b'GET /status HTTP/1.1\r\n\r\n'))
+    assert message.startswith(b'HTTP/1.1 500 Internal Server Error')
+    assert message.endswith(b'{"error":"ValueError: Broken server"}')
+
+
+def test_server_not_modified(server: ApiServer):
+    etag = server.respond("GET /status HTTP/1.1").etag
+    raw = f'GET /status HTTP/1.1\r\nIf-None-Match: {etag}\r\n\r\n'.encode()
+
+    message = asyncio.run(request(server, raw))
+
+    assert message.startswith(b'HTTP/1.1 304 Not Modified')
+    assert message.endswith(b'\r\n\r\n')
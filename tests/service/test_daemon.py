@@ -0,0 +1,65 @@
+"""
+Pytests for daemon.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from types import SimpleNamespace
+from datetime import datetime, timedelta
+
+from data import Battery
+from controller.prefetch import SourceStatus
+from service.daemon import Daemon, build_status
+
+
+STARTED = datetime(2023, 10, 2, 12, 30, 0)
+
+
+@pytest.fixture
+def scheduler():
+    plan = pd.DataFrame({'Time': [STARTED + timedelta(hours=hour) for hour in range(1, 4)],
+                         'Action': ['charge', 'idle', 'sell']})
+    return SimpleNamespace(battery=Battery(STARTED, 55.0, 0.4), plan=plan, plan_version=2, from_saved_plan=True,
+                           prefetch_status={'spot_prices': SourceStatus('spot_prices', STARTED),
+                                            'solar': SourceStatus('solar', None, None, "HTTPError")},
+                           executor_stats={'io': {'completed': 2}},
+                           profit_totals={'today': 1.5, 'month': 12.25, 'total': 80.0})
+
+
+@pytest.fixture
+def daemon(scheduler):
+    daemon = Daemon.__new__(Daemon)
+    daemon._scheduler, daemon._action, daemon._started = scheduler, ('', ''), STARTED
+    return daemon
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_build_status(scheduler):
+    status = build_status(scheduler, ('charge', 'Cheapest hour'), STARTED)
+
+    assert status['action'] == 'charge'
+    assert status['battery'] == {'time': '2023-10-02T12:30:00', 'soc': 55.0, 'real_consumption': 0.4}
+    assert status['plan'] == {'version': 2, 'hours': 3, 'start': '2023-10-02T13:30:00', 'end': '2023-10-02T15:30:00',
+                              'from_saved_plan': True}
+    assert status['profit'] == {'today': 1.5, 'month': 12.25, 'total': 80.0}
+    assert status['prefetch']['solar'] == {'fetched_at': None, 'error': "HTTPError"}
+    assert status['prefetch']['spot_prices']['fetched_at'] == '2023-10-02T12:30:00'
+    assert status['stale'] == {}
+
+    scheduler.plan = scheduler.plan.iloc[0:0]
+    assert build_status(scheduler, ('', ''), STARTED)['plan']['start'] is None
+
+
+def test_daemon_update_ui(daemon: Daemon):
+    daemon.update_ui(section='battery')
+    assert daemon.status()['action'] == ''
+
+    daemon.update_ui('idle', 'Battery is full', section='action')
+    assert daemon.status()['action_reason'] == 'Battery is full'
+    assert daemon.scheduler.from_saved_plan
+    assert daemon.__repr__() == "Daemon(started=2023-10-02 12:30:00, action=idle)"
@@ -0,0 +1,44 @@
+"""
+Pytests for host.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import asyncio
+import threading
+
+from service.host import AsyncioHost
+
+
+async def run_callbacks():
+    host = AsyncioHost(asyncio.get_running_loop())
+    calls = []
+
+    host.after(20, calls.append, 'late')
+    host.after(0, calls.append, 'soon')
+    cancelled = host.after(10, calls.append, 'cancelled')
+    host.after_cancel(cancelled)
+    host.after_cancel('after#unknown')
+    # Completion callbacks of Executor tasks call `after` from other threads
+    thread = threading.Thread(target=host.after, args=(0, calls.append, 'thread'))
+    thread.start()
+    thread.join()
+    pending = host.pending
+
+    await asyncio.sleep(0.05)
+    host.update_ui('idle', 'reason', section='action')
+    return calls, pending, host
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_host_after():
+    calls, pending, host = asyncio.run(run_callbacks())
+
+    assert pending == 2
+    assert calls[:2] == ['soon', 'thread']
+    assert calls[2:] == ['late']
+    assert host.pending == 0
+    assert host.__repr__() == "AsyncioHost(pending=0)"
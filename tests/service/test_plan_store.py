@@ -0,0 +1,168 @@
+"""
+Pytests for plan_store.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+from urllib.error import URLError
+
+from database import Database
+from service.plan_store import PlanStore, PlanSnapshot, plan_version
+
+
+START = datetime(2023, 10, 2, 12, 0, 0)
+
+
+def plan_row(hour, action='charge', price=1.0):
+    time = (START + timedelta(hours=hour)).strftime("%Y-%m-%d, %H:%M:%S")
+    return (time, action, 0.0, 3.0, 3.0, 10.0, 0.0, "Cheapest hour", price, 0.8, 0.0, 0.5)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def database(tmp_path):
+    name = str(tmp_path / "database.db")
+    db = Database(name)
+    db.create_missing_tables()
+    db.save_plan([plan_row(0), plan_row(1, 'idle', 2.0)])
+    return name
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def api_fetch(calls):
+    times = ['2023-10-02T12:00:00', '2023-10-02T13:00:00']
+    routes = {'/plan': {'version': 3, 'columns': {'Time': times, 'Action': ['charge', 'idle']}},
+              '/data': {'version': 3, 'columns': {'Time': times, 'Price': [1.0, None]}}}
+
+    def fetch(path):
+        calls.append(path)
+        if len(calls) > 2:
+            raise URLError("Service is not running")
+        return routes[path]
+    return fetch
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_plan_store_invalid_source():
+    with pytest.raises(ValueError):
+        PlanStore('file')
+
+
+def test_plan_store_database(database, clock):
+    store = PlanStore('database', database=database, clock=clock)
+    snapshot = store.snapshot()
+
+    assert list(snapshot.plan.columns) == ['Time', 'Action', 'SolarSurplus', 'ElNetCharge', 'BatteryDelta',
+                                           'BatteryExpected', 'SolarExport', 'ActionReason']
+    assert list(snapshot.data.columns) == ['Time', 'Price', 'SpotPrice', 'Power', 'ExpectedConsumption']
+    assert snapshot.time_window == (START, START + timedelta(hours=1))
+    assert snapshot.__repr__() == f"PlanSnapshot(version={snapshot.version}, hours=2)"
+    assert store.source == 'database'
+
+    # A new plan is only read once the refresh period has passed
+    Database(database).save_plan([plan_row(1), plan_row(2)])
+    assert store.snapshot() is snapshot
+
+    clock.now = 11.0
+    assert store.snapshot().version != snapshot.version
+    assert store.snapshot().time_window[0] == START + timedelta(hours=1)
+
+
+def test_plan_store_derived(database, clock):
+    store = PlanStore('database', database=database, clock=clock)
+    calls = []
+    derive = lambda snapshot: calls.append(snapshot.version) or len(snapshot.plan)
+
+    assert store.derived('hours', derive) == 2
+    assert store.derived('hours', derive) == 2
+    assert len(calls) == 1
+    assert store.__repr__() == "PlanStore(source=database, derived=1)"
+
+    # The same plan keeps the derived data, a new plan derives it again
+    clock.now = 11.0
+    assert store.derived('hours', derive) == 2
+    assert len(calls) == 1
+
+    Database(database).save_plan([plan_row(1), plan_row(2), plan_row(3)])
+    clock.now = 22.0
+    assert store.derived('hours', derive) == 3
+    assert len(calls) == 2
+
+
+def test_plan_store_api(clock):
+    calls = []
+    store = PlanStore('api', fetch=api_fetch(calls), clock=clock)
+    snapshot = store.snapshot()
+
+    assert calls == ['/plan', '/data']
+    assert snapshot.plan['Time'].iloc[1] == pd.Timestamp(START + timedelta(hours=1))
+    assert pd.isna(snapshot.data['Price'].iloc[1])
+
+    # The last plan is kept while the service can not be reached
+    clock.now = 11.0
+    assert store.snapshot() is snapshot
+
+
+def test_plan_store_api_unreachable(clock):
+    store = PlanStore('api', fetch=api_fetch(['/plan', '/data']), clock=clock)
+
+    with pytest.raises(URLError):
+        store.snapshot()
+
+
+def test_plan_store_history(database, monkeypatch):
+    calls = []
+    monkeypatch.setattr('service.plan_store.HISTORIES', 2)
+    monkeypatch.setattr('service.plan_store.load_history',
+                        lambda db, start, end: calls.append((start, end)) or ('hour', pd.DataFrame()))
+    store = PlanStore('database', database=database)
+    end = START + timedelta(days=7)
+
+    # Every client asking for the same range shares one load
+    assert store.history(START, end)[0] == 'hour'
+    assert store.history(START, end)[0] == 'hour'
+    assert calls == [(START, end)]
+
+    store.history(START + timedelta(hours=1), end)
+    store.history(START + timedelta(hours=2), end)
+    store.history(START, end)
+    assert len(calls) == 4
+
+
+def test_plan_store_history_api():
+    calls = []
+    rollups = {'period': 'day', 'columns': {'Time': ['2023-10-02T00:00:00'], 'Price': [1.5]}}
+    store = PlanStore('api', fetch=lambda path: calls.append(path) or rollups)
+    period, history = store.history(START, START + timedelta(days=30))
+
+    assert calls == ['/rollups?start=2023-10-02T12:00:00&end=2023-11-01T12:00:00']
+    assert period == 'day'
+    assert history['Time'].iloc[0] == pd.Timestamp(2023, 10, 2)
+    assert history['Price'].iloc[0] == 1.5
+
+
+def test_plan_version():
+    data = pd.DataFrame({'Time': [START], 'Price': [1.0]})
+    plan = pd.DataFrame({'Time': [START], 'Action': ['charge']})
+
+    assert plan_version(data, plan) == plan_version(data.copy(), plan.copy())
+    assert plan_version(data, plan) != plan_version(data.assign(Price=[1.5]), plan)
+    assert len(plan_version(data, plan)) == 16
+    assert PlanSnapshot('a', data, plan) == PlanSnapshot('a', data.copy(), plan)
@@ -0,0 +1,53 @@
+"""
+Pytests for the import time of packages
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import os
+import sys
+import json
+import subprocess
+
+
+IMPORT_BUDGET = 0.5     # Seconds a cold import of the light-weight exports may take (also on the Raspberry Pi)
+# Wall-clock budgets are flaky on shared CI runners, so they are only checked when asked for
+CHECK_BUDGET = os.environ.get('CHECK_IMPORT_TIME', '') not in ('', '0')
+HEAVY_MODULES = ['requests', 'serial', 'pandas', 'numpy', 'matplotlib']
+
+
+def cold_import(statement):
+    """ Import in a fresh interpreter and return the import time and the heavy modules imported """
+    code = ("import sys, time, json\n"
+            "start = time.perf_counter()\n"
+            f"{statement}\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"print(json.dumps([elapsed, [module for module in {HEAVY_MODULES} if module in sys.modules]]))")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout)
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_import_time_helperfunctions():
+    elapsed, heavy = cold_import("from data.helperfunctions import Parser, URLBuilder, WeekDays")
+
+    assert heavy == []
+    assert not CHECK_BUDGET or elapsed < IMPORT_BUDGET
+
+
+def test_import_time_tariff_companies():
+    elapsed, heavy = cold_import("from data.electricity import TARIFF_COMPANY")
+
+    assert heavy == []
+    assert not CHECK_BUDGET or elapsed < IMPORT_BUDGET
+
+
+def test_import_time_packages():
+    elapsed, heavy = cold_import("import data, controller")
+
+    assert heavy == []
+    assert not CHECK_BUDGET or elapsed < IMPORT_BUDGET
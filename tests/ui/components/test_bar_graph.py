@@ -0,0 +1,103 @@
+"""
+Pytests for bar_graph.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from ui.components.bar_graph import BarGraph, y_limits
+
+
+START = datetime(2023, 10, 2, 12, 0, 0)
+
+
+def hours(count, start=START):
+    return [start + timedelta(hours=hour) for hour in range(count)]
+
+
+@pytest.fixture
+def figure():
+    fig = Figure(figsize=(7, 4.5))
+    FigureCanvasAgg(fig)
+    return fig
+
+
+@pytest.fixture
+def graph(figure):
+    graph = BarGraph(figure, 'Electricity Prices', 'Price (kr/kWh)', 0.5)
+    graph.set_visible(True)
+    figure.canvas.mpl_connect('draw_event', lambda event: (graph.save_background(figure.canvas), graph.draw_bars()))
+    return graph
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_y_limits():
+    assert y_limits(np.array([0.2, 1.3, 0.9]), 0.5) == (0.0, 1.5)
+    assert y_limits(np.array([-0.3, 0.4]), 0.5) == (-0.5, 0.5)
+    assert y_limits(np.array([0.0, np.nan]), 0.5) == (0.0, 0.5)
+    assert y_limits(np.array([]), 0.5) == (0.0, 0.5)
+
+
+def test_bar_graph_update_in_place(graph: BarGraph, figure):
+    graph.update(hours(3), [0.2, 1.3, 0.9])
+    bars = list(graph.ax.patches)
+
+    assert graph.heights == [0.2, 1.3, 0.9]
+    assert graph.ax.get_ylim() == (0.0, 1.5)
+    assert graph.needs_draw
+
+    graph.show(figure.canvas)
+    assert not graph.needs_draw
+
+    # Same hours and limits, so the bars are updated in place and the saved background is kept
+    graph.update(hours(3), [0.4, 1.1, 0.6])
+    assert list(graph.ax.patches) == bars
+    assert graph.heights == [0.4, 1.1, 0.6]
+    assert not graph.needs_draw
+    assert graph.__repr__() == "BarGraph(title=Electricity Prices, bars=3)"
+
+
+def test_bar_graph_layout_changes(graph: BarGraph, figure):
+    graph.update(hours(3), [0.2, 1.3, 0.9])
+    graph.show(figure.canvas)
+
+    # New hours change the tick labels
+    graph.update(hours(3, START + timedelta(hours=1)), [0.2, 1.3, 0.9])
+    assert graph.needs_draw
+    assert [label.get_text() for label in graph.ax.get_xticklabels()] == ['13', '14', '15']
+    graph.show(figure.canvas)
+
+    # Higher values change the limits
+    graph.update(hours(3, START + timedelta(hours=1)), [0.2, 2.3, 0.9])
+    assert graph.needs_draw
+    assert graph.ax.get_ylim() == (0.0, 2.5)
+    graph.show(figure.canvas)
+
+    # More hours create the bars again
+    graph.update(hours(30), np.full(30, 0.5))
+    assert len(graph.ax.patches) == 30
+    assert graph.ax.patches[0].get_width() == 0.5
+
+
+def test_bar_graph_show_blits(graph: BarGraph):
+    canvas = MagicMock()
+    graph.update(hours(2), [0.2, 0.4])
+    graph.save_background(canvas)
+    graph.draw_bars = MagicMock()
+
+    graph.show(canvas)
+
+    canvas.draw.assert_not_called()
+    canvas.restore_region.assert_called_once_with(canvas.copy_from_bbox.return_value)
+    graph.draw_bars.assert_called_once()
+    canvas.blit.assert_called_once()
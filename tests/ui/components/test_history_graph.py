@@ -0,0 +1,64 @@
+"""
+Pytests for history_graph.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from ui.components.history_graph import HistoryGraph
+
+
+START = datetime(2023, 10, 2, 0, 0, 0)
+
+
+@pytest.fixture
+def figure():
+    fig = Figure(figsize=(7, 4.5))
+    FigureCanvasAgg(fig)
+    return fig
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_history_graph_update(figure):
+    graph = HistoryGraph(figure, 'Electricity Prices', 'Price (kr/kWh)')
+    days = [START + timedelta(days=day) for day in range(30)]
+    end = START + timedelta(days=30)
+
+    assert graph.end is None
+    assert not graph.ax.get_visible()
+
+    graph.update(days, np.linspace(1.0, 3.0, 30), 'day', end)
+    assert graph.end == end
+    assert graph.ax.get_xlabel() == "Time (per day)"
+    assert graph.ax.get_ylim()[0] <= 1.0 and graph.ax.get_ylim()[1] >= 3.0
+    assert graph.__repr__() == "HistoryGraph(title=Electricity Prices, points=30)"
+
+    # The line is updated in place with a new history
+    line = graph.ax.lines[0]
+    graph.update(days[:10], [np.nan, *range(9)], 'hour', end + timedelta(hours=1))
+    assert graph.ax.lines[0] is line
+    assert len(line.get_xdata()) == 10
+
+
+def test_history_graph_show(figure):
+    graph = HistoryGraph(figure, 'Battery State Of Charge', 'State of charge (%)')
+    graph.update([START, START + timedelta(hours=1)], [50.0, 55.0], 'hour', START + timedelta(hours=2))
+    graph.set_visible(True)
+    canvas = MagicMock()
+
+    graph.show(canvas)
+    assert graph.ax.get_visible()
+    canvas.draw.assert_called_once()
+
+    # Renders with a real canvas as well
+    graph.show(figure.canvas)
@@ -0,0 +1,79 @@
+"""
+Pytests for view_model.py
+
+Date:
+    19-10-2026
+
+"""
+#pylint: skip-file
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta
+
+from ui.view_model import ViewModel, RowDiff, plan_rows, metric_rows
+
+
+START = datetime(2023, 10, 2, 12, 0, 0)
+
+
+def plan(start, actions):
+    return pd.DataFrame({'Time': [start + timedelta(hours=hour) for hour in range(len(actions))],
+                         'Action': actions,
+                         'ActionReason': [f"Reason {action}" for action in actions]})
+
+
+@pytest.fixture
+def view():
+    return ViewModel()
+
+"""=========================================   TESTS   ==================================================="""
+
+def test_plan_rows():
+    rows = plan_rows(plan(START, ['charge', 'idle']))
+
+    assert list(rows) == ['2023-10-02 12:00:00', '2023-10-02 13:00:00']
+    assert rows['2023-10-02 12:00:00'] == ('charge', '2023-10-02 12:00:00', '2023-10-02 13:00:00', 'Reason charge')
+
+
+def test_view_model_diff(view: ViewModel):
+    diff = view.diff(plan_rows(plan(START, ['charge', 'idle', 'idle'])))
+
+    assert [(position, start) for position, start, _ in diff.inserted] == [(0, '2023-10-02 12:00:00'),
+                                                                           (1, '2023-10-02 13:00:00'),
+                                                                           (2, '2023-10-02 14:00:00')]
+    assert diff.removed == [] and diff.changed == []
+
+    # The next plan drops the passed hour, changes an hour and adds a new hour
+    diff = view.diff(plan_rows(plan(START + timedelta(hours=1), ['idle', 'charge', 'idle'])))
+
+    assert diff.removed == ['2023-10-02 12:00:00']
+    assert [start for start, _ in diff.changed] == ['2023-10-02 14:00:00']
+    assert [(position, start) for position, start, _ in diff.inserted] == [(2, '2023-10-02 15:00:00')]
+    assert len(diff) == 3
+    assert diff.__repr__() == "RowDiff(removed=1, inserted=1, changed=1)"
+    assert list(view.rows) == ['2023-10-02 13:00:00', '2023-10-02 14:00:00', '2023-10-02 15:00:00']
+
+    # An unchanged plan touches nothing
+    assert len(view.diff(plan_rows(plan(START + timedelta(hours=1), ['idle', 'charge', 'idle'])))) == 0
+
+
+def test_view_model_partial_diff(view: ViewModel):
+    view.diff({'soc': "55.0 %", 'next_action': "13:00"})
+    diff = view.diff({'soc': "56.0 %"}, partial=True)
+
+    assert diff.changed == [('soc', "56.0 %")]
+    assert diff.removed == []
+    assert view.rows == {'soc': "56.0 %", 'next_action': "13:00"}
+    assert view.__repr__() == "ViewModel(rows=2)"
+    assert RowDiff().__repr__() == "RowDiff(removed=0, inserted=0, changed=0)"
+
+
+def test_metric_rows():
+    snapshot = {'timers': {'planner.total': {'count': 2, 'mean': 0.25, 'p50': 0.2, 'p95': 0.5, 'max': 0.3}},
+                'counters': {'minicon.retries': 3}}
+    rows = metric_rows(snapshot)
+
+    assert rows['planner.total'] == ('planner.total', '2', '250.0', '200.0', '500.0', '300.0')
+    assert rows['minicon.retries'] == ('minicon.retries', '3', '', '', '', '')
+    assert list(rows) == ['planner.total', 'minicon.retries']